@@ -1,8 +1,68 @@
 # Example file showing a circle moving on screen
+import argparse
+import time
+
 import pygame
 import pygame.freetype  # Import the freetype module.
+from src.band_renderer import BandRenderer
+from src.frame_capture import CAPTURE_FORMATS, FrameCapture
+from src.event_log import EventLog
+from src.frame_pipeline import FramePipeline
+from src.gc_policy import GcPolicy
 from src.levelTools import LevelController
-from src.globals import GameVariables
+from src.power import PowerManager
+from src.profiler import FrameProfiler
+from src.quality import QualityController
+from src.globals import GameAssets, GameSession
+from src.input_system import KeyboardInput, ReplayWriter
+from src.instrumentation import RollingStat
+
+# command line options
+parser = argparse.ArgumentParser(description="Da2 Space invaders")
+parser.add_argument("--seed", type=int, default=None,
+                    help="seed of the game random generator")
+parser.add_argument("--record", default=None,
+                    help="save the session input into a replay file")
+parser.add_argument("--rect-collisions", action="store_true",
+                    help="hits use the sprite rects, not the sprite pixels")
+parser.add_argument("--render-bands", type=int, default=0,
+                    help="draw the frame in this number of bands on a "
+                         "thread pool (0 draws it on the main thread)")
+parser.add_argument("--threaded", action="store_true",
+                    help="simulate the next frame on a thread while the "
+                         "last one is drawn")
+parser.add_argument("--default-gc", action="store_true",
+                    help="keep the default garbage collector settings")
+parser.add_argument("--fixed-quality", action="store_true",
+                    help="keep the full quality when the frames go over "
+                         "their budget")
+parser.add_argument("--capture", default=None, metavar="FOLDER",
+                    help="record the presented frames into this folder")
+parser.add_argument("--capture-format", choices=CAPTURE_FORMATS,
+                    default="png",
+                    help="png sequence or raw video file")
+parser.add_argument("--event-log", default=None, metavar="FILE",
+                    help="write the gameplay events (json lines) into this "
+                         "file")
+parser.add_argument("--always-on", action="store_true",
+                    help="keep running at full rate without focus and on "
+                         "the game over screen")
+parser.add_argument("--stats", action="store_true",
+                    help="print the input latency, frame time, quality, "
+                         "garbage collector and surface memory statistics "
+                         "on exit")
+parser.add_argument("--profile", type=int, default=None, metavar="FRAME",
+                    help="profile the frames from this one (F9 starts a "
+                         "capture while playing)")
+parser.add_argument("--profile-frames", type=int, default=60,
+                    help="frames of each profiler capture")
+parser.add_argument("--profile-dir", default="profiles",
+                    help="folder of the profiler captures")
+args = parser.parse_args()
+if args.threaded and args.profile is not None:
+    parser.error("--profile needs the single thread loop (no --threaded)")
+if args.seed is not None and not 0 <= args.seed <= ReplayWriter.MAX_SEED:
+    parser.error(f"--seed must be between 0 and {ReplayWriter.MAX_SEED}")
 
 # pygame setup
 pygame.init()
@@ -13,40 +73,153 @@ gameIcon = pygame.image.load("src/assets/base.png")
 # set icon
 pygame.display.set_icon(gameIcon)
 
-GLOBALS = GameVariables()
-GLOBALS.screen = pygame.display.set_mode((600, 600))
+screen = pygame.display.set_mode((600, 600))
 # define fonts
-font_dir = "src/assets/font.ttf"
-GLOBALS.game_fonts.base = pygame.freetype.Font(font_dir, 16)
-GLOBALS.game_fonts.title = pygame.freetype.Font(font_dir, 24)
+GameAssets().load_fonts("src/assets/font.ttf")
+# the game state lives in the session
+session = GameSession(screen, args.seed)
+session.pixel_collisions = not args.rect_collisions
+if args.render_bands:
+    session.render_queue.renderer = BandRenderer(args.render_bands)
+if args.event_log:
+    # events are buffered on the frame and written by a thread
+    session.event_log = EventLog(args.event_log)
+if not args.default_gc:
+    # level objects are frozen, full collections between levels and on
+    # idle frames
+    session.gc_policy = GcPolicy()
+    session.gc_policy.install()
 # set clock
 clock = pygame.time.Clock()
 running = True
+# input is read once per frame, the same snapshot can be saved to a replay
+keyboard = KeyboardInput()
+keyboard.setup()
+recorder = ReplayWriter(args.record, session.seed) if args.record else None
+delta_ms = 0
+frame_budget_ms = 1000 / 60
+frame_time = RollingStat()
+# lowers the optional work of the frames on slow machines
+quality = (None if args.fixed_quality
+           else QualityController(session, frame_budget_ms))
 
 # start level controller
-level = LevelController()
+level = LevelController(session)
+# profiles the next calls to level.execute (F9 or --profile)
+profiler = FrameProfiler(level, args.profile_frames, args.profile_dir)
+frame = 0
+# the session belongs to the simulation thread when it is used
+pipeline = FramePipeline(session, level.simulate) if args.threaded else None
+# pauses without focus and sleeps on the game over screen (the threaded
+# loop draws the frames late, it only pauses)
+power = (None if args.always_on
+         else PowerManager(level, idle=not pipeline))
+# frames are copied after the flip and saved by a writer thread
+capture = (FrameCapture(screen.get_size(), args.capture, args.capture_format)
+           if args.capture else None)
 
 while running:
-    # poll for events
+    if power:
+        # waits for input while paused or on a screen that doesn't change
+        power.sleep()
+    frame_start = time.perf_counter()
+    # take the input snapshot of this frame and poll for events
     # pygame.QUIT event means the user clicked X to close your window
-    for event in pygame.event.get():
+    for event in keyboard.begin_frame():
         if event.type == pygame.QUIT:
             running = False
+        elif event.type == pygame.KEYDOWN and event.key == pygame.K_F9:
+            if pipeline:
+                print("profiler capture needs the single thread loop")
+            elif profiler.start(frame):
+                print(f"profiling {profiler.frames} frames from {frame}")
+        if power:
+            power.handle_event(event)
+    if power and power.paused:
+        # the simulation is frozen and the last frame stays on the screen
+        if power.redraw:
+            pygame.display.flip()
+            power.redraw = False
+        clock.tick()
+        continue
+    if frame == args.profile:
+        profiler.start(frame)
+    if recorder:
+        recorder.write(keyboard.snapshot, delta_ms)
 
-    # fill the screen with a color to wipe away anything from last frame
-    GLOBALS.screen.fill("black")
+    if pipeline:
+        # simulate this frame while the last one is drawn, the input of
+        # the drawn frame was polled on the last loop
+        pipeline.submit(keyboard.snapshot, delta_ms / 1000,
+                        keyboard.frame_stamp)
+        presented = pipeline.present(screen)
+    else:
+        session.input = keyboard.snapshot
+        # fill the screen with a color to wipe away anything from last frame
+        session.screen.fill("black")
 
-    # render level
-    level.execute()
+        # render level
+        level.execute()
+        if profiler.capturing:
+            for file in profiler.end_frame():
+                print(f"profile saved in {file}")
 
     # flip() the display to put your work on screen
     pygame.display.flip()
+    if not pipeline:
+        keyboard.mark_presented()
+    elif presented:
+        keyboard.mark_presented(pipeline.presented_tag)
+    if capture:
+        capture.capture(screen)
+    frame_ms = (time.perf_counter() - frame_start) * 1000
+    frame_time.add(frame_ms)
+    if session.gc_policy:
+        session.gc_policy.end_frame(frame_ms, frame_budget_ms)
+    if quality:
+        quality.end_frame(frame_ms)
 
     # limits FPS to 60
     # dt is delta time in seconds since last frame, used for frame rate
     # independent physics.
-    dt = clock.tick(60) / 1000
-    # set delta time that player use to move itself
-    GLOBALS.delta_time = dt
+    # replays can't save longer frames (debugger breaks, suspended
+    # machines), the game uses the same time
+    delta_ms = min(clock.tick(60), ReplayWriter.MAX_DELTA_MS)
+    if power and power.slept:
+        # the time asleep on the idle screen is not game time
+        delta_ms = round(frame_budget_ms)
+    frame += 1
+    if not pipeline:
+        dt = delta_ms / 1000
+        # set delta time that player use to move itself
+        session.delta_time = dt
 
+if pipeline:
+    pipeline.close()
+for file in profiler.stop():
+    print(f"profile saved in {file}")
+if capture:
+    capture.close()
+if session.event_log:
+    session.event_log.close()
+if recorder:
+    recorder.close()
+if session.render_queue.renderer:
+    session.render_queue.renderer.close()
+if args.stats:
+    print(f"input to present latency: {keyboard.latency}")
+    print(f"input to present latency (worst case): "
+          f"{keyboard.latency_bound}")
+    print(f"frame time: {frame_time}")
+    if session.gc_policy:
+        print(session.gc_policy)
+    if quality:
+        print(quality)
+    if power:
+        print(power)
+    if capture:
+        print(capture)
+    if session.event_log:
+        print(session.event_log)
+    print(GameAssets().surfaces.report())
 pygame.quit()
@@ -0,0 +1,42 @@
+import argparse
+import os
+import sys
+
+# dummy drivers need to be set before pygame starts the display
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+from src import benchmark
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description="Run the micro benchmarks and compare with a baseline")
+    parser.add_argument("--baseline", default=benchmark.BASELINE_FILE,
+                        help="baseline file (json)")
+    parser.add_argument("--save", action="store_true",
+                        help="save the results as the new baseline")
+    parser.add_argument("--threshold", type=float,
+                        default=benchmark.DEFAULT_THRESHOLD,
+                        help="slowdown ratio reported as a regression")
+    parser.add_argument("--repeat", type=int, default=5,
+                        help="repeats of each benchmark (the best is kept)")
+    parser.add_argument("--filter", nargs="*",
+                        help="run the benchmarks with these prefixes")
+    args = parser.parse_args()
+
+    report = benchmark.run(args.filter, args.repeat)
+    results = report["results"]
+    baseline = benchmark.load_baseline(args.baseline)
+    regressions = benchmark.compare(results, baseline, args.threshold)
+    print(benchmark.format_report(results, baseline, regressions,
+                                  report["surfaces"]))
+    change = benchmark.median_change(results, baseline)
+    if change is not None:
+        print(f"median ratio to the baseline: {change:.2f}")
+    if args.save:
+        benchmark.save_baseline(report, args.baseline)
+        print(f"baseline saved in {args.baseline}")
+    elif regressions:
+        print(f"{len(regressions)} regressions over "
+              f"{args.threshold * 100:.0f}%")
+        sys.exit(1)
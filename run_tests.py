@@ -1,6 +1,6 @@
 import unittest
 
-from src.globals import GameVariables
+from src.globals import GameAssets
 import pygame
 
 # TODO: put this in a common file for testing, for some reason windows version
@@ -11,7 +11,7 @@ pygame.init()
 pygame.display.set_caption("Da2 Space invaders")
 pygame.display.set_mode((600, 600))
 
-GLOBALS = GameVariables()
+GameAssets()
 pygame.mixer.init()
 
 if __name__ == '__main__':
@@ -0,0 +1,78 @@
+"""
+Renderer that splits the frame in horizontal bands and draws them on a
+thread pool. Pygame releases the GIL while it blits, so the bands are
+rasterised in parallel on multi-core machines.
+"""
+from concurrent.futures import ThreadPoolExecutor
+from typing import List
+
+import pygame
+
+
+class BandRenderer:
+    """
+    Draws the layers of a {RenderQueue} band by band, each band gets the
+    items that overlap it and draws them on a subsurface of the target (so
+    they are clipped to the band). The call returns when all the bands are
+    done.
+    """
+
+    def __init__(self, bands: int = 4, threads: int | None = None):
+        if bands < 1:
+            raise ValueError("BandRenderer: at least one band is required")
+        self.bands = bands
+        self.__pool = ThreadPoolExecutor(max_workers=threads or bands,
+                                         thread_name_prefix="band")
+        self.__target: pygame.Surface | None = None
+        self.__band_surfaces: List[tuple] = []
+
+    def __split(self, target: pygame.Surface) -> List[tuple]:
+        """ (top, bottom, subsurface) of each band, kept while the target
+        is the same """
+        if target is not self.__target:
+            width, height = target.get_size()
+            band_height = -(-height // self.bands)
+            self.__band_surfaces = []
+            for top in range(0, height, band_height):
+                bottom = min(height, top + band_height)
+                self.__band_surfaces.append((top, bottom, target.subsurface(
+                    (0, top, width, bottom - top))))
+            self.__target = target
+        return self.__band_surfaces
+
+    @staticmethod
+    def __draw_band(band: tuple, layers: List[tuple]) -> None:
+        top, bottom, surface = band
+        band_rect = pygame.Rect(0, top, surface.get_width(), bottom - top)
+        for blits, fills in layers:
+            clipped = []
+            for image, dest in blits:
+                y = dest[1]
+                if y < bottom and y + image.get_height() > top:
+                    clipped.append((image, (dest[0], y - top)))
+            if clipped:
+                surface.blits(clipped, doreturn=False)
+            for color, rect in fills:
+                # clipped here, fill doesn't clip negative positions on
+                # subsurfaces
+                rect = pygame.Rect(rect).clip(band_rect)
+                if rect:
+                    surface.fill(color, rect.move(0, -top))
+
+    def draw(self, layers: List[tuple], target: pygame.Surface) -> None:
+        """
+        :param layers: (blits, fills) of each layer in draw order
+        :param target: surface of the frame
+        """
+        bands = self.__split(target)
+        if len(bands) == 1:
+            self.__draw_band(bands[0], layers)
+            return
+        futures = [self.__pool.submit(self.__draw_band, band, layers)
+                   for band in bands]
+        for future in futures:
+            # raises the errors of the band threads here
+            future.result()
+
+    def close(self) -> None:
+        self.__pool.shutdown()
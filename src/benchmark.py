@@ -0,0 +1,221 @@
+"""
+Micro benchmarks of the game hot spots (kinematics, collisions, enemy
+controllers, sounds). The results are compared with a saved baseline and
+the benchmarks slower than the threshold are reported as regressions.
+    python run_benchmarks.py --save        # saves the baseline
+    python run_benchmarks.py               # compares with it
+"""
+import json
+import os
+import statistics
+import time
+from typing import Any, Callable, Dict, List
+
+import pygame
+
+from src.globals import GameAssets, GameSession
+from src.headless import HeadlessGame, setup_headless
+from src.input_system import ACTION_FIRE, InputSnapshot
+from src.kinematics.kinematics import (
+    Animation,
+    AnimationTransform,
+    Animator,
+    Curve,
+    KeyFrame,
+)
+from src.levelTools import EnemyArmy, HiveMind
+from src.surface_registry import format_snapshot
+
+ASSETS = GameAssets()
+
+BASELINE_FILE = "benchmarks.json"
+# slower than the baseline by more than this ratio is a regression
+DEFAULT_THRESHOLD = 0.2
+
+
+class Benchmark:
+    """
+    One measured operation: {setup} prepares the state and returns the
+    argument of {run}, only {run} is timed. The setup runs before each
+    repeat, so every repeat measures the same calls on the same state. With
+    {per_call} it runs before each call (operations that change their state
+    and can't be repeated)
+    """
+
+    def __init__(self, name: str, setup: Callable[[], Any],
+                 run: Callable[[Any], Any], number: int = 1000,
+                 per_call: bool = False):
+        self.name = name
+        self.setup = setup
+        self.run = run
+        self.number = number
+        self.per_call = per_call
+
+    def measure(self, repeat: int = 5) -> float:
+        """ :return: best time per call of the repeats (microseconds) """
+        results = []
+        for _ in range(repeat):
+            if self.per_call:
+                total = 0.0
+                for _ in range(self.number):
+                    argument = self.setup()
+                    start = time.perf_counter()
+                    self.run(argument)
+                    total += time.perf_counter() - start
+            else:
+                state = self.setup()
+                start = time.perf_counter()
+                for _ in range(self.number):
+                    self.run(state)
+                total = time.perf_counter() - start
+            results.append(total / self.number * 1e6)
+        return min(results)
+
+
+def playing_game(frames: int = 120, level: int = 1) -> HeadlessGame:
+    """ headless game after some frames of play (enemies attacking, bullets
+    on the screen) """
+    game = HeadlessGame(seed=1, level=level)
+    for frame in range(frames):
+        game.step(InputSnapshot(ACTION_FIRE if frame % 8 == 0 else 0))
+    return game
+
+
+def smooth_animation() -> Animation:
+    animation = Animation("bench", duration=1000, frames=60)
+    for frame, curve in (("20", Curve.smooth), ("40", Curve.linear),
+                         ("60", Curve.smooth)):
+        animation.set_key_frame(
+            frame, KeyFrame(AnimationTransform(30, 20, 4, 4, 10), curve),
+            True)
+    return animation
+
+
+def army_pattern(enemies: int) -> List[List[str]]:
+    """ rows of 8 enemies (the level maximum) """
+    rows = [["basic"] * 8 for _ in range(enemies // 8)]
+    if enemies % 8:
+        rows.append(["basic"] * (enemies % 8))
+    return rows
+
+
+def collisions_level(enemies: int):
+    game = HeadlessGame(seed=1)
+    game_level = game.level_controller.game_level
+    game_level.build_level(1, army_pattern(enemies), {})
+    return game_level
+
+
+def animator_subject():
+    enemy = playing_game(1).level_controller.game_level.enemy_controller \
+        .enemy_list[0]
+    enemy.run_animation("zigzag", loop=True)
+    return enemy
+
+
+def hive_mind():
+    game = playing_game()
+    return game.level_controller.game_level.enemy_controller
+
+
+def collect_benchmarks() -> List[Benchmark]:
+    zigzag = next(animation
+                  for animation in Animator.build_animations("basic")
+                  if animation.id == "zigzag")
+    duration = zigzag.get_duration()
+    session = GameSession(pygame.Surface((600, 600)))
+    benchmarks = [
+        Benchmark("animation.get_frame_by_time",
+                  lambda: zigzag,
+                  lambda anim: anim.get_frame_by_time(duration * 0.75),
+                  number=5000),
+        Benchmark("animator.make_smooth", smooth_animation,
+                  Animator.make_smooth, number=300, per_call=True),
+        Benchmark("animator.render_animation", animator_subject,
+                  lambda enemy: enemy.render_animation(enemy.rect),
+                  number=5000),
+        Benchmark("enemy_army.build_24",
+                  lambda: session,
+                  lambda game_session: EnemyArmy(
+                      game_session, 1, army_pattern(24)),
+                  number=50),
+        Benchmark("hive_mind.update", hive_mind, HiveMind.update,
+                  number=1000),
+        Benchmark("sound_controller.play",
+                  lambda: ASSETS.sound_controller,
+                  lambda sounds: sounds.play("exp"), number=2000),
+    ]
+    for enemies in (8, 24, 48):
+        benchmarks.append(Benchmark(
+            f"game_level.check_collisions_{enemies}",
+            lambda count=enemies: collisions_level(count),
+            lambda game_level: game_level.check_collisions(),
+            number=500))
+    return benchmarks
+
+
+def run(names: List[str] | None = None, repeat: int = 5) -> Dict[str, Any]:
+    """
+    :param names: run just the benchmarks with any of these prefixes
+    :return: results (microseconds per call) and the surface memory
+    """
+    setup_headless()
+    results = {}
+    for benchmark in collect_benchmarks():
+        if names and not any(benchmark.name.startswith(name)
+                             for name in names):
+            continue
+        results[benchmark.name] = round(benchmark.measure(repeat), 3)
+    return {"results": results, "surfaces": ASSETS.surfaces.snapshot()}
+
+
+def compare(results: Dict[str, float], baseline: Dict[str, float],
+            threshold: float = DEFAULT_THRESHOLD) -> List[str]:
+    """ :return: benchmarks slower than the baseline by more than the
+    threshold (ratio) """
+    regressions = []
+    for name, value in results.items():
+        if name in baseline and value > baseline[name] * (1 + threshold):
+            regressions.append(name)
+    return regressions
+
+
+def load_baseline(file: str = BASELINE_FILE) -> Dict[str, float]:
+    if not os.path.exists(file):
+        return {}
+    with open(file) as f:
+        return json.load(f)["results"]
+
+
+def save_baseline(report: Dict[str, Any], file: str = BASELINE_FILE) -> None:
+    with open(file, "w") as f:
+        json.dump(report, f, indent=2, sort_keys=True)
+
+
+def format_report(results: Dict[str, float], baseline: Dict[str, float],
+                  regressions: List[str],
+                  surfaces: Dict[str, dict] | None = None) -> str:
+    """ :param surfaces: surface memory of the run (current and peak bytes
+    by owner), see {run} """
+    lines = ["benchmark                            |   us/call | baseline "
+             "| change"]
+    for name, value in results.items():
+        base = baseline.get(name)
+        change = (f"{(value / base - 1) * 100:+6.1f}%" if base
+                  else "     -")
+        flag = "  REGRESSION" if name in regressions else ""
+        lines.append(f"{name:<36} | {value:>9.3f} | "
+                     f"{base if base is not None else '-':>8} | "
+                     f"{change}{flag}")
+    if surfaces:
+        lines.append("")
+        lines.append(format_snapshot(surfaces))
+    return "\n".join(lines)
+
+
+def median_change(results: Dict[str, float],
+                  baseline: Dict[str, float]) -> float | None:
+    """ median ratio against the baseline, a machine load hint """
+    ratios = [results[name] / baseline[name] for name in results
+              if baseline.get(name)]
+    return statistics.median(ratios) if ratios else None
@@ -1,9 +1,11 @@
-from typing import List
+from typing import Tuple
 
 import pygame.sprite
-from src.globals import GameVariables
+from src.globals import GameAssets, GameSession
+from src.render_queue import LAYER_HEALTH_BARS
+from src.surface_registry import OWNER_CAMEO
 
-GLOBALS = GameVariables()
+ASSETS = GameAssets()
 
 
 class RkAndMrShip(pygame.sprite.Sprite):
@@ -11,16 +13,15 @@ class RkAndMrShip(pygame.sprite.Sprite):
       Cameo Character that gives extra life points to the player
       """
 
-    def __init__(self):
+    def __init__(self, session: GameSession):
         pygame.sprite.Sprite.__init__(self)
+        self.session = session
         self.tag = "cameo"
         # we need a drop area base on the screen size, also with a gap
-        screen_width = GLOBALS.screen.get_width()
+        screen_width = session.screen.get_width()
         self.movex_speed = 10
         # ship rendering
-        self.image = pygame.image.load(
-            GLOBALS.sprite_dir + "rkShip.png").convert_alpha()
-        self.image = pygame.transform.scale(self.image, (48, 48))
+        self.image = ASSETS.image("rkShip.png", (48, 48), owner=OWNER_CAMEO)
         # self.image.fill(col)
         self.rect = self.image.get_rect()
         self.life = 25
@@ -39,9 +40,10 @@ class RkAndMrShip(pygame.sprite.Sprite):
             life_color = (255, 128, 0)  # orange
         elif remaining_life <= 0.25:
             life_color = (255, 0, 0)  # red
-        pygame.draw.rect(GLOBALS.screen, (255, 255, 255), (
+        queue = self.session.render_queue
+        queue.fill(LAYER_HEALTH_BARS, (255, 255, 255), (
             self.rect.x + 2, self.rect.y - 11, life_bar_length + 2, 6))
-        pygame.draw.rect(GLOBALS.screen, life_color, (
+        queue.fill(LAYER_HEALTH_BARS, life_color, (
             self.rect.x + 4, self.rect.y - 10,
             life_bar_length * remaining_life,
             4))
@@ -66,16 +68,10 @@ class RkPortal(pygame.sprite.Sprite):
         pygame.sprite.Sprite.__init__(self)
         self.tag = "portal"
         self.end = False
-        # Load sprite sheet
-        self.sprite_sheet = pygame.image.load(
-            GLOBALS.sprite_dir + "/rkPortal.png").convert_alpha()
-        # scale to 48 (3 times original size)
-        self.sprite_sheet = pygame.transform.scale(self.sprite_sheet,
-                                                   (48, 240))
-        self.frames: List[
-            pygame.Surface] = []  # we're going to save each title here
+        # scale to 48 (3 times original size), frames are shared
+        self.frames: Tuple[pygame.Surface, ...] = ASSETS.frames(
+            "rkPortal.png", (48, 240), (48, 48), owner=OWNER_CAMEO)
         self.frame_idx = 0
-        self.load_frames()
 
         # Set the image and rect attributes for sprite
         self.image = self.frames[self.frame_idx]
@@ -88,14 +84,7 @@ class RkPortal(pygame.sprite.Sprite):
         self.frame_rate = duration / len(self.frames)
         # if sound_effect:
         #     # same as bullets, play a sound effect each instance
-        #     GLOBALS.sound_controller.play("exp")
-
-    def load_frames(self):
-        # hit-particle image is a sheet grid of (16x16)x3 because the rescale
-        for y in range(0, 240, 48):
-            # we take the tile and add this into the frames list
-            frame = self.sprite_sheet.subsurface(pygame.Rect(0, y, 48, 48))
-            self.frames.append(frame)
+        #     session.sound_controller.play("exp")
 
     def update(self):
         now = pygame.time.get_ticks()
@@ -110,16 +99,15 @@ class RkLieUp(pygame.sprite.Sprite):
       Item that increase life of player
       """
 
-    def __init__(self):
+    def __init__(self, session: GameSession):
         pygame.sprite.Sprite.__init__(self)
+        self.session = session
         self.tag = "cameo"
         # we need a drop area base on the screen size, also with a gap
-        screen_width = GLOBALS.screen.get_width()
+        screen_width = session.screen.get_width()
         self.fall_speed = 10
         # ship rendering
-        self.image = pygame.image.load(
-            GLOBALS.sprite_dir + "lifeUp.png").convert_alpha()
-        self.image = pygame.transform.scale(self.image, (48, 48))
+        self.image = ASSETS.image("lifeUp.png", (48, 48), owner=OWNER_CAMEO)
         self.rect = self.image.get_rect()
         self.lifeUp = 20
 
@@ -128,8 +116,9 @@ class RkLieUp(pygame.sprite.Sprite):
 
 
 class RkAndMrController:
-    def __init__(self):
-        self.__ship = RkAndMrShip()
+    def __init__(self, session: GameSession):
+        self.session = session
+        self.__ship = RkAndMrShip(session)
         self.__rk_portal_start: RkPortal = RkPortal()
         self.__rk_portal_end: RkPortal = RkPortal()
         self.__rk_portal_end.end = True
@@ -139,7 +128,7 @@ class RkAndMrController:
 
     def open_start_portal(self):
         self.__rk_portal_start.rect.centerx = (
-            10, GLOBALS.screen.get_height() / 2)
+            10, self.session.screen.get_height() / 2)
 
     def render(self):
         pass
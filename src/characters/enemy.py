@@ -1,20 +1,31 @@
-from src.globals import GameVariables
+from src.ecs.adapters import EntitySprite
+from src.ecs.components import (
+    AI_STATE,
+    ANIMATION,
+    HEALTH,
+    TRANSFORM,
+    VELOCITY,
+)
+from src.event_log import EVENT_KILL
+from src.globals import GameAssets, GameSession
+from src.render_queue import LAYER_HEALTH_BARS
+from src.surface_registry import OWNER_BULLETS, enemy_owner
+from src.variant_cache import HIT_FLASH_TINT
 from src.utils import *
 from src.kinematics import kinematics
-import random
-import uuid
+from src.kinematics.trajectory import Trajectory, return_duration
 from typing import final
 
-GLOBALS = GameVariables()
+ASSETS = GameAssets()
 
 
 @final
-def on_attack(function):
+def attack_event(function):
     """ Execute a callback when enemy attacks, this one works as
      trigger event and decorator """
 
     def _decorator(self, *args, **kwargs):
-        self.on_attack = True
+        self.set_fields(AI_STATE, on_attack=True)
         if self.attack_callback:
             self.attack_callback(self)
         function(self, *args, **kwargs)
@@ -22,15 +33,18 @@ def on_attack(function):
     return _decorator
 
 
-class Enemy(pygame.sprite.Sprite, kinematics.Animator):
-    def __init__(self, x: int, y: int, size=48):
+class Enemy(EntitySprite, pygame.sprite.Sprite, kinematics.Animator):
+    # the animation system moves the playhead (see src.ecs.systems)
+    bulk_playhead = True
+
+    def __init__(self, session: GameSession, x: int, y: int, size=48):
         pygame.sprite.Sprite.__init__(self)
-        kinematics.Animator.__init__(self)
+        self.create_entity(session.world, **{
+            TRANSFORM: {"x": x, "y": y, "prev_x": x, "prev_y": y},
+            HEALTH: {"life": 10}, ANIMATION: {}, AI_STATE: {"idle": True}})
+        kinematics.Animator.__init__(self, session)
         self.tag = "enemy"
-        self.army_id = uuid.uuid4()
         self.type = 1
-        self.life = 10
-        self.init_life = None
         self.life_bar_timer = 0
         self.points = 5
         self.damage = 10
@@ -40,15 +54,21 @@ class Enemy(pygame.sprite.Sprite, kinematics.Animator):
         self.attack_delay = 0
 
         # Rendering Variables
-        self.image = pygame.image.load(
-            GLOBALS.sprite_dir + "EnemyBasic.png").convert_alpha()
-        self.image = pygame.transform.scale(self.image, (48, 48))
+        # image without the animation transforms (rotation, scale, tint)
+        self.base_image = ASSETS.image("EnemyBasic.png", (48, 48),
+                                       owner=enemy_owner("basic"))
+        self.image = self.base_image
         self.rect = self.image.get_rect()
         self.rect.center = (x, y)
+        # the hit box doesn't rotate, it follows the animation scale
+        self.__hit_size = self.image.get_size()
+        self.set_hit_size(*self.__hit_size)
         self.initial_pos = (x, y)
-        self.restart_pos = False
-        self.idle = True
-        self.on_attack = False
+        self.hit_flash_timer = 0
+        # path back to the initial position, built when the return starts
+        self.return_path: Trajectory | None = None
+        self.return_start = (x, y)
+        self.return_timer = 0
         # callbacks
         self.attack_callback = None
         self.attack_end_callback = None
@@ -56,9 +76,62 @@ class Enemy(pygame.sprite.Sprite, kinematics.Animator):
         self.on_die_callback = None
         self.on_shoot_callback = None
 
+    # read only views of the components, the writes go through set_fields
+    @property
+    def life(self) -> int:
+        return self.get_field(HEALTH, "life")
+
+    @property
+    def init_life(self) -> int:
+        return self.get_field(HEALTH, "init_life")
+
+    @property
+    def timer(self) -> float:
+        return self.get_field(ANIMATION, "timer")
+
+    @property
+    def animation_delay(self) -> float:
+        return self.get_field(ANIMATION, "delay")
+
+    @property
+    def on_attack(self) -> bool:
+        return self.get_field(AI_STATE, "on_attack")
+
+    @property
+    def restart_pos(self) -> bool:
+        return self.get_field(AI_STATE, "restart_pos")
+
+    @property
+    def idle(self) -> bool:
+        return self.get_field(AI_STATE, "idle")
+
+    def set_life(self, life: int) -> None:
+        self.set_fields(HEALTH, life=life)
+
+    def playhead(self) -> tuple:
+        if self.entity_id < 0:
+            return self.timer, self.animation_delay
+        store = self.world.stores[ANIMATION]
+        row = store.sparse.item(self.entity_id)
+        return (store.columns["timer"].item(row),
+                store.columns["delay"].item(row))
+
+    def set_playhead(self, timer: float | None, playing: bool) -> None:
+        if timer is None:
+            self.set_fields(ANIMATION, playing=playing)
+        else:
+            self.set_fields(ANIMATION, timer=timer, playing=playing)
+
+    def set_animation_delay(self, delay: float) -> None:
+        self.set_fields(ANIMATION, delay=delay)
+
     def draw_health_bar(self):
-        # avoid this if we don't have a first hit or the timer is ended
-        if not self.init_life or self.life_bar_timer <= 0:
+        # avoid this if the timer is ended or we don't have a first hit
+        if self.life_bar_timer <= 0 or not self.init_life:
+            return
+        if self.idle and not self.session.quality.idle_health_bars:
+            # reduced quality, the bar time runs without drawing it
+            self.life_bar_timer -= self.session.ms_fps
             return
         life_color = (128, 255, 0)
         life_bar_length = self.rect.width - 8  # with padding
@@ -72,26 +145,56 @@ class Enemy(pygame.sprite.Sprite, kinematics.Animator):
             life_color = (255, 128, 0)  # orange
         elif remaining_life <= 0.25:
             life_color = (255, 0, 0)  # red
-        pygame.draw.rect(GLOBALS.screen, (255, 255, 255), (
+        queue = self.session.render_queue
+        queue.fill(LAYER_HEALTH_BARS, (255, 255, 255), (
             self.rect.x + 2, self.rect.y - 11, life_bar_length +2, 6))
-        pygame.draw.rect(GLOBALS.screen, life_color, (
+        queue.fill(LAYER_HEALTH_BARS, life_color, (
             self.rect.x + 4, self.rect.y - 10,
             life_bar_length * remaining_life,
             4))
-        self.life_bar_timer -= GLOBALS.ms_fps
+        self.life_bar_timer -= self.session.ms_fps
 
     def take_damage(self, damage: int) -> None:
+        """ the health system finds the enemies without life left, the
+        hive mind makes them die (see {HiveMind.check_deaths}) """
+        life = self.life
         # automatically get original life value
         if not self.init_life:
-            self.init_life = self.life
+            self.set_fields(HEALTH, init_life=life)
         self.life_bar_timer = 3000
+        self.hit_flash_timer = 100
         # then subtract the damage
-        self.life -= damage
-        if self.life <= 0:
-            self.__on_die()
-
-    def get_pos(self) -> Position2D:
-        return Position2D(self.rect.x, self.rect.y)
+        self.set_life(life - damage)
+
+    def update_image(self) -> None:
+        """ image with the rotation and size of the animation and the hit
+        flash, the transformed images come from the asset cache """
+        tint = None
+        if self.hit_flash_timer > 0:
+            self.hit_flash_timer -= self.session.ms_fps
+            tint = HIT_FLASH_TINT
+        width, height = self.base_image.get_size()
+        image = ASSETS.variants.get(
+            self.base_image, self.angle, self.get_scale(width, height), tint)
+        if image is self.image:
+            return
+        self.image = image
+        if image.get_size() != self.rect.size:
+            # rotated images are bigger, keep the same center
+            self.rect.size = image.get_size()
+            self.sync_rect()
+        # the hit box keeps the unrotated size
+        hit_size = (round(width + self.width_change),
+                    round(height + self.height_change))
+        if hit_size != self.__hit_size:
+            self.__hit_size = hit_size
+            self.set_hit_size(*hit_size)
+
+    def get_pos(self, out: Position2D | None = None) -> Position2D:
+        """ :param out: {Position2D} to fill instead of creating a new one """
+        if out is None:
+            return Position2D(self.rect.x, self.rect.y)
+        return out.set(self.rect.x, self.rect.y)
 
     @final
     def press_trigger(self):
@@ -102,6 +205,11 @@ class Enemy(pygame.sprite.Sprite, kinematics.Animator):
         """
         self.__on_shoot()
 
+    @final
+    def die(self):
+        """ the enemy runs out of life """
+        self.__on_die()
+
     @final
     def __on_shoot(self):
         """ Execute a callback after shooting a bullet ends"""
@@ -117,7 +225,7 @@ class Enemy(pygame.sprite.Sprite, kinematics.Animator):
     @final
     def __attack_end(self):
         """ Execute a callback after an attack ends"""
-        self.on_attack = False
+        self.set_fields(AI_STATE, on_attack=False)
         if self.attack_end_callback:
             self.attack_end_callback(self)
 
@@ -125,57 +233,71 @@ class Enemy(pygame.sprite.Sprite, kinematics.Animator):
     def __on_die(self):
         """ Execute a callback when an enemy dies"""
         self.is_dead = True
-        GLOBALS.score += self.points
+        self.session.score += self.points
+        event_log = self.session.event_log
+        if event_log:
+            event_log.emit(EVENT_KILL, self.session.frame,
+                           self.session.level, enemy=type(self).__name__,
+                           points=self.points, x=self.rect.centerx,
+                           y=self.rect.centery)
         if self.on_die_callback:
             self.on_die_callback(self)
 
     @final
     def __restore_pos_end(self):
         """ Execute a callback after restores position ends"""
-        self.restart_pos = False
-        self.idle = True
+        self.set_fields(AI_STATE, restart_pos=False, idle=True)
         if self.restore_pos_callback:
             self.restore_pos_callback(self)
 
-    @on_attack
+    @attack_event
     def attack(self):
         """ method that can be overridden to create an attack functionality,
          it also runs the on_attack event. \n
         if you override this method don't forget to add the
-        @enemy_ref.on_attack decorator """
+        @attack_event decorator """
         pass
 
+    def move_subject(self, animated_subject, dx: float, dy: float) -> None:
+        # animations move the entity transform (sub pixel position)
+        self.move_center(dx, dy)
+
     def check_limit(self):
-        if self.rect.y > GLOBALS.screen.get_height():
-            self.rect.y = -self.rect.height
+        x, y = self.get_center()
+        half_width = self.rect.width / 2
+        half_height = self.rect.height / 2
+        if self.rect.y > self.session.screen.get_height():
+            # top of the screen
+            y = -half_height
+            self.set_center(x, y)
             # reposition for the enemy
             self.stop_animation()
-            self.restart_pos = True
+            self.set_fields(AI_STATE, restart_pos=True)
             self.__attack_end()
-        if self.rect.x > GLOBALS.screen.get_width() + self.rect.width + 20:
-            self.rect.x = -self.rect.width
+        screen_width = self.session.screen.get_width()
+        if self.rect.x > screen_width + self.rect.width + 20:
+            self.set_center(-half_width, y)
         if self.rect.x < -(self.rect.width + 20):
-            self.rect.x = GLOBALS.screen.get_width() + self.rect.width
+            self.set_center(screen_width + self.rect.width + half_width, y)
 
     def repositioning(self):
         if not self.restart_pos:
             return
-        # Calculate the distance to move in each frame
-        dx, dy, distance = calculate_distance(self.initial_pos,
-                                              (self.rect.x, self.rect.y))
-
-        # if distance is greater than the speed, move to start position
-        if distance > 1:
-            self.rect.centerx += dx * 0.05
-            self.rect.centery += dy * 0.05
-        # if we get the start position then we can restore the idle state
-        gapx = self.rect.width / 2
-        gapy = self.rect.height / 2
-        if (self.initial_pos[0] - gapx <= self.rect.x <= self.initial_pos[
-            0] + gapx and self.initial_pos[1] - gapy <= self.rect.y <=
-                self.initial_pos[1] + gapy):
+        if self.return_path is None:
+            # eased path from the current position to the start position
+            self.return_start = self.get_center()
+            self.return_path = Trajectory.between(
+                self.return_start, self.initial_pos,
+                return_duration(self.return_start, self.initial_pos))
+            self.return_timer = 0
+        self.return_timer += self.session.ms_fps
+        offset_x, offset_y = self.return_path.position(self.return_timer)
+        self.set_center(self.return_start[0] + offset_x,
+                        self.return_start[1] + offset_y)
+        if self.return_timer >= self.return_path.duration:
             # just to make sure we get the exactly same start position
-            self.rect.center = (self.initial_pos[0], self.initial_pos[1])
+            self.set_center(*self.initial_pos)
+            self.return_path = None
             self.__restore_pos_end()
 
     def __str__(self):
@@ -184,20 +306,24 @@ class Enemy(pygame.sprite.Sprite, kinematics.Animator):
 
 # BULLETS TYPE
 class Bullet(Enemy):
-    def __init__(self, x: int, y: int, size=5):
-        super().__init__(x, y, size)
+    def __init__(self, session: GameSession, x: int, y: int, size=5):
+        super().__init__(session, x, y, size)
         self.speed = 5
         self.tag = "enemy_bullet"
         self.type = 0
         self.damage = 10
 
         # set rendering
-        self.image = pygame.Surface((5, 8))
+        self.image = ASSETS.surface((5, 8), OWNER_BULLETS)
         self.image.fill("green")
         self.rect = self.image.get_rect()
         self.rect.center = (x, y)
+        # the movement system moves the bullet
+        self.world.stores[VELOCITY].add(self.entity_id, vy=self.speed)
+        self.set_fields(AI_STATE, idle=False)
+        self.set_hit_size(5, 8)
         # PLay sound effect each time a bullet is created
-        GLOBALS.sound_controller.play("s3")
+        self.session.sound_controller.play("s3")
 
     def repositioning(self):
         # avoid inherit process
@@ -207,29 +333,34 @@ class Bullet(Enemy):
         # check if enemy is dead
         if self.is_dead:
             self.kill()
-        self.rect.move_ip(0, + self.speed)
+            return
+        self.sync_rect()
         # delete if we get the end of the height screen
-        if self.rect.top > GLOBALS.screen.get_height():
+        if self.rect.top > self.session.screen.get_height():
             self.is_dead = True
 
 
 class SniperBullet(Enemy):
-    def __init__(self, x: int, y: int, size=5):
-        super().__init__(x, y, size)
+    def __init__(self, session: GameSession, x: int, y: int, size=5):
+        super().__init__(session, x, y, size)
         self.speed = 5
         self.tag = "enemy_bullet"
         self.damage = 20
         self.type = 0
 
         # set rendering
-        self.image = pygame.Surface((8, 8))
+        self.image = ASSETS.surface((8, 8), OWNER_BULLETS)
         self.image.fill("green")
         self.rect = self.image.get_rect()
         self.rect.center = (x, y)
+        # the velocity is set once the bullet aims to the player
+        self.world.stores[VELOCITY].add(self.entity_id)
+        self.set_fields(AI_STATE, idle=False)
+        self.set_hit_size(8, 8)
         self.target_on_place = False
         self.direction_angle = None
         # PLay sound effect each time a bullet is created
-        GLOBALS.sound_controller.play("s2")
+        self.session.sound_controller.play("s2")
 
     def repositioning(self):
         # avoid inherit process
@@ -239,40 +370,45 @@ class SniperBullet(Enemy):
         # check if enemy is dead
         if self.is_dead:
             self.kill()
+            return
         if not self.target_on_place:  # run once
             self.direction_angle = get_direction_angle(self.rect.center,
                                                        player.rect.center)
             self.target_on_place = True
-        if self.direction_angle is not None:
-            move_to_direction(self.rect, self.direction_angle, self.speed)
+            velocity = self.world.stores[VELOCITY]
+            velocity.set(self.entity_id, "vx",
+                         self.speed * math.cos(self.direction_angle))
+            velocity.set(self.entity_id, "vy",
+                         self.speed * math.sin(self.direction_angle))
+        self.sync_rect()
         # delete if we get the end of the height screen
-        if self.rect.top > GLOBALS.screen.get_height():
+        if self.rect.top > self.session.screen.get_height():
             self.is_dead = True
 
 
 # ENEMIES TYPE
 class EnemyBasic(Enemy):
 
-    def __init__(self, x: int, y: int, size=40):
-        super().__init__(x, y, size)
+    def __init__(self, session: GameSession, x: int, y: int,
+                 size=40):
+        super().__init__(session, x, y, size)
         self.type = 1
         self.define_animations("basic")
         self.run_animation("idle", True)
         self.damage = 10
         self.sound_active = False
 
-    @on_attack
+    @attack_event
     def attack(self):
         self.stop_animation()
         attack_anims = ["zigzag", "zigzag",
                         "kamikaze-left", "kamikaze-right"]
-        animation_id = attack_anims[random.randint(0, 3)]
+        animation_id = attack_anims[self.session.rng.randint(0, 3)]
         if not self.sound_active:
-            GLOBALS.sound_controller.play("fall")
+            self.session.sound_controller.play("fall")
             self.sound_active = True
         self.run_animation(animation_id, True)
-        self.idle = False
-        self.on_attack = True
+        self.set_fields(AI_STATE, idle=False, on_attack=True)
 
     def update(self, player) -> None:
         # check if enemy is dead
@@ -280,10 +416,11 @@ class EnemyBasic(Enemy):
             self.kill()
             return
         # attack delay
-        if self.on_attack and self.attack_delay > 0:
-            self.attack_delay -= GLOBALS.ms_fps
+        if self.attack_delay > 0 and self.on_attack:
+            self.attack_delay -= self.session.ms_fps
             return
         self.render_animation(self.rect)
+        self.update_image()
         # draw life bar
         self.draw_health_bar()
         # other actions/events
@@ -296,38 +433,39 @@ class EnemyBasic(Enemy):
 class EnemyShooter(Enemy):
     """ This enemy can move down to attack player and shoot a the same time"""
 
-    def __init__(self, x: int, y: int, size=40):
-        super().__init__(x, y, size)
+    def __init__(self, session: GameSession, x: int, y: int,
+                 size=40):
+        super().__init__(session, x, y, size)
         self.define_animations("shooter")
         self.run_animation("idle", True)
         self.type = 2
-        self.idle = False
+        self.set_fields(AI_STATE, idle=False)
         self.on_shoot = False
         self.attack_direction = "left"
         self.delay_attack = False
         self.shoot_time = 0
         self.shoot_already = True
         self.damage = 20
-        self.life = 20
+        self.set_life(20)
 
         # Rendering Variables
-        self.image = pygame.image.load(
-            GLOBALS.sprite_dir + "Shooter.png").convert_alpha()
-        self.image = pygame.transform.scale(self.image, (48, 48))
+        self.base_image = ASSETS.image("Shooter.png", (48, 48),
+                                       owner=enemy_owner("shooter"))
+        self.image = self.base_image
         self.rect = self.image.get_rect()
         self.rect.center = (x, y)
         self.sound_active = False
 
-    @on_attack
+    @attack_event
     def attack(self):
         self.stop_animation()
         attack_type = ["left", "right"]
-        self.attack_direction = attack_type[random.randint(0, 1)]
+        self.attack_direction = attack_type[self.session.rng.randint(0, 1)]
         self.run_animation(f"jump-{self.attack_direction}")
         if not self.sound_active:
-            GLOBALS.sound_controller.play("fall")
+            self.session.sound_controller.play("fall")
             self.sound_active = True
-        self.idle = False
+        self.set_fields(AI_STATE, idle=False)
 
     def on_animation_ends(self, anim_id: str):
         if anim_id == f"jump-{self.attack_direction}":
@@ -342,22 +480,23 @@ class EnemyShooter(Enemy):
         if self.delay_attack and self.shoot_already:  # Run once
             self.delay_attack = False
             self.run_animation(f"attack-{self.attack_direction}", True)
-            self.on_attack = True
+            self.set_fields(AI_STATE, on_attack=True)
             self.shoot_already = False
-            self.shoot_time = random.randint(200, 1500)
+            self.shoot_time = self.session.rng.randint(200, 1500)
 
         if self.shoot_time > 0:
-            self.shoot_time -= GLOBALS.ms_fps
+            self.shoot_time -= self.session.ms_fps
         elif (self.shoot_time <= 0 and self.on_attack
               and not self.shoot_already):
             # shot a bullet
             self.shoot_already = True
             self.press_trigger()
 
-        if self.on_attack and self.attack_delay > 0:
-            self.attack_delay -= GLOBALS.ms_fps
+        if self.attack_delay > 0 and self.on_attack:
+            self.attack_delay -= self.session.ms_fps
             return
         self.render_animation(self.rect)
+        self.update_image()
         # draw life bar
         self.draw_health_bar()
         # other actions/events
@@ -371,40 +510,41 @@ class EnemySniper(Enemy):
     """ This enemy can shoot a bullet that gets close to the player having more
     change to do dame but this enemy can not move """
 
-    def __init__(self, x: int, y: int, size=40):
-        super().__init__(x, y, size)
+    def __init__(self, session: GameSession, x: int, y: int,
+                 size=40):
+        super().__init__(session, x, y, size)
         self.type = 3
         self.define_animations("basic")
         self.run_animation("idle", True)
-        self.idle = True
         self.shoot_rate = 0
         self.damage = 25
         # wai fist before first shoot
         self.delay_scope = 1500
-        self.life = 25
+        self.set_life(25)
 
         # Rendering Variables
-        self.image = pygame.image.load(
-            GLOBALS.sprite_dir + "Sniper.png").convert_alpha()
-        self.image = pygame.transform.scale(self.image, (48, 48))
+        self.base_image = ASSETS.image("Sniper.png", (48, 48),
+                                       owner=enemy_owner("sniper"))
+        self.image = self.base_image
         self.rect = self.image.get_rect()
         self.rect.center = (x, y)
 
     def set_shoot_rate(self):
-        self.shoot_rate = random.randint(1500, 3000)
+        self.shoot_rate = self.session.rng.randint(1500, 3000)
 
     def update(self, player) -> None:
         # check if enemy is dead
         if self.is_dead:
             self.kill()
             return
-        self.shoot_rate -= GLOBALS.ms_fps
+        self.shoot_rate -= self.session.ms_fps
         if self.delay_scope > 0:
-            self.delay_scope -= GLOBALS.ms_fps
+            self.delay_scope -= self.session.ms_fps
         if self.shoot_rate <= 0 and self.delay_scope <= 0:
             self.press_trigger()
             self.set_shoot_rate()
         self.render_animation(self.rect)
+        self.update_image()
         # draw life bar
         self.draw_health_bar()
 
@@ -415,13 +555,17 @@ class EnemyLifeBar(pygame.sprite.Sprite):
         pygame.sprite.Sprite.__init__(self)
         self.life_size = 40
         self.tag = "enemy_life"
-        # Rendering Variables
-        self.image = pygame.Surface((self.life_size, 5))
+        # Rendering Variables, the bar swaps images instead of changing
+        # them (a drawn image can be on the screen of the threaded loop)
+        self.__bar = pygame.Surface((self.life_size, 5))
+        self.__bar.fill((50, 180, 50))
         # set a green color but on 0 opacity
-        self.image.fill((50, 180, 50))
-        self.image.set_alpha(0)
+        self.__hidden = self.__bar.copy()
+        self.__hidden.set_alpha(0)
+        self.image = self.__hidden
         self.rect = self.image.get_rect()
         self.__enemy_ref: Enemy = enemy_ref
+        self.session = enemy_ref.session
         self.__enemy_ref.on_damage_callback = self.show_life
         self.__init_life = self.__enemy_ref.life
         self.__visible_timer = 0  # we just show the bar a couple of minutes
@@ -433,11 +577,10 @@ class EnemyLifeBar(pygame.sprite.Sprite):
         """
         # each lifebar needs an enemy, if enemy is dead life bar disappear
         if self.__enemy_ref:
-            self.image.set_alpha(255)
             self.__visible_timer = 3000  # 3 seconds visibility
             # set new size of the life bar
             new_width = self.__enemy_ref.life / self.__init_life
-            self.image = pygame.transform.scale(self.image,
+            self.image = pygame.transform.scale(self.__bar,
                                                 (new_width * self.life_size,
                                                  self.rect.height))
             self.rect = self.image.get_rect()
@@ -448,10 +591,9 @@ class EnemyLifeBar(pygame.sprite.Sprite):
         if not self.__enemy_ref or self.__enemy_ref.is_dead:
             self.kill()
             return
-        alpha = self.image.get_alpha()
         if self.__visible_timer > 0:
             self.rect.x = self.__enemy_ref.rect.x + 4
             self.rect.y = self.__enemy_ref.rect.y - 10
-            self.__visible_timer -= GLOBALS.ms_fps
-        if self.__visible_timer <= 0 and alpha == 255:
-            self.image.set_alpha(0)
+            self.__visible_timer -= self.session.ms_fps
+        if self.__visible_timer <= 0 and self.image is not self.__hidden:
+            self.image = self.__hidden
@@ -1,9 +1,15 @@
 import pygame
 import pygame.mixer
-from src.globals import GameVariables
+from src.ecs.adapters import EntitySprite
+from src.ecs.components import COLLIDER, TRANSFORM, VELOCITY
+from src.event_log import EVENT_DAMAGE, EVENT_SHOT
+from src.globals import GameAssets, GameSession
+from src.input_system import ACTION_FIRE, InputSnapshot
+from src.render_queue import LAYER_PLAYER
+from src.surface_registry import OWNER_BULLETS, OWNER_PLAYER
 from src.utils import Position2D
 
-GLOBALS = GameVariables()
+ASSETS = GameAssets()
 
 
 class Player(pygame.sprite.Sprite):
@@ -11,18 +17,23 @@ class Player(pygame.sprite.Sprite):
     Main Player render class, this also handles the player movement
     """
 
-    def __init__(self, col, x, y):
+    def __init__(self, session: GameSession, col, x, y):
         pygame.sprite.Sprite.__init__(self)
+        self.session = session
         # player attributes
         self.tag = "player"
         self.movex_speed = 400
         self.movey_speed = 400
-        # self.life = GLOBALS.life
+        # self.life = session.life
         self.is_dead = False
         # player rendering
-        self.image = pygame.image.load(
-            GLOBALS.sprite_dir + "Player.png").convert_alpha()
-        self.image = pygame.transform.scale(self.image, (48, 48))
+        self.image = ASSETS.image("Player.png", (48, 48), owner=OWNER_PLAYER)
+        # the blink swaps between these images, a drawn image is never
+        # changed (the threaded loop draws it while the next frame runs)
+        self.blink_images = {255: self.image}
+        for alpha in (50, 180):
+            self.blink_images[alpha] = ASSETS.copy(self.image, OWNER_PLAYER)
+            self.blink_images[alpha].set_alpha(alpha)
         # self.image.fill(col)
         self.rect = self.image.get_rect()
         self.rect.center = (x, y)
@@ -39,33 +50,33 @@ class Player(pygame.sprite.Sprite):
         if self.invulnerable and self.blink_alpha_timer <= 0:
             # alpha change between two values 50|180 each timer period
             self.blink_alpha = 180 if self.blink_state else 50
-            # set the new alpha
-            self.image.set_alpha(self.blink_alpha)
+            # set the image of the new alpha
+            self.image = self.blink_images[self.blink_alpha]
             # this value helps switch the alpha value
             self.blink_state = not self.blink_state  # invert the current value
             # set again the timer
             self.blink_alpha_timer = 100
         if self.invulnerable:  # timer works if is invulnerable
-            self.blink_alpha_timer -= GLOBALS.ms_fps
-        elif self.image.get_alpha() != 255:
+            self.blink_alpha_timer -= self.session.ms_fps
+        elif self.image is not self.blink_images[255]:
             # in case the blink ends then restore the alpha
-            self.image.set_alpha(255)
+            self.image = self.blink_images[255]
 
     def update(self) -> None:
         """
         Process the key events to move the playr
         :return: None
         """
-        keys = pygame.key.get_pressed()
+        snapshot = self.session.input
         # self.move_f.clear()
         self.move_f.y = self.get_axisY(
-            keys) * (self.movey_speed * GLOBALS.delta_time)
+            snapshot) * (self.movey_speed * self.session.delta_time)
         self.move_f.x = self.get_axisX(
-            keys) * (self.movex_speed * GLOBALS.delta_time)
+            snapshot) * (self.movex_speed * self.session.delta_time)
 
         self.rect.move_ip(self.move_f.x, self.move_f.y)
 
-        self.invulnerability_timeout -= GLOBALS.ms_fps if (
+        self.invulnerability_timeout -= self.session.ms_fps if (
                 self.invulnerability_timeout > 0) else 0
         if self.invulnerability_timeout <= 0:
             self.invulnerable = False
@@ -75,78 +86,88 @@ class Player(pygame.sprite.Sprite):
         self.invulnerable = True
         self.invulnerability_timeout = 2000  # 2 seconds
 
-    def get_axisY(self, keys) -> int:
+    def get_axisY(self, snapshot: InputSnapshot) -> int:
         """
         used to return the axis value in case this is active -1 = UP, 1 = DOWN
         and 0 = no direction detected
-        :param keys: pygame keys object
+        :param snapshot: {InputSnapshot} of the current frame
         :return: int value with Y axis value
         """
-        if ((keys[pygame.K_s] or keys[pygame.K_DOWN])
-                and self.rect.bottom < GLOBALS.screen.get_height()):
+        axis = snapshot.axis_y
+        if axis > 0 and self.rect.bottom < self.session.screen.get_height():
             return 1
-        elif ((keys[pygame.K_w] or keys[pygame.K_UP])
-              and self.rect.top > 0):
+        elif axis < 0 and self.rect.top > 0:
             return -1
         return 0
 
-    def get_axisX(self, keys) -> int:
+    def get_axisX(self, snapshot: InputSnapshot) -> int:
         """
         used to return the axis value in case this is
         active -1 = LEFT, 1 = RIGHT and 0 = no direction detected
-        :param keys: pygame keys object
+        :param snapshot: {InputSnapshot} of the current frame
         :return: int value with X axis value
         """
-        if ((keys[pygame.K_d] or keys[pygame.K_RIGHT])
-                and self.rect.right < GLOBALS.screen.get_width()):
+        axis = snapshot.axis_x
+        if axis > 0 and self.rect.right < self.session.screen.get_width():
             return 1
-        elif ((keys[pygame.K_a] or keys[pygame.K_LEFT])
-              and self.rect.left > 0):
+        elif axis < 0 and self.rect.left > 0:
             return -1
         return 0
 
-    def get_pos(self) -> Position2D:
+    def get_pos(self, out: Position2D | None = None) -> Position2D:
         """
+        :param out: {Position2D} to fill instead of creating a new one
         :return: {Position2D} object with the current player position
         """
-        pos = Position2D()
-        pos.x = self.rect.x
-        pos.y = self.rect.y
-        return pos
+        if out is None:
+            return Position2D(self.rect.x, self.rect.y)
+        return out.set(self.rect.x, self.rect.y)
 
     def take_damage(self, damage: int):
-        GLOBALS.life -= damage
-        self.is_dead = GLOBALS.life <= 0
+        self.session.life -= damage
+        self.is_dead = self.session.life <= 0
+        event_log = self.session.event_log
+        if event_log:
+            event_log.emit(EVENT_DAMAGE, self.session.frame,
+                           self.session.level, damage=damage,
+                           life=self.session.life)
         # sound effect for damage
-        GLOBALS.sound_controller.play("dmg")
+        self.session.sound_controller.play("dmg")
 
 
-class Bullet(pygame.sprite.Sprite):
-    def __init__(self, player: Player):
+class Bullet(EntitySprite, pygame.sprite.Sprite):
+    def __init__(self, session: GameSession, player: Player):
         pygame.sprite.Sprite.__init__(self)
+        self.session = session
         # Bullet attributes
         self.tag = "bullet"
         self.damage = 10
         self.speed = 8
         self.is_dead = False  # in case bullet hits an Enemy
         # Rendering Variables
-        self.image = pygame.Surface((6, 10))
+        self.image = ASSETS.surface((6, 10), OWNER_BULLETS)
         self.image.fill((255, 255, 0))
         self.rect = self.image.get_rect()
-        player_pos = player.get_pos()
+        player_rect = player.rect
         self.rect.center = (
-            player_pos.x + (player.rect.width / 2), player_pos.y)
+            player_rect.x + (player_rect.width / 2), player_rect.y)
+        # the movement system moves the bullet
+        self.create_entity(session.world, **{
+            TRANSFORM: {"x": self.rect.centerx, "y": self.rect.centery,
+                        "prev_x": self.rect.centerx,
+                        "prev_y": self.rect.centery},
+            VELOCITY: {"vy": -self.speed},
+            COLLIDER: {"width": 6, "height": 10}})
 
         # if bullet is created we need a sound effect for shoot
-        GLOBALS.sound_controller.play("s1")  # shoot1
+        self.session.sound_controller.play("s1")  # shoot1
 
     def update(self) -> None:
         # check if bullet got hit
         if self.is_dead:
             self.kill()
             return
-            # move up the bullet to hit enemies
-        self.rect.move_ip(0, -self.speed)
+        self.sync_rect()
         if self.rect.bottom < 0:
             self.kill()
 
@@ -155,10 +176,11 @@ class Bullet(pygame.sprite.Sprite):
 
 
 class PlayerController:
-    def __init__(self):
+    def __init__(self, session: GameSession):
+        self.session = session
         # create the player instance
-        self.player = Player("blue", GLOBALS.screen.get_width() / 2,
-                             GLOBALS.screen.get_height() - 50)
+        self.player = Player(session, "blue", session.screen.get_width() / 2,
+                             session.screen.get_height() - 50)
         # create the Sprites Groups related with the player
         self.playerGroup = pygame.sprite.Group()
         self.playerGroup.add(self.player)  # add player to the group
@@ -177,12 +199,17 @@ class PlayerController:
         return True
 
     def render(self):
-        keys = pygame.key.get_pressed()
         # detect player shoot
-        self.shoot_timer -= GLOBALS.delta_time
-        if keys[pygame.K_SPACE] and self.shoot_timer <= 0 and self.can_shot():
-            bullet = Bullet(self.player)
+        self.shoot_timer -= self.session.delta_time
+        if (self.session.input.pressed(ACTION_FIRE) and self.shoot_timer <= 0
+                and self.can_shot()):
+            bullet = Bullet(self.session, self.player)
             self.playerGroup.add(bullet)
             self.shoot_timer = self.shoot_rate
+            event_log = self.session.event_log
+            if event_log:
+                event_log.emit(EVENT_SHOT, self.session.frame,
+                               self.session.level,
+                               x=bullet.rect.centerx)
         self.playerGroup.update()
-        self.playerGroup.draw(GLOBALS.screen)
+        self.session.render_queue.add_group(LAYER_PLAYER, self.playerGroup)
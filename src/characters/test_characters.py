@@ -1,21 +1,29 @@
 import unittest
 from src.characters.player import *
 from src.characters.enemy import *
+from src.ecs.systems import dead_entities
 
 
 class TestCharacters(unittest.TestCase):
+    def setUp(self):
+        self.session = GameSession(pygame.Surface((600, 600)), seed=1)
+
     def test_player(self):
-        player_test = Player("blue", 50, 50)
+        player_test = Player(self.session, "blue", 50, 50)
         self.assertEqual(player_test.rect.center, (50, 50))
         self.assertEqual(player_test.is_dead, False)
         player_test.take_damage(101)
         self.assertEqual(player_test.is_dead, True)
 
     def test_enemy(self):
-        enemy_test = Enemy(50, 50)
+        enemy_test = Enemy(self.session, 50, 50)
         self.assertEqual(enemy_test.rect.center, (50, 50))
         self.assertEqual(enemy_test.rect.width, 48)
         self.assertEqual(enemy_test.rect.height, 48)
         self.assertEqual(enemy_test.is_dead, False)
         enemy_test.take_damage(101)
+        # the death comes from the health system
+        self.assertEqual(dead_entities(self.session.world).tolist(),
+                         [enemy_test.entity_id])
+        enemy_test.die()
         self.assertEqual(enemy_test.is_dead, True)
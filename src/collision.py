@@ -0,0 +1,121 @@
+"""
+Collision tests between sprites: the rect test is the broad phase and the
+pixel masks of the sprite images are the narrow phase (transparent pixels
+don't hit). Projectiles are tested along the path of the frame (swept), so
+fast bullets can't jump over a target.
+"""
+import math
+import weakref
+
+import pygame
+
+# surface -> mask, built the first time a surface collides, the mask is
+# dropped with its surface
+_masks: "weakref.WeakKeyDictionary[pygame.Surface, pygame.mask.Mask]" = (
+    weakref.WeakKeyDictionary())
+
+
+def get_mask(surface: pygame.Surface) -> pygame.mask.Mask:
+    """ cached mask of the surface, surfaces shared by many sprites
+    (assets, animation frames) only build one mask """
+    mask = _masks.get(surface)
+    if mask is None:
+        mask = pygame.mask.from_surface(surface)
+        _masks[surface] = mask
+    return mask
+
+
+def hit_rect(sprite: pygame.sprite.Sprite) -> pygame.Rect:
+    """ hit box of the sprite: its collider (entity sprites, see
+    src.ecs.adapters.EntitySprite) or its rect """
+    get_hit_rect = getattr(sprite, "hit_rect", None)
+    return get_hit_rect() if get_hit_rect else sprite.rect
+
+
+def hit_size(sprite: pygame.sprite.Sprite) -> tuple:
+    """ size of the hit box of the sprite, see {hit_rect} """
+    get_hit_size = getattr(sprite, "hit_size", None)
+    return get_hit_size() if get_hit_size else sprite.image.get_size()
+
+
+def sprites_collide(sprite_a: pygame.sprite.Sprite,
+                    sprite_b: pygame.sprite.Sprite,
+                    pixel_perfect: bool = True) -> bool:
+    """
+    :param pixel_perfect: after the rect test check that the visible pixels
+    of the images overlap, False tests just the hit boxes
+    """
+    if not pixel_perfect:
+        return hit_rect(sprite_a).colliderect(hit_rect(sprite_b))
+    rect_a = sprite_a.rect
+    rect_b = sprite_b.rect
+    if not rect_a.colliderect(rect_b):
+        return False
+    # images are drawn on the rect top left
+    return get_mask(sprite_a.image).overlap(
+        get_mask(sprite_b.image),
+        (rect_b.x - rect_a.x, rect_b.y - rect_a.y)) is not None
+
+
+def sweep_segment_rect(start: tuple, end: tuple, half_size: tuple,
+                       rect: pygame.Rect) -> float | None:
+    """
+    Box moving from start to end (centers) against a static rect, slab
+    test of the segment against the rect grown by the box half size
+    :return: fraction of the movement where the box starts touching the
+    rect (0 already touching) or None if they don't touch
+    """
+    t_near = 0.0
+    t_far = 1.0
+    for position, target, half, low, high in (
+            (start[0], end[0], half_size[0], rect.left, rect.right),
+            (start[1], end[1], half_size[1], rect.top, rect.bottom)):
+        low -= half
+        high += half
+        delta = target - position
+        if delta == 0:
+            # parallel to the slab, it needs to be inside
+            if not low < position < high:
+                return None
+            continue
+        t_low = (low - position) / delta
+        t_high = (high - position) / delta
+        if t_low > t_high:
+            t_low, t_high = t_high, t_low
+        t_near = max(t_near, t_low)
+        t_far = min(t_far, t_high)
+        if t_near >= t_far:
+            return None
+    return t_near
+
+
+def projectile_collides(projectile, target: pygame.sprite.Sprite,
+                        pixel_perfect: bool = True) -> bool:
+    """
+    Continuous test of a projectile (sprite with an entity transform, see
+    src.ecs.adapters.EntitySprite) against a target, the projectile is
+    swept from its previous center to the current one
+    """
+    x0, y0, x1, y1 = projectile.path()
+    if not pixel_perfect:
+        width, height = hit_size(projectile)
+        return sweep_segment_rect((x0, y0), (x1, y1),
+                                  (width / 2, height / 2),
+                                  hit_rect(target)) is not None
+    width, height = projectile.image.get_size()
+    t_hit = sweep_segment_rect((x0, y0), (x1, y1), (width / 2, height / 2),
+                               target.rect)
+    if t_hit is None:
+        return False
+    # check the masks along the path, one sample per pixel moved
+    target_mask = get_mask(target.image)
+    projectile_mask = get_mask(projectile.image)
+    steps = max(1, math.ceil(math.hypot(x1 - x0, y1 - y0) * (1 - t_hit)))
+    for step in range(steps + 1):
+        t = t_hit + (1 - t_hit) * step / steps
+        left = round(x0 + (x1 - x0) * t - width / 2)
+        top = round(y0 + (y1 - y0) * t - height / 2)
+        if target_mask.overlap(projectile_mask, (left - target.rect.x,
+                                                 top - target.rect.y)):
+            return True
+    return False
@@ -0,0 +1,238 @@
+"""
+Monte Carlo difficulty estimator: plays thousands of seeded bot games per
+level in a process pool and reports how hard each level is.
+    python -m src.difficulty --levels 1-9 --games 1000
+"""
+import argparse
+import json
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List
+
+import numpy as np
+
+from src.environment import GameEnv
+from src.input_system import (
+    ACTION_DOWN,
+    ACTION_FIRE,
+    ACTION_LEFT,
+    ACTION_RIGHT,
+    ACTION_UP,
+)
+
+# one env per worker process, created on the first task
+_worker_env: GameEnv | None = None
+
+
+class BotPolicy:
+    """
+    Simple bot used to measure the levels: it always shoots, follows the
+    closest enemy column and dodges the bullets and enemies close to it.
+    The randomness comes from its own seed, so a game is reproducible.
+    """
+
+    def __init__(self, seed: int = 0, danger_zone: int = 90):
+        self.rng = np.random.default_rng(seed)
+        self.danger_zone = danger_zone
+        self.__wander = 0
+        self.__offset = 0
+
+    def act(self, obs: Dict[str, np.ndarray]) -> int:
+        player_x = obs["player"][0] + 24
+        player_y = obs["player"][1] + 24
+        enemies = obs["enemies"][:int(obs["enemy_count"][0])]
+        bullets = obs["bullets"][:int(obs["bullet_count"][0])]
+        action = ACTION_FIRE
+        # threats: enemy bullets and attacking enemies getting close
+        threats_x = np.concatenate((
+            bullets[bullets[:, 2] == 0, 0],
+            enemies[enemies[:, 4] > 0, 0] + 24))
+        threats_y = np.concatenate((
+            bullets[bullets[:, 2] == 0, 1],
+            enemies[enemies[:, 4] > 0, 1] + 24))
+        close = ((np.abs(threats_x - player_x) < self.danger_zone / 2)
+                 & (threats_y < player_y)
+                 & (player_y - threats_y < self.danger_zone))
+        if close.any():
+            # move to the side with more space
+            dodge_x = threats_x[close].mean()
+            action |= ACTION_LEFT if dodge_x > player_x else ACTION_RIGHT
+            return action | ACTION_DOWN
+        if len(enemies) > 0:
+            target_x = enemies[np.argmin(
+                np.abs(enemies[:, 0] + 24 - player_x)), 0] + 24
+            # a bit of noise to avoid the same game each time
+            if self.__wander <= 0:
+                self.__wander = int(self.rng.integers(20, 80))
+                self.__offset = self.rng.normal(0, 20)
+            self.__wander -= 1
+            target_x += self.__offset
+            if target_x < player_x - 4:
+                action |= ACTION_LEFT
+            elif target_x > player_x + 4:
+                action |= ACTION_RIGHT
+        if player_y < 500:
+            action |= ACTION_DOWN
+        elif player_y > 560:
+            action |= ACTION_UP
+        return action
+
+
+def play_games(level: int, seeds: List[int],
+               max_frames: int = 7200) -> List[dict]:
+    """
+    Plays one game per seed on the given level (only that level), it runs
+    inside the worker process
+    :return: result of each game
+    """
+    global _worker_env
+    if _worker_env is None:
+        _worker_env = GameEnv(single_level=True, max_frames=max_frames)
+    env = _worker_env
+    env.max_frames = max_frames
+    results = []
+    for seed in seeds:
+        obs = env.reset(seed=seed, level=level)
+        bot = BotPolicy(seed)
+        done = False
+        info = {}
+        while not done:
+            obs, _, done, info = env.step(bot.act(obs))
+        results.append({
+            "seed": seed,
+            # survival time of the lost games, clear time of the completed
+            "time_ms": info["frame"] * env.delta_ms,
+            "damage": 100 - max(info["life"], 0),
+            "completed": info["level_completed"],
+            "score": info["score"],
+        })
+    return results
+
+
+def time_stats(name: str, results: List[dict]) -> dict:
+    """ mean, p10 and p50 of the game times in seconds, None without
+    games """
+    seconds = np.array([item["time_ms"] for item in results]) / 1000
+    if not len(seconds):
+        return {f"{name}_s_mean": None, f"{name}_s_p10": None,
+                f"{name}_s_p50": None}
+    return {
+        f"{name}_s_mean": float(seconds.mean()),
+        f"{name}_s_p10": float(np.percentile(seconds, 10)),
+        f"{name}_s_p50": float(np.percentile(seconds, 50)),
+    }
+
+
+def summarize(results: List[dict]) -> dict:
+    """ aggregate the game results of one level, the survival time comes
+    from the games not completed and the clear time from the completed """
+    if not results:
+        return {"games": 0}
+    damage = np.array([item["damage"] for item in results])
+    completed = np.array([item["completed"] for item in results])
+    return {
+        "games": len(results),
+        "completion_rate": float(completed.mean()),
+        **time_stats("survival", [item for item in results
+                                  if not item["completed"]]),
+        **time_stats("clear", [item for item in results
+                               if item["completed"]]),
+        "damage_mean": float(damage.mean()),
+        "damage_p90": float(np.percentile(damage, 90)),
+        "score_mean": float(np.mean([item["score"] for item in results])),
+    }
+
+
+def estimate(levels: List[int], games: int = 1000, seed: int = 0,
+             workers: int | None = None, chunk_size: int = 25,
+             max_frames: int = 7200) -> Dict[int, dict]:
+    """
+    Runs {games} bot games per level across a process pool
+    :return: level -> summary
+    """
+    workers = workers or os.cpu_count()
+    # spawn: each worker needs its own pygame, not a copy of ours
+    context = multiprocessing.get_context("spawn")
+    results: Dict[int, List[dict]] = {level: [] for level in levels}
+    with ProcessPoolExecutor(max_workers=workers,
+                             mp_context=context) as pool:
+        futures = {}
+        for level in levels:
+            # each level uses the same seeds, the levels are compared
+            # with the same luck
+            for start in range(0, games, chunk_size):
+                seeds = list(range(seed + start,
+                                   seed + min(start + chunk_size, games)))
+                future = pool.submit(play_games, level, seeds, max_frames)
+                futures[future] = level
+        for future, level in futures.items():
+            results[level].extend(future.result())
+    return {level: summarize(items) for level, items in results.items()}
+
+
+def format_seconds(value: float | None, width: int) -> str:
+    return f"{'-':>{width}}" if value is None else f"{value:>{width}.1f}"
+
+
+def format_report(report: Dict[int, dict]) -> str:
+    lines = [
+        "level | games | completed | survival s (mean/p10/p50) "
+        "| clear s (mean/p50) | damage (mean/p90) | score",
+    ]
+    for level, item in report.items():
+        if not item["games"]:
+            lines.append(f"{level:>5} | {0:>5} | no games")
+            continue
+        lines.append(
+            f"{level:>5} | {item['games']:>5} | "
+            f"{item['completion_rate'] * 100:>8.1f}% | "
+            f"{format_seconds(item['survival_s_mean'], 6)} / "
+            f"{format_seconds(item['survival_s_p10'], 5)} / "
+            f"{format_seconds(item['survival_s_p50'], 5)} | "
+            f"{format_seconds(item['clear_s_mean'], 6)} / "
+            f"{format_seconds(item['clear_s_p50'], 5)} | "
+            f"{item['damage_mean']:>5.1f} / {item['damage_p90']:>5.1f} | "
+            f"{item['score_mean']:.1f}")
+    return "\n".join(lines)
+
+
+def parse_levels(value: str) -> List[int]:
+    """ "1-3,5" -> [1, 2, 3, 5] """
+    levels = []
+    for part in value.split(","):
+        if "-" in part:
+            start, end = part.split("-")
+            levels.extend(range(int(start), int(end) + 1))
+        else:
+            levels.append(int(part))
+    return levels
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Estimate the level difficulty with bot games")
+    parser.add_argument("--levels", default="1-9", type=parse_levels,
+                        help="levels to measure, e.g. 1-3,5")
+    parser.add_argument("--games", type=int, default=1000,
+                        help="games per level")
+    parser.add_argument("--seed", type=int, default=0,
+                        help="first game seed")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="worker processes (default: cpu count)")
+    parser.add_argument("--max-seconds", type=int, default=120,
+                        help="game time limit per game")
+    parser.add_argument("--json", default=None,
+                        help="save the report into a json file")
+    args = parser.parse_args()
+    report = estimate(args.levels, games=args.games, seed=args.seed,
+                      workers=args.workers,
+                      max_frames=args.max_seconds * 1000 // 16)
+    print(format_report(report))
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+"""
+Adapters to keep the pygame sprites working over the entity components: the
+state of the sprite (position, life, animation playhead, AI flags) lives on
+the world where the systems update all of them at once. The sprite reads
+single fields with {EntitySprite.get_field} (read only views of the
+subclasses), writes them with {EntitySprite.set_fields} and keeps the image
+and rect used to draw it
+"""
+import pygame
+
+from src.ecs.components import COLLIDER, TRANSFORM
+from src.ecs.world import World
+
+
+class EntitySprite:
+    """
+    Mixin for the sprites backed by an entity, it must be the first base
+    class (kill releases the entity). The entity is created with
+    {create_entity}, its transform needs to be added before the position
+    methods are used
+    """
+
+    world: World = None
+    entity_id = -1
+    # (component, field) -> last value, kept when the entity is released
+    detached: dict = None
+
+    def create_entity(self, world: World, **components: dict) -> int:
+        """
+        :param world: world of the game level
+        :param components: component name -> initial field values
+        :return: entity id
+        """
+        self.world = world
+        self.entity_id = world.create_entity()
+        for name, values in components.items():
+            world.stores[name].add(self.entity_id, **values)
+        return self.entity_id
+
+    def release_entity(self) -> None:
+        """ saves the component values on the sprite and destroys the
+        entity (dead sprites can still be referenced for a frame) """
+        if self.entity_id < 0:
+            return
+        detached = {}
+        for name, store in self.world.stores.items():
+            if self.entity_id in store:
+                row = store.sparse.item(self.entity_id)
+                for field, column in store.columns.items():
+                    detached[(name, field)] = column.item(row)
+        self.detached = detached
+        self.world.destroy_entity(self.entity_id)
+        self.entity_id = -1
+
+    def kill(self) -> None:
+        super().kill()
+        self.release_entity()
+
+    def get_field(self, component: str, field: str):
+        """ value of a field of the entity as a python number """
+        if self.entity_id < 0:
+            return self.detached[(component, field)]
+        store = self.world.stores[component]
+        return store.columns[field].item(store.sparse.item(self.entity_id))
+
+    def set_fields(self, component: str, **values) -> None:
+        """ writes fields of a component of the entity """
+        if self.entity_id < 0:
+            for field, value in values.items():
+                self.detached[(component, field)] = value
+            return
+        store = self.world.stores[component]
+        row = store.sparse[self.entity_id]
+        for field, value in values.items():
+            store.columns[field][row] = value
+
+    def get_center(self) -> tuple:
+        """ sub pixel center of the entity """
+        store = self.world.stores[TRANSFORM]
+        row = store.sparse.item(self.entity_id)
+        return (store.columns["x"].item(row), store.columns["y"].item(row))
+
+    def set_center(self, x: float, y: float) -> None:
+        """ moves the entity and its rect to the given center """
+        store = self.world.stores[TRANSFORM]
+        row = store.sparse[self.entity_id]
+        store.columns["x"][row] = x
+        store.columns["y"][row] = y
+        self.rect.center = (x, y)
+
+    def move_center(self, dx: float, dy: float) -> None:
+        x, y = self.get_center()
+        self.set_center(x + dx, y + dy)
+
+    def sync_rect(self) -> None:
+        """ moves the rect to the entity transform """
+        store = self.world.stores[TRANSFORM]
+        row = store.sparse[self.entity_id]
+        self.rect.center = (store.columns["x"][row], store.columns["y"][row])
+
+    def path(self) -> tuple:
+        """ movement of the last frame: previous and current center """
+        store = self.world.stores[TRANSFORM]
+        row = store.sparse.item(self.entity_id)
+        columns = store.columns
+        return (columns["prev_x"].item(row), columns["prev_y"].item(row),
+                columns["x"].item(row), columns["y"].item(row))
+
+    def hit_size(self) -> tuple:
+        """ size of the collider component, the image size without it """
+        if self.entity_id >= 0:
+            collider = self.world.stores[COLLIDER]
+            if self.entity_id in collider:
+                row = collider.sparse.item(self.entity_id)
+                return (collider.columns["width"].item(row),
+                        collider.columns["height"].item(row))
+        return self.image.get_size()
+
+    def set_hit_size(self, width: int, height: int) -> None:
+        """ adds or resizes the collider component """
+        collider = self.world.stores[COLLIDER]
+        if self.entity_id in collider:
+            row = collider.sparse[self.entity_id]
+            collider.columns["width"][row] = width
+            collider.columns["height"][row] = height
+        else:
+            collider.add(self.entity_id, width=width, height=height)
+
+    def hit_rect(self) -> pygame.Rect:
+        """ hit box centered on the sprite """
+        rect = pygame.Rect((0, 0), self.hit_size())
+        rect.center = self.rect.center
+        return rect
@@ -0,0 +1,30 @@
+import numpy as np
+
+# component name -> fields (numpy column types)
+TRANSFORM = "transform"
+VELOCITY = "velocity"
+HEALTH = "health"
+COLLIDER = "collider"
+ANIMATION = "animation"
+AI_STATE = "ai_state"
+
+COMPONENTS = {
+    # center of the entity in sub pixels, the sprite rect is the rounded one.
+    # prev_x/prev_y: center before the last move (swept collisions)
+    TRANSFORM: {"x": np.float64, "y": np.float64,
+                "prev_x": np.float64, "prev_y": np.float64},
+    # pixels per frame
+    VELOCITY: {"vx": np.float64, "vy": np.float64},
+    # life <= 0 is found by the health system (see src.ecs.systems)
+    HEALTH: {"life": np.int32, "init_life": np.int32},
+    # hit box size (centered on the transform), collisions use it instead
+    # of the image size
+    COLLIDER: {"width": np.int32, "height": np.int32},
+    # playhead of the Animator (milliseconds), the animation system moves
+    # the timer of the playing rows or counts down their delay
+    ANIMATION: {"timer": np.float64, "delay": np.float64,
+                "playing": np.bool_},
+    AI_STATE: {"on_attack": np.bool_, "restart_pos": np.bool_,
+               "idle": np.bool_},
+}
+
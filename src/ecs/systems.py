@@ -0,0 +1,83 @@
+"""
+Systems: functions that update one or more components of all the entities at
+once (numpy operations over the component columns)
+"""
+import numpy as np
+
+from src.ecs.components import (
+    AI_STATE,
+    ANIMATION,
+    COMPONENTS,
+    HEALTH,
+    TRANSFORM,
+    VELOCITY,
+)
+from src.ecs.world import World
+
+
+def joined_rows(world: World, component: str, other: str) -> np.ndarray:
+    """ rows on {other} of the entities that have {component}, every
+    entity of {component} must have {other} """
+    store = world.stores[component]
+    return world.stores[other].sparse[store.entities[:store.count]]
+
+
+def movement_system(world: World) -> None:
+    """ moves every entity with velocity """
+    velocity = world.stores[VELOCITY]
+    if not velocity.count:
+        return
+    transform = world.stores[TRANSFORM]
+    rows = joined_rows(world, VELOCITY, TRANSFORM)
+    x = transform.columns["x"]
+    y = transform.columns["y"]
+    transform.columns["prev_x"][rows] = x[rows]
+    transform.columns["prev_y"][rows] = y[rows]
+    x[rows] += velocity.view("vx")
+    y[rows] += velocity.view("vy")
+
+
+def dead_entities(world: World) -> np.ndarray:
+    """ entities without life left """
+    health = world.stores[HEALTH]
+    return health.entities[:health.count][health.view("life") <= 0]
+
+
+def animation_system(world: World, frame_ms: float) -> None:
+    """
+    Moves the playhead of every animation one frame: rows with a delay
+    count it down, the playing ones advance their timer. It runs after the
+    animators draw the frame (see {Animator.render_animation})
+    """
+    animation = world.stores[ANIMATION]
+    if not animation.count:
+        return
+    delay = animation.view("delay")
+    delayed = delay > 0
+    delay[delayed] -= frame_ms
+    animation.view("timer")[animation.view("playing") & ~delayed] += (
+        frame_ms)
+
+
+def count_attacking(world: World) -> int:
+    """ number of entities running an attack """
+    return int(np.count_nonzero(world.stores[AI_STATE].view("on_attack")))
+
+
+def sync_idle_timers(world: World, timer: float) -> None:
+    """ all the idle entities play the same animation time """
+    ai_state = world.stores[AI_STATE]
+    if not ai_state.count:
+        return
+    rows = joined_rows(world, AI_STATE, ANIMATION)
+    world.stores[ANIMATION].columns["timer"][
+        rows[ai_state.view("idle")]] = timer
+
+
+def create_world() -> World:
+    """ world with the game components and systems, one per level """
+    world = World()
+    for name, fields in COMPONENTS.items():
+        world.register(name, fields)
+    world.add_system(movement_system)
+    return world
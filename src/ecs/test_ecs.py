@@ -0,0 +1,135 @@
+import unittest
+
+from src.characters.enemy import Bullet as EnemyBullet
+from src.characters.player import Bullet
+from src.collision import hit_rect
+from src.ecs.components import (
+    AI_STATE,
+    ANIMATION,
+    COLLIDER,
+    HEALTH,
+    TRANSFORM,
+    VELOCITY,
+)
+from src.ecs.systems import (
+    animation_system,
+    count_attacking,
+    create_world,
+    dead_entities,
+    sync_idle_timers,
+)
+from src.headless import HeadlessGame
+from src.input_system import ACTION_FIRE, InputSnapshot
+
+
+class TestEcs(unittest.TestCase):
+    def test_store_swap_remove(self):
+        world = create_world()
+        collider = world.stores[COLLIDER]
+        entities = [world.create_entity() for _ in range(100)]
+        for entity in entities:
+            collider.add(entity, width=entity)
+        collider.remove(entities[0])
+        world.destroy_entity(entities[50])
+        self.assertEqual(len(collider), 98)
+        self.assertNotIn(entities[0], collider)
+        # the moved rows keep their values
+        for entity in entities[1:50] + entities[51:]:
+            self.assertEqual(collider.get(entity, "width"), entity)
+        # ids are reused
+        self.assertEqual(world.create_entity(), entities[50])
+
+    def test_systems(self):
+        world = create_world()
+        moving = world.create_entity()
+        world.stores[TRANSFORM].add(moving, x=10, y=10)
+        world.stores[VELOCITY].add(moving, vx=0.5, vy=-2)
+        still = world.create_entity()
+        world.stores[TRANSFORM].add(still, x=1, y=1)
+        for _ in range(4):
+            world.update()
+        self.assertEqual(world.stores[TRANSFORM].get(moving, "x"), 12)
+        self.assertEqual(world.stores[TRANSFORM].get(moving, "y"), 2)
+        self.assertEqual(world.stores[TRANSFORM].get(still, "x"), 1)
+
+    def test_bulk_systems(self):
+        world = create_world()
+        entities = [world.create_entity() for _ in range(4)]
+        for life, entity in zip((10, 0, 5, -3), entities):
+            world.stores[HEALTH].add(entity, life=life)
+            world.stores[ANIMATION].add(entity, timer=100)
+        self.assertEqual(dead_entities(world).tolist(),
+                         [entities[1], entities[3]])
+        animation = world.stores[ANIMATION]
+        animation.set(entities[0], "playing", True)
+        animation.set(entities[1], "playing", True)
+        animation.set(entities[1], "delay", 20)
+        animation_system(world, 16)
+        # the delayed row waits, the stopped ones keep their time
+        self.assertEqual([animation.get(entity, "timer")
+                          for entity in entities], [116, 100, 100, 100])
+        self.assertEqual(animation.get(entities[1], "delay"), 4)
+        ai_state = world.stores[AI_STATE]
+        for idle, entity in zip((True, False, True, False), entities[::-1]):
+            ai_state.add(entity, idle=idle, on_attack=not idle)
+        self.assertEqual(count_attacking(world), 2)
+        sync_idle_timers(world, 50)
+        self.assertEqual([animation.get(entity, "timer")
+                          for entity in entities], [116, 50, 100, 50])
+
+    def test_enemy_components(self):
+        game = HeadlessGame(seed=3, render=False)
+        game_level = game.level_controller.game_level
+        enemy_ref = game_level.enemy_army.enemiesGroup.sprites()[0]
+        bullet = EnemyBullet(game.session, 10, 10)
+        self.assertTrue(enemy_ref.idle)
+        self.assertFalse(bullet.idle)
+        enemy_ref.take_damage(enemy_ref.life)
+        # the hive mind finds it with the health system
+        self.assertFalse(enemy_ref.is_dead)
+        game_level.enemy_controller.check_deaths()
+        self.assertTrue(enemy_ref.is_dead)
+
+    def test_sprites_release_entities(self):
+        game = HeadlessGame(seed=3, render=False)
+        fire = InputSnapshot(ACTION_FIRE)
+        for _ in range(600):
+            game.step(fire)
+        game_level = game.level_controller.game_level
+        sprites = (len(game_level.enemy_army.enemiesGroup)
+                   + len(game_level.player_controller.playerGroup) - 1)
+        self.assertEqual(game.session.world.alive, sprites)
+        enemy_ref = game_level.enemy_army.enemiesGroup.sprites()[0]
+        life = enemy_ref.life
+        enemy_ref.kill()
+        # a dead sprite keeps its last state
+        self.assertEqual(enemy_ref.entity_id, -1)
+        self.assertEqual(enemy_ref.life, life)
+
+    def test_collider_hit_box(self):
+        game = HeadlessGame(seed=3, render=False)
+        player = game.level_controller.game_level.player_controller.player
+        bullet = Bullet(game.session, player)
+        collider = game.session.world.stores[COLLIDER]
+        collider.set(bullet.entity_id, "width", 2)
+        rect = hit_rect(bullet)
+        self.assertEqual(rect.size, (2, bullet.rect.height))
+        self.assertEqual(rect.center, bullet.rect.center)
+
+    def test_rotation_keeps_hit_box(self):
+        game = HeadlessGame(seed=3, render=False)
+        enemy = game.level_controller.game_level.enemy_army \
+            .enemiesGroup.sprites()[0]
+        size = hit_rect(enemy).size
+        enemy.angle = 45
+        enemy.update_image()
+        # the rotated image is bigger, the hit box is not
+        self.assertGreater(enemy.rect.width, size[0])
+        self.assertEqual(hit_rect(enemy).size, size)
+        enemy.width_change = enemy.height_change = 10
+        enemy.update_image()
+        self.assertEqual(hit_rect(enemy).size, (size[0] + 10, size[1] + 10))
+
+
+if __name__ == '__main__':
+    unittest.main()
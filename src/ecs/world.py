@@ -0,0 +1,140 @@
+from typing import Dict, List
+
+import numpy as np
+
+
+class ComponentStore:
+    """
+    Dense storage of one component type (sparse set). Each field is a numpy
+    column, the rows [0, count) are the entities that have the component, so
+    systems can work over all of them with a single numpy operation.
+    Removing swaps the last row into the free place, rows are not stable,
+    use {index} to find the row of an entity.
+    """
+
+    def __init__(self, name: str, fields: Dict[str, type],
+                 capacity: int = 64):
+        self.name = name
+        self.fields = fields
+        self.count = 0
+        self.columns: Dict[str, np.ndarray] = {
+            field: np.zeros(capacity, dtype=dtype)
+            for field, dtype in fields.items()}
+        # row -> entity id
+        self.entities = np.full(capacity, -1, dtype=np.int32)
+        # entity id -> row (-1 = entity doesn't have the component)
+        self.sparse = np.full(capacity, -1, dtype=np.int32)
+
+    def __len__(self):
+        return self.count
+
+    def __contains__(self, entity: int) -> bool:
+        return entity < len(self.sparse) and self.sparse[entity] >= 0
+
+    def index(self, entity: int) -> int:
+        return self.sparse[entity]
+
+    def __grow_sparse(self, entity: int):
+        if entity < len(self.sparse):
+            return
+        size = max(entity + 1, len(self.sparse) * 2)
+        sparse = np.full(size, -1, dtype=np.int32)
+        sparse[:len(self.sparse)] = self.sparse
+        self.sparse = sparse
+
+    def __grow_rows(self):
+        size = len(self.entities) * 2
+        for field, column in self.columns.items():
+            grown = np.zeros(size, dtype=column.dtype)
+            grown[:self.count] = column[:self.count]
+            self.columns[field] = grown
+        entities = np.full(size, -1, dtype=np.int32)
+        entities[:self.count] = self.entities[:self.count]
+        self.entities = entities
+
+    def add(self, entity: int, **values) -> None:
+        if entity in self:
+            raise KeyError(f"{self.name}: entity {entity} already has it")
+        self.__grow_sparse(entity)
+        if self.count == len(self.entities):
+            self.__grow_rows()
+        row = self.count
+        for field, column in self.columns.items():
+            column[row] = values.get(field, 0)
+        self.entities[row] = entity
+        self.sparse[entity] = row
+        self.count += 1
+
+    def remove(self, entity: int) -> None:
+        if entity not in self:
+            return
+        row = self.sparse[entity]
+        last = self.count - 1
+        if row != last:
+            # move the last row into the free place
+            for column in self.columns.values():
+                column[row] = column[last]
+            moved = self.entities[last]
+            self.entities[row] = moved
+            self.sparse[moved] = row
+        self.entities[last] = -1
+        self.sparse[entity] = -1
+        self.count -= 1
+
+    def get(self, entity: int, field: str):
+        return self.columns[field][self.sparse[entity]]
+
+    def set(self, entity: int, field: str, value) -> None:
+        self.columns[field][self.sparse[entity]] = value
+
+    def view(self, field: str) -> np.ndarray:
+        """ column of the entities that have the component """
+        return self.columns[field][:self.count]
+
+    def clear(self) -> None:
+        self.sparse[self.entities[:self.count]] = -1
+        self.entities[:self.count] = -1
+        self.count = 0
+
+
+class World:
+    """
+    Entities of a game session: an entity is just an integer id, its data
+    lives on the component stores and the systems update the stores in bulk
+    """
+
+    def __init__(self):
+        self.__next_id = 0
+        self.__free_ids: List[int] = []
+        self.alive = 0
+        self.stores: Dict[str, ComponentStore] = {}
+        self.systems: List = []
+
+    def register(self, name: str, fields: Dict[str, type]) -> ComponentStore:
+        store = ComponentStore(name, fields)
+        self.stores[name] = store
+        return store
+
+    def create_entity(self) -> int:
+        self.alive += 1
+        if self.__free_ids:
+            return self.__free_ids.pop()
+        entity = self.__next_id
+        self.__next_id += 1
+        return entity
+
+    def destroy_entity(self, entity: int) -> None:
+        """ removes all the components of the entity and frees its id """
+        for store in self.stores.values():
+            store.remove(entity)
+        self.__free_ids.append(entity)
+        self.alive -= 1
+
+    def add_system(self, system) -> None:
+        """ system: callable that receives the world, run on {update} in
+        the order they were added """
+        self.systems.append(system)
+
+    def update(self) -> None:
+        for system in self.systems:
+            system(self)
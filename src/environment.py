@@ -0,0 +1,308 @@
+"""
+Gym style API to let bots play the game:
+    env = GameEnv()
+    obs = env.reset(seed=1)
+    obs, reward, done, info = env.step(ACTION_FIRE | ACTION_LEFT)
+{VectorEnv} steps N games at the same time over a pool of worker processes.
+"""
+import multiprocessing
+import os
+from multiprocessing import shared_memory
+from typing import Dict, List
+
+import numpy as np
+
+from src.headless import HeadlessGame
+from src.input_system import InputSnapshot
+
+# enemy states on the observation
+STATE_IDLE = 0
+STATE_ATTACK = 1
+STATE_RETURN = 2
+
+
+class GameEnv:
+    """
+    One headless game driven by actions. An action is an int with the
+    ACTION_* flags of the input system (0-31).
+    Observations are numpy arrays (always the same objects, they are
+    overwritten on each step, copy them if you need to keep them):
+    - player: [x, y, life, score, level]
+    - enemies: MAX_ENEMIES rows of [x, y, life, type, state]
+    - enemy_count: number of valid rows on enemies
+    - bullets: MAX_BULLETS rows of [x, y, owner] (owner 0 enemy, 1 player)
+    - bullet_count: number of valid rows on bullets
+    Each env has its own game session, many of them can run in the same
+    process, use {VectorEnv} to spread them over the cpu cores.
+    """
+
+    ACTIONS = 32
+    MAX_ENEMIES = 64
+    MAX_BULLETS = 64
+    OBSERVATION_SHAPES = {
+        "player": (5,),
+        "enemies": (MAX_ENEMIES, 5),
+        "enemy_count": (1,),
+        "bullets": (MAX_BULLETS, 3),
+        "bullet_count": (1,),
+    }
+
+    def __init__(self, max_frames: int = 18000, delta_ms: int = 16,
+                 single_level: bool = False,
+                 observation: Dict[str, np.ndarray] | None = None):
+        """
+        :param max_frames: truncate the game after this frames (5 minutes)
+        :param delta_ms: simulated milliseconds per step
+        :param single_level: game ends when the start level is completed
+        :param observation: arrays to write the observations, they can be
+        views of a shared memory (see {VectorEnv})
+        """
+        self.max_frames = max_frames
+        self.delta_ms = delta_ms
+        self.single_level = single_level
+        self.observation = observation or self.create_observation()
+        self.game: HeadlessGame | None = None
+        self.start_level = 1
+        # snapshots are reused, one per action
+        self.__snapshots = [InputSnapshot(a) for a in range(self.ACTIONS)]
+        self.__last_score = 0
+        self.__last_life = 0
+
+    @classmethod
+    def create_observation(cls) -> Dict[str, np.ndarray]:
+        return {key: np.zeros(shape, dtype=np.float32)
+                for key, shape in cls.OBSERVATION_SHAPES.items()}
+
+    def reset(self, seed: int | None = None,
+              level: int = 1) -> Dict[str, np.ndarray]:
+        self.start_level = level
+        self.game = HeadlessGame(seed=seed, level=level, render=False)
+        self.__last_score = self.session.score
+        self.__last_life = self.session.life
+        self.observe()
+        return self.observation
+
+    def step(self, action: int) -> tuple:
+        """
+        :param action: ACTION_* flags
+        :return: observation, reward, done, info
+        reward is the score earned minus the life lost on this step
+        """
+        self.game.step(self.__snapshots[action], self.delta_ms)
+        session = self.session
+        reward = ((session.score - self.__last_score)
+                  - (self.__last_life - session.life))
+        self.__last_score = session.score
+        self.__last_life = session.life
+        game_over = session.life <= 0
+        level_completed = session.level > self.start_level
+        done = (game_over or self.level_controller.is_completed
+                or (self.single_level and level_completed)
+                or self.game.frame >= self.max_frames)
+        self.observe()
+        info = {
+            "frame": self.game.frame,
+            "seed": self.game.seed,
+            "level": session.level,
+            "score": session.score,
+            "life": session.life,
+            "game_over": game_over,
+            "level_completed": level_completed,
+        }
+        return self.observation, reward, done, info
+
+    @property
+    def session(self):
+        return self.game.session
+
+    @property
+    def level_controller(self):
+        return self.game.level_controller
+
+    def observe(self) -> None:
+        """ write the game state into the observation arrays """
+        game_level = self.level_controller.game_level
+        player = self.observation["player"]
+        enemies = self.observation["enemies"]
+        bullets = self.observation["bullets"]
+        player_rect = game_level.player_controller.player.rect
+        player[0] = player_rect.x
+        player[1] = player_rect.y
+        player[2] = self.session.life
+        player[3] = self.session.score
+        player[4] = self.session.level
+        # the arrays are filled item by item to avoid building lists or
+        # tuples per sprite
+        enemy_idx = 0
+        bullet_idx = 0
+        for sprite in game_level.enemy_army.enemiesGroup.spritedict:
+            rect = sprite.rect
+            if sprite.type == 0:
+                if bullet_idx < self.MAX_BULLETS:
+                    bullets[bullet_idx, 0] = rect.x
+                    bullets[bullet_idx, 1] = rect.y
+                    bullets[bullet_idx, 2] = 0
+                    bullet_idx += 1
+                continue
+            if enemy_idx >= self.MAX_ENEMIES:
+                continue
+            enemies[enemy_idx, 0] = rect.x
+            enemies[enemy_idx, 1] = rect.y
+            enemies[enemy_idx, 2] = sprite.life
+            enemies[enemy_idx, 3] = sprite.type
+            enemies[enemy_idx, 4] = (
+                STATE_ATTACK if sprite.on_attack else
+                STATE_RETURN if sprite.restart_pos else STATE_IDLE)
+            enemy_idx += 1
+        for sprite in game_level.player_controller.playerGroup.spritedict:
+            if sprite.tag != "bullet" or bullet_idx >= self.MAX_BULLETS:
+                continue
+            bullets[bullet_idx, 0] = sprite.rect.x
+            bullets[bullet_idx, 1] = sprite.rect.y
+            bullets[bullet_idx, 2] = 1
+            bullet_idx += 1
+        # clear the rows of the previous step
+        enemies[enemy_idx:] = 0
+        bullets[bullet_idx:] = 0
+        self.observation["enemy_count"][0] = enemy_idx
+        self.observation["bullet_count"][0] = bullet_idx
+
+
+def _attach_observation(shm_list, num_envs: int) -> Dict[str, np.ndarray]:
+    """ numpy views (num_envs, ...) over the shared memory blocks """
+    return {
+        key: np.ndarray((num_envs,) + shape, dtype=np.float32,
+                        buffer=shm.buf)
+        for (key, shape), shm in zip(GameEnv.OBSERVATION_SHAPES.items(),
+                                     shm_list)}
+
+
+def _worker(indexes: List[int], num_envs: int, conn, shm_names: List[str],
+            env_kwargs: dict):
+    """ worker process loop, it hosts the {GameEnv} of the given indexes """
+    shm_list = [shared_memory.SharedMemory(name=name) for name in shm_names]
+    observation = _attach_observation(shm_list, num_envs)
+    envs = [GameEnv(observation={key: array[index]
+                                 for key, array in observation.items()},
+                    **env_kwargs)
+            for index in indexes]
+    seeds = [None] * len(envs)
+    level = 1
+    try:
+        while True:
+            command, data = conn.recv()
+            if command == "reset":
+                seeds, level = data
+                for env, seed in zip(envs, seeds):
+                    env.reset(seed, level)
+                conn.send(None)
+            elif command == "step":
+                results = []
+                for idx, (env, action) in enumerate(zip(envs, data)):
+                    _, reward, done, info = env.step(action)
+                    if done:
+                        # start a new game, the new seed comes from the last
+                        seeds[idx] = (None if seeds[idx] is None
+                                      else seeds[idx] + num_envs)
+                        env.reset(seeds[idx], level)
+                    results.append((reward, done, info))
+                conn.send(results)
+            elif command == "close":
+                break
+    finally:
+        # numpy views need to be released before closing the memory
+        del envs, observation
+        for shm in shm_list:
+            shm.close()
+        conn.close()
+
+
+class VectorEnv:
+    """
+    Steps N {GameEnv} at the same time in a pool of worker processes, each
+    worker runs a slice of the games. The observations are written by the
+    workers into shared memory, the pipes just carry the actions and
+    rewards. Games that end are restarted automatically (info of that step
+    has the final values).
+    """
+
+    def __init__(self, num_envs: int, num_workers: int | None = None,
+                 **env_kwargs):
+        """
+        :param num_envs: number of games
+        :param num_workers: worker processes (default: one per cpu, at
+        most one per game)
+        :param env_kwargs: {GameEnv} parameters
+        """
+        self.num_envs = num_envs
+        num_workers = min(num_envs, num_workers or os.cpu_count() or 1)
+        self.__shm_list = [
+            shared_memory.SharedMemory(
+                create=True,
+                size=num_envs * 4 * int(np.prod(shape)))
+            for shape in GameEnv.OBSERVATION_SHAPES.values()]
+        self.observation = _attach_observation(self.__shm_list, num_envs)
+        # spawn: each worker needs its own pygame, not a copy of ours
+        context = multiprocessing.get_context("spawn")
+        self.__conns = []
+        self.__slices: List[List[int]] = []
+        self.__processes = []
+        for worker in range(num_workers):
+            indexes = list(range(worker, num_envs, num_workers))
+            parent_conn, child_conn = context.Pipe()
+            process = context.Process(
+                target=_worker, daemon=True,
+                args=(indexes, num_envs, child_conn,
+                      [shm.name for shm in self.__shm_list], env_kwargs))
+            process.start()
+            child_conn.close()
+            self.__conns.append(parent_conn)
+            self.__slices.append(indexes)
+            self.__processes.append(process)
+        self.closed = False
+
+    def reset(self, seeds: List[int | None] | None = None,
+              level: int = 1) -> Dict[str, np.ndarray]:
+        seeds = seeds or [None] * self.num_envs
+        for conn, indexes in zip(self.__conns, self.__slices):
+            conn.send(("reset", ([seeds[idx] for idx in indexes], level)))
+        for conn in self.__conns:
+            conn.recv()
+        return self.observation
+
+    def step(self, actions) -> tuple:
+        """
+        :param actions: one action per game
+        :return: observations, rewards, dones, infos
+        """
+        for conn, indexes in zip(self.__conns, self.__slices):
+            conn.send(("step", [int(actions[idx]) for idx in indexes]))
+        rewards = np.zeros(self.num_envs, dtype=np.float32)
+        dones = np.zeros(self.num_envs, dtype=bool)
+        infos = [None] * self.num_envs
+        for conn, indexes in zip(self.__conns, self.__slices):
+            for idx, (reward, done, info) in zip(indexes, conn.recv()):
+                rewards[idx] = reward
+                dones[idx] = done
+                infos[idx] = info
+        return self.observation, rewards, dones, infos
+
+    def close(self) -> None:
+        if self.closed:
+            return
+        for conn in self.__conns:
+            conn.send(("close", None))
+            conn.close()
+        for process in self.__processes:
+            process.join()
+        self.observation = None
+        for shm in self.__shm_list:
+            shm.close()
+            shm.unlink()
+        self.closed = True
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,119 @@
+"""
+Gameplay events for analytics (kills, damage, shots, levels, restarts).
+The game appends them to an in memory buffer on the frame path and a writer
+thread flushes the buffer in batches to a JSON lines file, rotated by size:
+    events.jsonl, events.jsonl.1 ... events.jsonl.<backups>
+One line per event: {"t": ms since the log started, "frame": simulated
+frame, "level": level, "event": name, ...event fields}
+"""
+import json
+import os
+import threading
+import time
+from collections import deque
+
+# event names
+EVENT_KILL = "kill"
+EVENT_DAMAGE = "damage"
+EVENT_SHOT = "shot"
+EVENT_LEVEL_COMPLETED = "level_completed"
+EVENT_RESTART = "restart"
+
+
+class EventLog:
+    """
+    The session keeps it on {GameSession.event_log} (None doesn't record),
+    the game calls {emit}. The buffer is a deque: appending from the frame
+    and taking from the writer don't need a lock
+    """
+
+    def __init__(self, file: str = "events.jsonl",
+                 max_bytes: int = 1024 * 1024, backups: int = 3,
+                 flush_interval: float = 0.5):
+        """
+        :param file: log file, the rotated ones get a number suffix
+        :param max_bytes: the file is rotated after this size
+        :param backups: rotated files kept
+        :param flush_interval: seconds between the writes of the buffer
+        """
+        self.file = file
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self.flush_interval = flush_interval
+        self.emitted = 0
+        self.written = 0
+        self.rotations = 0
+        self.__buffer: deque = deque()
+        self.__start = time.perf_counter()
+        directory = os.path.dirname(file)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.__output = open(file, "a", encoding="utf-8")
+        self.__stop = threading.Event()
+        self.__error: BaseException | None = None
+        self.__thread = threading.Thread(target=self.__run, daemon=True,
+                                         name="event log")
+        self.__thread.start()
+
+    def emit(self, event: str, frame: int, level: int, **fields) -> None:
+        """
+        Records an event, it is written later by the writer thread
+        :param frame: simulated frame of the event ({GameSession.frame})
+        """
+        if self.__error:
+            raise self.__error
+        self.__buffer.append((time.perf_counter(), frame, level, event,
+                              fields))
+        self.emitted += 1
+
+    def __run(self) -> None:
+        try:
+            while not self.__stop.wait(self.flush_interval):
+                self.__flush()
+            self.__flush()
+        except BaseException as error:
+            self.__error = error
+
+    def __flush(self) -> None:
+        """ writes the buffered events as one batch """
+        buffer = self.__buffer
+        lines = []
+        while buffer:
+            moment, frame, level, event, fields = buffer.popleft()
+            record = {"t": round((moment - self.__start) * 1000, 3),
+                      "frame": frame, "level": level, "event": event}
+            record.update(fields)
+            lines.append(json.dumps(record, separators=(",", ":")))
+        if not lines:
+            return
+        self.__output.write("\n".join(lines) + "\n")
+        self.__output.flush()
+        self.written += len(lines)
+        if self.__output.tell() >= self.max_bytes:
+            self.__rotate()
+
+    def __rotate(self) -> None:
+        """ events.jsonl -> events.jsonl.1 -> ... the oldest is dropped """
+        self.__output.close()
+        for index in range(self.backups - 1, 0, -1):
+            older = f"{self.file}.{index}"
+            if os.path.exists(older):
+                os.replace(older, f"{self.file}.{index + 1}")
+        if self.backups:
+            os.replace(self.file, f"{self.file}.1")
+        else:
+            os.remove(self.file)
+        self.__output = open(self.file, "a", encoding="utf-8")
+        self.rotations += 1
+
+    def close(self) -> None:
+        """ writes the events left and closes the file """
+        self.__stop.set()
+        self.__thread.join()
+        self.__output.close()
+        if self.__error:
+            raise self.__error
+
+    def __str__(self):
+        return (f"event log: {self.emitted} events ({self.written} written, "
+                f"{self.rotations} rotations) in {self.file}")
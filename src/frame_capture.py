@@ -0,0 +1,186 @@
+"""
+Gameplay recording without blocking the frame loop: the presented screen
+is copied into a ring of surfaces allocated once and a writer thread saves
+their pixels as they are in memory (file writes release the GIL). When
+every buffer is waiting for the writer the frame is dropped (and counted),
+the loop never waits. The writer encodes the PNG sequences itself with zlib
+(it releases the GIL on large buffers, the pygame encoder doesn't).
+    ffmpeg -f rawvideo -pixel_format bgr0 -video_size 600x600
+           -framerate 60 -i capture.raw capture.mp4
+"""
+import json
+import os
+import queue
+import struct
+import sys
+import threading
+import zlib
+from typing import BinaryIO, List
+
+import numpy as np
+import pygame
+
+from src.globals import GameAssets
+from src.surface_registry import OWNER_CAPTURE
+
+ASSETS = GameAssets()
+
+CAPTURE_FORMATS = ("png", "raw")
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+# fast compression, the writer keeps up with the frame loop
+PNG_COMPRESSION = 1
+
+
+def raw_pixel_format(surface: pygame.Surface) -> str:
+    """ ffmpeg name of the 32 bits pixel format of the surface (bgr0,
+    rgba...), the channels in memory order """
+    channels = ["0"] * 4
+    for name, mask, shift in zip("rgba", surface.get_masks(),
+                                 surface.get_shifts()):
+        if mask:
+            byte = shift // 8
+            if sys.byteorder == "big":
+                byte = 3 - byte
+            channels[byte] = name
+    return "".join(channels)
+
+
+def png_chunk(kind: bytes, data: bytes) -> bytes:
+    """ length, type, data and CRC of a PNG chunk """
+    return (struct.pack(">I", len(data)) + kind + data
+            + struct.pack(">I", zlib.crc32(kind + data)))
+
+
+class FrameCapture:
+    """
+    The frame loop calls {capture} after the flip and {close} at the end.
+    PNG captures write frame_<number>.png files (the dropped numbers are
+    missing), raw captures write capture.raw and its format in
+    capture.json
+    """
+
+    def __init__(self, size: tuple, directory: str = "capture",
+                 file_format: str = "png", buffers: int = 8,
+                 stream: BinaryIO | None = None):
+        """
+        :param size: screen size
+        :param file_format: "png" sequence or "raw" video
+        :param buffers: frames that can wait for the writer
+        :param stream: output of a raw video (the stdin of an encoder
+        process...), None writes capture.raw in the directory
+        """
+        if file_format not in CAPTURE_FORMATS:
+            raise ValueError(f"FrameCapture: unknown format {file_format}")
+        if stream and file_format != "raw":
+            raise ValueError("FrameCapture: streams need the raw format")
+        self.directory = directory
+        self.file_format = file_format
+        self.captured = 0
+        self.written = 0
+        self.dropped = 0
+        os.makedirs(directory, exist_ok=True)
+        # 32 bits buffers, the raw frames have a fixed pixel format
+        self.__free: queue.Queue = queue.Queue()
+        for _ in range(buffers):
+            self.__free.put(ASSETS.surface(size, OWNER_CAPTURE, depth=32))
+        self.__full: queue.Queue = queue.Queue()
+        self.__frame = 0
+        # numbers of the frames written
+        self.__frames: List[int] = []
+        self.__raw: BinaryIO | None = None
+        if stream:
+            self.__raw = stream
+        elif file_format == "raw":
+            self.__raw = open(os.path.join(directory, "capture.raw"), "wb")
+        # memory position of the red, green and blue bytes of a pixel
+        pixel_format = raw_pixel_format(self.__free.queue[0])
+        self.__rgb = [pixel_format.index(channel) for channel in "rgb"]
+        self.__error: BaseException | None = None
+        self.__thread = threading.Thread(target=self.__write, daemon=True,
+                                         name="frame capture")
+        self.__thread.start()
+
+    def capture(self, screen: pygame.Surface) -> bool:
+        """
+        Copies the screen into a free buffer for the writer
+        :return: False when the frame was dropped (no free buffer)
+        """
+        if self.__error:
+            raise self.__error
+        frame = self.__frame
+        self.__frame += 1
+        try:
+            buffer = self.__free.get_nowait()
+        except queue.Empty:
+            self.dropped += 1
+            return False
+        buffer.blit(screen, (0, 0))
+        self.__full.put_nowait((frame, buffer))
+        self.captured += 1
+        return True
+
+    def __write(self) -> None:
+        while True:
+            item = self.__full.get()
+            if item is None:
+                return
+            frame, buffer = item
+            try:
+                if self.__raw:
+                    # the pixels as they are in memory (rows with their
+                    # pitch), no conversion
+                    self.__raw.write(buffer.get_buffer())
+                    self.__free.put(buffer)
+                else:
+                    rows = self.__png_rows(buffer)
+                    # the buffer is free while the rows are compressed
+                    self.__free.put(buffer)
+                    self.__save_png(frame, rows)
+            except BaseException as error:
+                self.__error = error
+                return
+            self.__frames.append(frame)
+            self.written += 1
+
+    def __png_rows(self, buffer: pygame.Surface) -> np.ndarray:
+        """ RGB rows of the buffer, each one starts with its PNG filter
+        type (0, none) """
+        width, height = buffer.get_size()
+        pixels = np.frombuffer(buffer.get_buffer(), np.uint8).reshape(
+            height, buffer.get_pitch())[:, :width * 4]
+        rows = np.zeros((height, width * 3 + 1), np.uint8)
+        rows[:, 1:] = pixels.reshape(height, width, 4)[..., self.__rgb] \
+            .reshape(height, width * 3)
+        return rows
+
+    def __save_png(self, frame: int, rows: np.ndarray) -> None:
+        height, row_size = rows.shape
+        header = struct.pack(">IIBBBBB", (row_size - 1) // 3, height,
+                             8, 2, 0, 0, 0)  # 8 bits RGB
+        data = zlib.compress(rows, PNG_COMPRESSION)
+        with open(os.path.join(self.directory,
+                               f"frame_{frame:06d}.png"), "wb") as file:
+            file.write(PNG_SIGNATURE + png_chunk(b"IHDR", header)
+                       + png_chunk(b"IDAT", data) + png_chunk(b"IEND", b""))
+
+    def close(self) -> None:
+        """ waits for the frames taken and closes the files """
+        self.__full.put(None)
+        self.__thread.join()
+        if self.__raw:
+            self.__raw.close()
+        if self.__error:
+            raise self.__error
+        if self.file_format == "png":
+            return
+        buffer = self.__free.get()
+        with open(os.path.join(self.directory, "capture.json"), "w") as f:
+            json.dump({"width": buffer.get_width(),
+                       "height": buffer.get_height(),
+                       "pitch": buffer.get_pitch(),
+                       "pixel_format": raw_pixel_format(buffer),
+                       "frames": self.written}, f, indent=2)
+
+    def __str__(self):
+        return (f"capture: {self.captured} frames ({self.written} written, "
+                f"{self.dropped} dropped)")
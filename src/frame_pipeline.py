@@ -0,0 +1,117 @@
+"""
+Simulation and presentation on different threads: the simulation of a
+frame runs on a worker thread while the main thread draws and flips the
+frame before it. Each frame is written in one of two render queues, the
+simulation fills one while the other one is drawn.
+"""
+import queue
+import threading
+from typing import Callable
+
+import pygame
+
+from src.globals import GameSession
+from src.input_system import InputSnapshot
+from src.render_queue import RenderQueue
+
+
+class FramePipeline:
+    """
+    Double buffered frames: {submit} starts the simulation of the next frame
+    and {present} draws the last finished one. The simulation only touches
+    the session and its back queue, the presentation only the front queue.
+    """
+
+    def __init__(self, session: GameSession, simulate: Callable[[], None]):
+        """
+        :param session: game session, its render queue is the first buffer
+        :param simulate: runs the game logic of one frame (it fills the
+        session render queue)
+        """
+        self.session = session
+        self.__simulate = simulate
+        back = RenderQueue()
+        back.renderer = session.render_queue.renderer
+        self.__free: queue.Queue = queue.Queue()
+        self.__free.put(session.render_queue)
+        self.__free.put(back)
+        # input of the frames to simulate and frames ready to draw
+        self.__inputs: queue.Queue = queue.Queue(maxsize=1)
+        self.__frames: queue.Queue = queue.Queue(maxsize=1)
+        self.__pending = 0
+        # tag given to {submit} of the last frame drawn by {present}
+        self.presented_tag = None
+        self.__thread = threading.Thread(target=self.__run, daemon=True,
+                                         name="simulation")
+        self.__thread.start()
+
+    def __run(self) -> None:
+        while True:
+            frame_input = self.__inputs.get()
+            if frame_input is None:
+                return
+            render_queue = self.__free.get()
+            snapshot, delta_time, tag = frame_input
+            try:
+                self.session.render_queue = render_queue
+                self.session.input = snapshot
+                self.session.delta_time = delta_time
+                self.__simulate()
+                # the sprites keep moving on the next frame
+                render_queue.freeze()
+            except BaseException as error:
+                self.__frames.put(error)
+                return
+            self.__frames.put((render_queue, tag))
+
+    def submit(self, snapshot: InputSnapshot, delta_time: float,
+               tag=None) -> None:
+        """
+        Starts the simulation of a frame, it waits if the last submitted
+        frame was not started yet
+        :param tag: value of the frame kept on {presented_tag} when it is
+        drawn (the input poll time of the frame, see
+        {KeyboardInput.frame_stamp})
+        """
+        self.__inputs.put((snapshot, delta_time, tag))
+        self.__pending += 1
+
+    def present(self, target: pygame.Surface) -> bool:
+        """
+        Draws the oldest simulated frame on the target, it waits for its
+        simulation. The frame just submitted is left running, so the
+        simulation overlaps with the drawing and the display flip.
+        :return: False if there was no frame to draw
+        """
+        if self.__pending < 2:
+            return False
+        frame = self.__frames.get()
+        self.__pending -= 1
+        if isinstance(frame, BaseException):
+            raise frame
+        render_queue, self.presented_tag = frame
+        target.fill("black")
+        render_queue.flush(target)
+        self.__free.put(render_queue)
+        return True
+
+    def close(self) -> None:
+        """ stops the simulation thread after its current frame """
+        stop_sent = False
+        while self.__thread.is_alive():
+            if not stop_sent:
+                try:
+                    self.__inputs.put(None, timeout=0.05)
+                    stop_sent = True
+                except queue.Full:
+                    pass
+            # frames nobody will draw, the simulation can't wait for them
+            try:
+                frame = self.__frames.get_nowait()
+                if not isinstance(frame, BaseException):
+                    render_queue, _ = frame
+                    render_queue.clear()
+                    self.__free.put(render_queue)
+            except queue.Empty:
+                pass
+            self.__thread.join(0.05)
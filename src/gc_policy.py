@@ -0,0 +1,117 @@
+"""
+Garbage collector policy of the frame loop: the objects of a level are
+frozen after it is built (the collector stops scanning them), the full
+collections run on level transitions and idle frames, and every collector
+pause is measured so frame time spikes can be matched with them.
+"""
+import gc
+import time
+
+from src.instrumentation import RollingStat
+
+# automatic collections of the oldest generation are disabled with this
+# threshold, the policy runs them
+NO_FULL_COLLECTIONS = 1_000_000_000
+
+
+class GcPolicy:
+    """
+    Install it once per process (the collector is global), the frame loop
+    calls {end_frame} and the levels {level_transition} and {level_built}.
+    """
+
+    def __init__(self, idle_ratio: float = 0.5, full_interval: int = 600):
+        """
+        :param idle_ratio: frames that used less than this part of their
+        budget are idle
+        :param full_interval: minimum frames between idle full collections
+        """
+        self.idle_ratio = idle_ratio
+        self.full_interval = full_interval
+        # every collector pause (ms) and the pause time of each frame
+        self.pauses = RollingStat()
+        self.frame_pauses = RollingStat()
+        # collections by generation
+        self.collections = [0, 0, 0]
+        # frames over budget with a collector pause of at least half the
+        # extra time
+        self.gc_spikes = 0
+        self.over_budget = 0
+        self.__frame_pause = 0.0
+        self.__start = 0.0
+        self.__frames_since_full = 0
+        self.__thresholds = None
+        self.installed = False
+
+    def install(self) -> None:
+        """ starts measuring the pauses and takes the full collections """
+        if self.installed:
+            return
+        gc.callbacks.append(self.__on_gc)
+        self.__thresholds = gc.get_threshold()
+        gc.set_threshold(self.__thresholds[0], self.__thresholds[1],
+                         NO_FULL_COLLECTIONS)
+        self.installed = True
+
+    def uninstall(self) -> None:
+        if not self.installed:
+            return
+        gc.callbacks.remove(self.__on_gc)
+        gc.set_threshold(*self.__thresholds)
+        gc.unfreeze()
+        self.installed = False
+
+    def __on_gc(self, phase: str, info: dict) -> None:
+        if phase == "start":
+            self.__start = time.perf_counter()
+            return
+        pause = (time.perf_counter() - self.__start) * 1000
+        self.pauses.add(pause)
+        self.__frame_pause += pause
+        self.collections[info["generation"]] += 1
+
+    def __collect(self) -> None:
+        """ full collection of the policy, its pause is recorded but not
+        counted as a frame pause (it runs out of the frame work) """
+        gc.collect()
+        self.__frame_pause = 0.0
+        self.__frames_since_full = 0
+
+    def level_transition(self) -> None:
+        """ the last level is dropped: its objects can be collected """
+        gc.unfreeze()
+        self.__collect()
+
+    def level_built(self) -> None:
+        """ the level objects live until the next transition, the
+        collector doesn't need to scan them on every frame """
+        self.__collect()
+        gc.freeze()
+
+    def end_frame(self, frame_ms: float, budget_ms: float) -> float:
+        """
+        Records the collector time of the frame, idle frames run the full
+        collection when it is due
+        :param frame_ms: time used by the frame (without the wait)
+        :param budget_ms: time of a frame at the target fps
+        :return: collector pause of the frame (ms)
+        """
+        frame_pause = self.__frame_pause
+        self.frame_pauses.add(frame_pause)
+        if frame_ms > budget_ms:
+            self.over_budget += 1
+            if frame_pause >= (frame_ms - budget_ms) / 2:
+                self.gc_spikes += 1
+        self.__frame_pause = 0.0
+        self.__frames_since_full += 1
+        if (frame_ms < budget_ms * self.idle_ratio
+                and self.__frames_since_full >= self.full_interval):
+            # uses the idle time of this frame
+            self.__collect()
+        return frame_pause
+
+    def __str__(self):
+        return (f"gc pauses: {self.pauses} | collections "
+                f"{'/'.join(str(count) for count in self.collections)} | "
+                f"frames over budget: {self.over_budget} "
+                f"({self.gc_spikes} with gc)")
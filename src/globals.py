@@ -1,6 +1,21 @@
+import json
+import random
+from typing import Any, Callable, Dict
+
 import pygame.display
 from pygame.freetype import Font
-from src.sound_system import SoundController
+from src.ecs.systems import create_world
+from src.ecs.world import World
+from src.input_system import InputSnapshot
+from src.quality import FULL_QUALITY, QualitySettings
+from src.render_queue import RenderQueue
+from src.sound_system import (
+    MergedSoundController,
+    MutedSoundController,
+    SoundController,
+)
+from src.surface_registry import SurfaceRegistry
+from src.variant_cache import VariantCache
 
 pygame.mixer.init()
 
@@ -25,30 +40,172 @@ class GameFonts:
         self.title: Font = None
 
 
-class GameVariables(metaclass=SingletonMeta):
+class GameAssets(metaclass=SingletonMeta):
     """
-    Global variables to be able to access to this any place we need it
+    Heavy assets (sprites, sounds, fonts, animations, data files) loaded once
+    per process and shared by all the game sessions, nothing here can be
+    changed by a game
     """
 
     def __init__(self):
-        self.screen: pygame.Surface = None
         self.game_fonts = GameFonts()
         self.sound_controller = SoundController()
+        self.muted_sound_controller = MutedSoundController()
         self.create_sound_library()
         self.sprite_dir = "src/assets/sprites/"
+        # pixel memory of the surfaces by owner
+        self.surfaces = SurfaceRegistry()
+        # rotated / scaled / tinted sprites of the animations
+        self.variants = VariantCache(registry=self.surfaces)
+        self.__images: Dict[tuple, pygame.Surface] = {}
+        self.__shared: Dict[Any, Any] = {}
+
+    def create_sound_library(self):
+        self.sound_controller.add_sound("s1", "shoot1.wav")
+        self.sound_controller.add_sound("s2", "shoot2.wav")
+        self.sound_controller.add_sound("s3", "shoot3.wav")
+        self.sound_controller.add_sound("fall", "fall.wav")
+        self.sound_controller.add_sound("dmg", "damage.wav")
+        self.sound_controller.add_sound("exp", "explosion.wav")
+
+    def load_fonts(self, font_dir: str = "src/assets/font.ttf"):
+        if self.game_fonts.base is None:
+            self.game_fonts.base = Font(font_dir, 16)
+            self.game_fonts.title = Font(font_dir, 24)
+
+    def image(self, name: str, size: tuple | None = None,
+              alpha: bool = True, owner: str = "sprites") -> pygame.Surface:
+        """
+        Sprite image loaded from the sprites folder, converted and scaled
+        once. The surface is shared, copy it before changing it (alpha,
+        fill, ...)
+        :param name: file name on the sprites folder
+        :param size: scale the image to this size
+        :param alpha: image has transparency (convert_alpha or convert)
+        :param owner: subsystem counted for its memory (the first loader)
+        """
+        key = (name, size, alpha)
+        if key not in self.__images:
+            image = pygame.image.load(self.sprite_dir + name)
+            image = image.convert_alpha() if alpha else image.convert()
+            if size:
+                image = pygame.transform.scale(image, size)
+            self.__images[key] = self.surfaces.register(image, owner)
+        return self.__images[key]
+
+    def surface(self, size: tuple, owner: str, flags: int = 0,
+                depth: int = 0) -> pygame.Surface:
+        """ new surface counted on the owner memory (depth 0 uses the
+        display format) """
+        surface = (pygame.Surface(size, flags, depth) if depth
+                   else pygame.Surface(size, flags))
+        return self.surfaces.register(surface, owner)
+
+    def copy(self, surface: pygame.Surface, owner: str) -> pygame.Surface:
+        """ copy of a shared surface (to change it) counted on the owner
+        memory """
+        return self.surfaces.register(surface.copy(), owner)
+
+    def frames(self, name: str, size: tuple,
+               frame_size: tuple, owner: str = "sprites") -> tuple:
+        """
+        Splits a vertical sprite sheet in frames (subsurfaces of the shared
+        sheet)
+        """
+        def build():
+            sheet = self.image(name, size, owner=owner)
+            return tuple(
+                sheet.subsurface(pygame.Rect(0, y, frame_size[0],
+                                             frame_size[1]))
+                for y in range(0, size[1], frame_size[1]))
+        return self.shared(("frames", name, size, frame_size), build)
+
+    def load_json(self, file: str) -> Any:
+        """ data files (levels, animations), parsed once """
+        def build():
+            with open(file) as f:
+                return json.load(f)
+        return self.shared(("json", file), build)
+
+    def shared(self, key, factory: Callable[[], Any]) -> Any:
+        """ returns the object saved with the key, it is created with the
+        factory the first time """
+        if key not in self.__shared:
+            self.__shared[key] = factory()
+        return self.__shared[key]
+
+
+class GameSession:
+    """
+    State of one game (score, life, level, screen, timers...). Every class
+    that takes part in a game receives its session, so a process can run
+    many games at the same time (simulations, tests)
+    """
+
+    def __init__(self, screen: pygame.Surface = None,
+                 seed: int | None = None):
+        self.assets = GameAssets()
+        self.screen: pygame.Surface = screen
         self.delta_time = 0
         self.ms_fps = 16.666666667  # milliseconds peer frame (60 fps)
         self.score = 0
         self.level = 1
+        # frames simulated by the game (the current one included), events
+        # and statistics are tagged with it
+        self.frame = 0
         # life do not reset after changing levels, more difficulty added XD
         self.life = 100
         # if this is true, on the text frame we will validate this an run a restar
         self.restart = False
+        # background is just decoration, simulations without viewer skip it
+        self.show_background = True
+        # hits need the visible pixels of the sprites to overlap, False
+        # uses just the sprite rects
+        self.pixel_collisions = True
+        # games without player (simulations, servers) don't play sounds
+        self.mute = False
+        # input of the current frame, the main loop takes one snapshot
+        # per frame and every character reads it from here
+        self.input = InputSnapshot()
+        # all the game randomness comes from this generator, same seed and
+        # same input snapshots means the same game (used by replays)
+        self.seed = 0
+        self.rng = random.Random()
+        self.reseed(seed)
+        # entities of the current level, each level builds a new one
+        self.world: World = create_world()
+        # what the frame draws, flushed on the screen at the end of it
+        self.render_queue = RenderQueue()
+        # collector policy of the frame loop (see {GcPolicy}), the levels
+        # tell it when they are built
+        self.gc_policy = None
+        # gameplay events for analytics (see {EventLog}), None doesn't
+        # record them
+        self.event_log = None
+        # optional work of the frames, lowered by {QualityController} when
+        # the frames go over their budget
+        self.quality: QualitySettings = FULL_QUALITY
+        self.__merged_sounds: MergedSoundController | None = None
 
-    def create_sound_library(self):
-        self.sound_controller.add_sound("s1", "shoot1.wav")
-        self.sound_controller.add_sound("s2", "shoot2.wav")
-        self.sound_controller.add_sound("s3", "shoot3.wav")
-        self.sound_controller.add_sound("fall", "fall.wav")
-        self.sound_controller.add_sound("dmg", "damage.wav")
-        self.sound_controller.add_sound("exp", "explosion.wav")
+    @property
+    def sound_controller(self) -> SoundController | MergedSoundController:
+        if self.mute:
+            return self.assets.muted_sound_controller
+        merge_ms = self.quality.sound_merge_ms
+        if merge_ms:
+            if self.__merged_sounds is None:
+                self.__merged_sounds = MergedSoundController(
+                    self.assets.sound_controller, merge_ms)
+            self.__merged_sounds.merge_ms = merge_ms
+            return self.__merged_sounds
+        return self.assets.sound_controller
+
+    @property
+    def game_fonts(self) -> GameFonts:
+        return self.assets.game_fonts
+
+    def reseed(self, seed: int | None = None):
+        """ restart the game random generator, without seed a new random
+        one is picked """
+        self.seed = seed if seed is not None else random.getrandbits(63)
+        self.rng.seed(self.seed)
@@ -0,0 +1,114 @@
+"""
+Runs the game without a window, with a fixed frame rate and an input source
+(replay file, bot, tests). Usage to re-run a recorded session:
+    python -m src.headless --replay session.rpl
+"""
+import argparse
+import os
+
+# dummy drivers need to be set before pygame starts the display
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+
+from src.globals import GameAssets, GameSession
+from src.input_system import InputSnapshot, ReplayReader, ReplayWriter
+from src.levelTools import LevelController
+
+ASSETS = GameAssets()
+
+
+def setup_headless() -> None:
+    """ creates the hidden display (required to convert the sprites) and
+    the fonts the game needs to render """
+    pygame.init()
+    if pygame.display.get_surface() is None:
+        pygame.display.set_mode((600, 600))
+    ASSETS.load_fonts()
+
+
+class HeadlessGame:
+    """
+    A game session stepped by hand, one call to {step} is one frame. Each
+    game has its own session and screen, many games can run in the same
+    process
+    """
+
+    def __init__(self, seed: int | None = None,
+                 recorder: ReplayWriter | None = None, level: int = 1,
+                 render: bool = True, mute: bool = True):
+        """
+        :param seed: game random seed, None picks a random one
+        :param recorder: save the input of the session into a replay
+        :param level: level to start the game
+        :param render: False skips the decoration (screen clear and
+        background), the game logic is the same
+        :param mute: don't play the game sounds
+        """
+        setup_headless()
+        self.session = GameSession(pygame.Surface((600, 600)), seed)
+        self.session.level = level
+        self.session.show_background = render
+        self.session.mute = mute
+        self.seed = self.session.seed
+        self.recorder = recorder
+        self.render = render
+        self.frame = 0
+        self.level_controller = LevelController(self.session,
+                                                start_level=level)
+
+    def step(self, snapshot: InputSnapshot, delta_ms: int = 16) -> None:
+        """ run one frame with the given input and delta time """
+        self.session.input = snapshot
+        self.session.delta_time = delta_ms / 1000
+        if self.recorder:
+            self.recorder.write(snapshot, delta_ms)
+        if self.render:
+            self.session.screen.fill("black")
+        self.level_controller.execute()
+        self.frame += 1
+
+    def state(self) -> tuple:
+        """ small summary of the game state, two sessions with the same
+         state on each frame are the same game """
+        game_level = self.level_controller.game_level
+        enemies = tuple(sorted(
+            (item.tag, item.rect.x, item.rect.y, item.life)
+            for item in game_level.enemy_army.enemiesGroup.sprites()))
+        player_group = tuple(sorted(
+            (item.tag, item.rect.x, item.rect.y)
+            for item in game_level.player_controller.playerGroup.sprites()))
+        return (self.session.level, self.session.score, self.session.life,
+                enemies, player_group)
+
+
+def play_replay(file, frames: int | None = None) -> HeadlessGame:
+    """ re-run a replay file, it stops when the replay ends or after the
+     number of frames given """
+    reader = ReplayReader(file)
+    game = HeadlessGame(seed=reader.seed)
+    while frames is None or game.frame < frames:
+        snapshot = reader.poll()
+        if reader.finished:
+            break
+        game.step(snapshot, reader.delta_ms)
+    reader.close()
+    return game
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the game headless")
+    parser.add_argument("--replay", required=True,
+                        help="replay file recorded with main.py --record")
+    parser.add_argument("--frames", type=int, default=None,
+                        help="stop after this number of frames")
+    args = parser.parse_args()
+    game = play_replay(args.replay, args.frames)
+    level, score, life, _, _ = game.state()
+    print(f"frames: {game.frame} | seed: {game.seed} | level: {level} | "
+          f"score: {score} | life: {life}")
+
+
+if __name__ == "__main__":
+    main()
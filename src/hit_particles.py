@@ -1,25 +1,24 @@
 import math
-from src.globals import GameVariables
+from src.globals import GameAssets, GameSession
+from src.render_queue import LAYER_EFFECTS
+from src.surface_registry import OWNER_PARTICLES
 import pygame
 
-GLOBALS = GameVariables()
+ASSETS = GameAssets()
 
 
 class HitParticle(pygame.sprite.Sprite):
     """ this creates a explosion hit animation """
 
-    def __init__(self, x: int = 0, y: int = 0, duration=250,
-                 sound_effect=True):
+    def __init__(self, session: GameSession, x: int = 0, y: int = 0,
+                 duration=250, sound_effect=True):
         pygame.sprite.Sprite.__init__(self)
-        # Load sprite sheet
-        self.sprite_sheet = pygame.image.load(
-            GLOBALS.sprite_dir + "/hit-particle.png").convert_alpha()
-        # scale to 48 (3 times original size)
-        self.sprite_sheet = pygame.transform.scale(self.sprite_sheet,
-                                                   (48, 240))
-        self.frames = []  # we're going to save each title here
+        # hit-particle image is a sheet grid of (16x16)x3 because the rescale
+        # scale to 48 (3 times original size), the frames are shared by all
+        # the particles
+        self.frames = ASSETS.frames("hit-particle.png", (48, 240), (48, 48),
+                                    owner=OWNER_PARTICLES)
         self.frame_idx = 0
-        self.load_frames()
 
         # Set the image and rect attributes for sprite
         self.image = self.frames[self.frame_idx]
@@ -32,14 +31,7 @@ class HitParticle(pygame.sprite.Sprite):
         self.frame_rate = duration / len(self.frames)
         if sound_effect:
             # same as bullets, play a sound effect each instance
-            GLOBALS.sound_controller.play("exp")
-
-    def load_frames(self):
-        # hit-particle image is a sheet grid of (16x16)x3 because the rescale
-        for y in range(0, 240, 48):
-            # we take the tile and add this into the frames list
-            frame = self.sprite_sheet.subsurface(pygame.Rect(0, y, 48, 48))
-            self.frames.append(frame)
+            session.sound_controller.play("exp")
 
     def update(self):
         if self.frame_idx >= len(self.frames) - 1:
@@ -53,14 +45,22 @@ class HitParticle(pygame.sprite.Sprite):
 
 
 class HitExplosionController:
-    def __init__(self):
+    def __init__(self, session: GameSession):
+        self.session = session
         # create the hit explosion group
         self.explosion_group = pygame.sprite.Group()
 
     def add_hit_explosion(self, pos: tuple = (0, 0), sound_effect=True):
-        new_explosion = HitParticle(pos[0], pos[1], sound_effect=sound_effect)
+        max_explosions = self.session.quality.max_explosions
+        if (max_explosions is not None
+                and len(self.explosion_group) >= max_explosions):
+            # reduced quality, the hit doesn't show
+            return
+        new_explosion = HitParticle(self.session, pos[0], pos[1],
+                                    sound_effect=sound_effect)
         self.explosion_group.add(new_explosion)
 
     def render(self):
         self.explosion_group.update()
-        self.explosion_group.draw(GLOBALS.screen)
+        self.session.render_queue.add_group(LAYER_EFFECTS,
+                                            self.explosion_group)
@@ -0,0 +1,221 @@
+import struct
+import time
+from typing import BinaryIO, List
+
+import pygame
+
+from src.instrumentation import RollingStat
+
+# action bits, one snapshot is just a small integer with these flags
+ACTION_LEFT = 1
+ACTION_RIGHT = 2
+ACTION_UP = 4
+ACTION_DOWN = 8
+ACTION_FIRE = 16
+
+# keyboard keys mapped to the action they trigger
+KEY_BINDINGS = {
+    pygame.K_a: ACTION_LEFT,
+    pygame.K_LEFT: ACTION_LEFT,
+    pygame.K_d: ACTION_RIGHT,
+    pygame.K_RIGHT: ACTION_RIGHT,
+    pygame.K_w: ACTION_UP,
+    pygame.K_UP: ACTION_UP,
+    pygame.K_s: ACTION_DOWN,
+    pygame.K_DOWN: ACTION_DOWN,
+    pygame.K_SPACE: ACTION_FIRE,
+}
+
+# the only events that reach the event queue, the rest are dropped by SDL
+# (key states are still updated, we read them with key.get_pressed), the
+# window events pause and resume the game
+ALLOWED_EVENTS = [pygame.QUIT, pygame.KEYDOWN, pygame.WINDOWFOCUSLOST,
+                  pygame.WINDOWFOCUSGAINED, pygame.WINDOWMINIMIZED,
+                  pygame.WINDOWRESTORED, pygame.WINDOWEXPOSED]
+
+
+class InputSnapshot:
+    """
+    Immutable state of the input for one frame, it can be read like the
+    pygame keys object (snapshot[pygame.K_SPACE]) so the characters don't
+    need to know where the input comes from (keyboard, replay, bot)
+    """
+
+    def __init__(self, actions: int = 0):
+        self.actions = actions
+
+    def __getitem__(self, key) -> bool:
+        return bool(self.actions & KEY_BINDINGS.get(key, 0))
+
+    def pressed(self, action: int) -> bool:
+        """ True if the action (ACTION_* flag) is active on this frame """
+        return bool(self.actions & action)
+
+    @property
+    def axis_x(self) -> int:
+        """ -1 = LEFT, 1 = RIGHT and 0 = no direction (or both) """
+        return ((self.actions & ACTION_RIGHT and 1)
+                - (self.actions & ACTION_LEFT and 1))
+
+    @property
+    def axis_y(self) -> int:
+        """ -1 = UP, 1 = DOWN and 0 = no direction (or both) """
+        return ((self.actions & ACTION_DOWN and 1)
+                - (self.actions & ACTION_UP and 1))
+
+    def __str__(self):
+        return f"(actions: {self.actions:05b})"
+
+    @staticmethod
+    def from_keys(keys) -> "InputSnapshot":
+        """ build a snapshot from a pygame.key.get_pressed() result """
+        actions = 0
+        for key, action in KEY_BINDINGS.items():
+            if keys[key]:
+                actions |= action
+        return InputSnapshot(actions)
+
+
+class KeyboardInput:
+    """
+    Input source that reads the keyboard once per frame. It also measures
+    the input to present latency: time between the frame that got a new
+    input and the moment that frame is on screen
+    """
+
+    def __init__(self):
+        self.snapshot = InputSnapshot()
+        # poll -> present of frames where the input changed
+        self.latency = RollingStat()
+        # previous present -> present, the worst case of a key pressed just
+        # after the last poll
+        self.latency_bound = RollingStat()
+        self.__poll_time = 0
+        self.__last_present = None
+        self.__changed = False
+
+    @staticmethod
+    def setup(allowed_events: List[int] = None) -> None:
+        """ filter the event queue to the events the game handles """
+        pygame.event.set_blocked(None)
+        pygame.event.set_allowed(allowed_events or ALLOWED_EVENTS)
+
+    def begin_frame(self) -> list:
+        """
+        Takes the frame input, run this once at the start of the frame
+        :return: the frame events (only the allowed types)
+        """
+        events = pygame.event.get()
+        self.__poll_time = time.perf_counter()
+        actions = self.poll().actions
+        self.__changed = actions != self.snapshot.actions
+        self.snapshot = InputSnapshot(actions)
+        return events
+
+    def poll(self) -> InputSnapshot:
+        return InputSnapshot.from_keys(pygame.key.get_pressed())
+
+    @property
+    def frame_stamp(self) -> tuple:
+        """ poll time of the current snapshot and if its input changed,
+        frames presented later keep it to mark them (see
+        {mark_presented}) """
+        return self.__poll_time, self.__changed
+
+    def mark_presented(self, stamp: tuple | None = None) -> None:
+        """
+        Run this after the display flip
+        :param stamp: {frame_stamp} of the frame on the screen, None is the
+        last polled frame (frames presented on the frame they are polled)
+        """
+        now = time.perf_counter()
+        poll_time, changed = stamp or (self.__poll_time, self.__changed)
+        if changed:
+            self.latency.add((now - poll_time) * 1000)
+            if self.__last_present is not None:
+                self.latency_bound.add((now - self.__last_present) * 1000)
+        self.__last_present = now
+
+
+class ReplayWriter:
+    """
+    Streams the input of a session to a replay file. File format:
+    header -> magic(4 bytes) | version(1 byte) | seed(8 bytes)
+    frames -> actions(1 byte) | delta time ms(2 bytes) | repeat(2 bytes)
+    consecutive equal frames are saved as one record (run length encoding),
+    a player holding a key for a couple of seconds is just 5 bytes. Frames
+    longer than {MAX_DELTA_MS} (debugger breaks, suspended machines) are
+    saved with that time, the game loop uses the same limit.
+    """
+
+    MAGIC = b"DA2R"
+    VERSION = 1
+    HEADER = struct.Struct("<4sBQ")
+    # the seed is an unsigned 8 bytes number
+    MAX_SEED = 2 ** 64 - 1
+    FRAME = struct.Struct("<BHH")
+    MAX_REPEAT = 0xFFFF
+    MAX_DELTA_MS = 0xFFFF
+
+    def __init__(self, file: str | BinaryIO, seed: int):
+        self.__file = open(file, "wb") if isinstance(file, str) else file
+        self.__file.write(self.HEADER.pack(self.MAGIC, self.VERSION, seed))
+        self.__run: tuple | None = None
+        self.__repeat = 0
+        self.frames = 0
+
+    def write(self, snapshot: InputSnapshot, delta_ms: int) -> None:
+        frame = (snapshot.actions, min(delta_ms, self.MAX_DELTA_MS))
+        if frame == self.__run and self.__repeat < self.MAX_REPEAT:
+            self.__repeat += 1
+        else:
+            self.__flush_run()
+            self.__run = frame
+            self.__repeat = 1
+        self.frames += 1
+
+    def __flush_run(self):
+        if self.__run is None:
+            return
+        self.__file.write(self.FRAME.pack(self.__run[0], self.__run[1],
+                                          self.__repeat))
+
+    def close(self) -> None:
+        self.__flush_run()
+        self.__run = None
+        self.__file.close()
+
+
+class ReplayReader:
+    """ Input source that reads back a file created by {ReplayWriter} """
+
+    def __init__(self, file: str | BinaryIO):
+        self.__file = open(file, "rb") if isinstance(file, str) else file
+        magic, version, self.seed = ReplayWriter.HEADER.unpack(
+            self.__file.read(ReplayWriter.HEADER.size))
+        if magic != ReplayWriter.MAGIC:
+            raise ValueError("ReplayReader: file is not a replay file")
+        if version != ReplayWriter.VERSION:
+            raise ValueError(f"ReplayReader: unsupported version {version}")
+        self.__snapshot = InputSnapshot()
+        self.delta_ms = 0
+        self.__remaining = 0
+        self.finished = False
+
+    def poll(self) -> InputSnapshot:
+        """ returns the next frame input, after the last frame it returns
+         an empty input and {finished} is set """
+        if self.__remaining == 0:
+            chunk = self.__file.read(ReplayWriter.FRAME.size)
+            if len(chunk) < ReplayWriter.FRAME.size:
+                self.finished = True
+                self.__snapshot = InputSnapshot()
+                return self.__snapshot
+            actions, self.delta_ms, self.__remaining = (
+                ReplayWriter.FRAME.unpack(chunk))
+            self.__snapshot = InputSnapshot(actions)
+        self.__remaining -= 1
+        return self.__snapshot
+
+    def close(self) -> None:
+        self.__file.close()
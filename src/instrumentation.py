@@ -0,0 +1,37 @@
+from collections import deque
+
+
+class RollingStat:
+    """ Keeps the last N samples of a measure (ms) to get its statistics """
+
+    def __init__(self, size: int = 600):
+        self.samples: deque = deque(maxlen=size)
+        self.total_count = 0
+
+    def add(self, value: float) -> None:
+        self.samples.append(value)
+        self.total_count += 1
+
+    def clear(self) -> None:
+        self.samples.clear()
+
+    def average(self) -> float:
+        if not self.samples:
+            return 0
+        return sum(self.samples) / len(self.samples)
+
+    def maximum(self) -> float:
+        return max(self.samples) if self.samples else 0
+
+    def percentile(self, percent: float) -> float:
+        """ value below which the given percent (0-100) of samples are """
+        if not self.samples:
+            return 0
+        ordered = sorted(self.samples)
+        idx = min(len(ordered) - 1, int(len(ordered) * percent / 100))
+        return ordered[idx]
+
+    def __str__(self):
+        return (f"avg: {self.average():.2f}ms | "
+                f"p95: {self.percentile(95):.2f}ms | "
+                f"max: {self.maximum():.2f}ms")
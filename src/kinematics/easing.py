@@ -0,0 +1,149 @@
+"""
+Easing curves: functions that map the time of a segment (0-1) to its
+progress (0-1). Animations don't evaluate them while they play, each curve
+is sampled once into an {EasingTable} and then it is a table lookup.
+"""
+from functools import lru_cache
+from typing import Callable, Dict
+
+import numpy as np
+
+# samples per table, the values between samples are interpolated
+TABLE_SIZE = 256
+
+
+def linear(u: float) -> float:
+    return u
+
+
+def ease_in(u: float) -> float:
+    return u * u
+
+
+def ease_out(u: float) -> float:
+    return 1 - (1 - u) * (1 - u)
+
+
+def ease_in_out(u: float) -> float:
+    if u < 0.5:
+        return 2 * u * u
+    return 1 - (-2 * u + 2) ** 2 / 2
+
+
+def cubic_in(u: float) -> float:
+    return u ** 3
+
+
+def cubic_out(u: float) -> float:
+    return 1 - (1 - u) ** 3
+
+
+def cubic_in_out(u: float) -> float:
+    if u < 0.5:
+        return 4 * u ** 3
+    return 1 - (-2 * u + 2) ** 3 / 2
+
+
+def bounce(u: float) -> float:
+    """ ease out with bounces at the end """
+    strength = 7.5625
+    width = 2.75
+    if u < 1 / width:
+        return strength * u * u
+    if u < 2 / width:
+        u -= 1.5 / width
+        return strength * u * u + 0.75
+    if u < 2.5 / width:
+        u -= 2.25 / width
+        return strength * u * u + 0.9375
+    u -= 2.625 / width
+    return strength * u * u + 0.984375
+
+
+def bezier(x1: float, y1: float, x2: float,
+           y2: float) -> Callable[[float], float]:
+    """
+    Cubic bezier timing curve from (0, 0) to (1, 1) with two control
+    points, like css cubic-bezier(x1, y1, x2, y2)
+    """
+    if not (0 <= x1 <= 1 and 0 <= x2 <= 1):
+        raise ValueError("bezier: x control points need to be in [0, 1]")
+
+    def axis(t: float, p1: float, p2: float) -> float:
+        return 3 * (1 - t) ** 2 * t * p1 + 3 * (1 - t) * t * t * p2 + t ** 3
+
+    def curve(u: float) -> float:
+        # the x axis is monotonic, find the t of u with a bisection
+        low, high = 0.0, 1.0
+        for _ in range(40):
+            middle = (low + high) / 2
+            if axis(middle, x1, x2) < u:
+                low = middle
+            else:
+                high = middle
+        return axis((low + high) / 2, y1, y2)
+
+    return curve
+
+
+EASINGS: Dict[str, Callable[[float], float]] = {
+    "linear": linear,
+    "ease_in": ease_in,
+    "ease_out": ease_out,
+    "ease_in_out": ease_in_out,
+    "cubic_in": cubic_in,
+    "cubic_out": cubic_out,
+    "cubic_in_out": cubic_in_out,
+    "bounce": bounce,
+}
+
+
+class EasingTable:
+    """ curve sampled at TABLE_SIZE points, calling it interpolates the
+    two closest samples """
+
+    def __init__(self, name: str, function: Callable[[float], float],
+                 size: int = TABLE_SIZE):
+        self.name = name
+        self.size = size
+        self.values = [function(idx / (size - 1)) for idx in range(size)]
+        self.__grid = np.linspace(0, 1, size)
+        self.__array = np.array(self.values)
+
+    def __call__(self, u: float) -> float:
+        if u <= 0:
+            return self.values[0]
+        if u >= 1:
+            return self.values[-1]
+        position = u * (self.size - 1)
+        idx = int(position)
+        start = self.values[idx]
+        return start + (self.values[idx + 1] - start) * (position - idx)
+
+    def sample(self, u: np.ndarray) -> np.ndarray:
+        return np.interp(u, self.__grid, self.__array)
+
+    def __repr__(self):
+        return f"EasingTable({self.name})"
+
+
+def get_table(name: str, params: tuple | None = None) -> EasingTable:
+    """
+    Table of a curve, built once per curve
+    :param name: curve name (EASINGS or "bezier"), "-" or "_" separated
+    :param params: bezier control points (x1, y1, x2, y2)
+    """
+    return _build_table(name.replace("-", "_"),
+                        tuple(params) if params else None)
+
+
+@lru_cache(maxsize=None)
+def _build_table(name: str, params: tuple | None) -> EasingTable:
+    if name == "bezier":
+        if not params or len(params) != 4:
+            raise ValueError("bezier curve requires 4 control values")
+        return EasingTable(f"bezier{tuple(params)}", bezier(*params))
+    if name not in EASINGS:
+        raise KeyError(f"Unknown easing curve: {name}")
+    return EasingTable(name, EASINGS[name])
+
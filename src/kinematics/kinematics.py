@@ -1,22 +1,45 @@
 from abc import ABC, abstractmethod
-import math
 
 import pygame.transform
-import json
 from pygame import Rect, Surface
 from typing import List
 from enum import Enum
-from src.globals import GameVariables
+from src.globals import GameAssets, GameSession
+from src.kinematics import easing
+from src.kinematics.easing import EasingTable
+from src.kinematics.trajectory import Trajectory
 
-GLOBALS = GameVariables()
+ASSETS = GameAssets()
 
 
 class Curve(Enum):
     linear = 1
     smooth = 2
+    ease_in = 3
+    ease_out = 4
+    ease_in_out = 5
+    cubic_in = 6
+    cubic_out = 7
+    cubic_in_out = 8
+    bounce = 9
+    bezier = 10
+
+    @classmethod
+    def from_name(cls, name: str) -> "Curve":
+        """ curve of a json name ("ease-in" or "ease_in") """
+        try:
+            return cls[name.replace("-", "_")]
+        except KeyError:
+            raise KeyError(f"Unknown animation curve: {name}") from None
+
+
+# AnimationTransform fields in constructor order
+TRANSFORM_FIELDS = ("x", "y", "width", "height", "angle")
 
 
 class AnimationTransform:
+    __slots__ = ("x", "y", "width", "height", "angle", "__pivot")
+
     def __init__(self, x=0, y=0, width=0, height=0, angle=0):
         self.x = x
         self.y = y
@@ -41,14 +64,48 @@ class AnimationTransform:
 
 
 class KeyFrame:
+    __slots__ = ("frame", "curve", "key_point", "easing_table")
+
     def __init__(self, frame: AnimationTransform = AnimationTransform(),
-                 curve: Curve = Curve.linear, key_point=False):
+                 curve: Curve = Curve.linear, key_point=False,
+                 easing_table: EasingTable | None = None):
         self.frame = frame
         self.curve = curve
         self.key_point = key_point
+        # lookup table of the eased curves (built once when loaded)
+        self.easing_table = easing_table
+
+
+class _ReadOnlyTransform(AnimationTransform):
+    """ transform of the shared empty key frame, it can't be changed """
+    __slots__ = ()
+
+    def __setattr__(self, name, value):
+        if hasattr(self, "_AnimationTransform__pivot"):
+            raise AttributeError("the empty key frame is shared, it can "
+                                 "not be changed")
+        super().__setattr__(name, value)
+
+
+class _ReadOnlyKeyFrame(KeyFrame):
+    """ the shared empty key frame, {Animation.set_key_frame} takes a copy
+    of it """
+    __slots__ = ()
+
+    def __setattr__(self, name, value):
+        if hasattr(self, "easing_table"):
+            raise AttributeError("the empty key frame is shared, it can "
+                                 "not be changed")
+        super().__setattr__(name, value)
+
+
+# frame without changes, shared by all the animations (read only)
+EMPTY_KEY_FRAME = _ReadOnlyKeyFrame(_ReadOnlyTransform())
 
 
 class FrameMap:
+    __slots__ = ("key", "start", "end")
+
     def __init__(self, key: str, start: int, end: int):
         self.key = key
         self.start = start
@@ -59,6 +116,9 @@ class FrameMap:
 
 
 class Animation:
+    __slots__ = ("id", "__duration", "__frames", "__key_frames",
+                 "__frame_mapping", "trajectory", "shape_path")
+
     def __init__(self, animation_id: str, duration=500, frames=10):
         """
         Class tha contains animation info
@@ -73,6 +133,11 @@ class Animation:
         self.__frames = frames
         self.__key_frames = {}
         self.__frame_mapping: List[FrameMap] = []
+        # spline of the animation movement, animations without it apply
+        # their key frames one by one
+        self.trajectory: Trajectory | None = None
+        # spline of the rotation and size changes (angle, width, height)
+        self.shape_path: Trajectory | None = None
         self.__map_frames()
         self.__build_key_frames()
 
@@ -122,8 +187,10 @@ class Animation:
     def __build_key_frames(self):
         if self.__duration <= 0:
             return
+        # frames without changes share the empty key frame until a key
+        # point or {Animator.make_smooth} sets their own
         for key_p in range(0, self.__frames + 1):
-            self.__key_frames[str(key_p)] = KeyFrame()
+            self.__key_frames[str(key_p)] = EMPTY_KEY_FRAME
 
     def set_key_frame(self, key: str, key_frame: KeyFrame,
                       key_point: bool = False):
@@ -131,6 +198,8 @@ class Animation:
         key is basically a frame position from 0 to any number but
         in string format, because keyframes are saved in an object
         """
+        if key_frame is EMPTY_KEY_FRAME:
+            key_frame = KeyFrame(AnimationTransform())
         key_frame.key_point = key_point
         self.__key_frames[key] = key_frame
 
@@ -149,7 +218,7 @@ class Animation:
                 last_key = map_f.key
                 return self.__key_frames[map_f.key], map_f.key
         # return empty/default frame
-        return KeyFrame(), last_key
+        return EMPTY_KEY_FRAME, last_key
 
 
 class AnimationCollection:
@@ -206,11 +275,18 @@ class Animator(ABC):
     use to create animated moves for any python sprite
     """
 
-    def __init__(self):
+    # True when a system moves the playhead of all the animators at once
+    # after they draw the frame (see src.ecs.systems.animation_system), the
+    # subclass keeps it with {playhead}, {set_playhead} and
+    # {set_animation_delay}
+    bulk_playhead = False
+
+    def __init__(self, session: GameSession):
+        self.session = session
         # used to force run define animation method on child class
         self.__defined = False
         self.animations = AnimationCollection()
-        self.timer = 0
+        self.set_playhead(0, False)
         self.current_anim: Animation | None = None
         # last time frame helps to match the timer with the frame to run
         self.last_time_frame: str | None = None
@@ -218,25 +294,39 @@ class Animator(ABC):
         self.last_anim: str | None = None
         self.__on_pause = False
         self.loop = False
-        self.animation_delay = 0
+        self.set_animation_delay(0)
+        # trajectory offset already applied to the subject
+        self.__path_x = 0.0
+        self.__path_y = 0.0
+        # rotation (degrees) and size changes (pixels) of the animation,
+        # the subject applies them on its image (see {get_scale})
+        self.angle = 0.0
+        self.width_change = 0.0
+        self.height_change = 0.0
 
     @staticmethod
     def get_animation_set(set_name):
-        animation_set = {}
-        with open(f'src/assets/animations/{set_name}.json') as f:
-            animation_set = json.load(f)
-        return animation_set
+        return ASSETS.load_json(f'src/assets/animations/{set_name}.json')
 
     def define_animations(self, set_name):
         """
         This creates all the animations based on the json files,
         this is requited to be run over each child class, in oder to
-        create the animation collection base on its type
+        create the animation collection base on its type.
+        Animations are built once per set and shared by all the animators,
+        they are not changed while they play (the state is on the Animator)
         :return: None
         """
         self.__defined = True
-        animation_sets = self.get_animation_set(set_name)
-        common_sets = self.get_animation_set("common")
+        animations = ASSETS.shared(("animations", set_name),
+                                   lambda: self.build_animations(set_name))
+        self.animations = AnimationCollection(list(animations))
+
+    @classmethod
+    def build_animations(cls, set_name) -> List[Animation]:
+        animations = []
+        animation_sets = cls.get_animation_set(set_name)
+        common_sets = cls.get_animation_set("common")
         """
         animation_set = [
             {
@@ -251,7 +341,11 @@ class Animator(ABC):
                         "rotate": int, 
                         "w": int, 
                         "h": int,
-                        "curve": "smooth" | "linear"
+                        "curve": "smooth" | "linear" | "ease-in" |
+                                 "ease-out" | "ease-in-out" | "cubic-in" |
+                                 "cubic-out" | "cubic-in-out" | "bounce" |
+                                 "bezier",
+                        "bezier": [x1, y1, x2, y2]
                     }
                 ]
             }
@@ -267,6 +361,8 @@ class Animator(ABC):
                 animation_id=anim_set["name"],
                 duration=anim_set["duration"],
                 frames=anim_set["frames"])
+            key_points = []
+            shape_points = []
             # each animation set has key frames
             for key_frame in anim_set["key_frames"]:
                 # each frame has a transform parameters
@@ -280,23 +376,42 @@ class Animator(ABC):
                     transform.angle = key_frame["rotate"]
                 # in case we set a curve time
                 curve = Curve.smooth
-                if "curve" in key_frame and key_frame["curve"] == "linear":
-                    curve = Curve.linear
+                if "curve" in key_frame:
+                    curve = Curve.from_name(key_frame["curve"])
+                # eased curves are sampled once in a table
+                table = None
+                if curve not in (Curve.linear, Curve.smooth):
+                    params = key_frame.get("bezier")
+                    table = easing.get_table(
+                        curve.name, tuple(params) if params else None)
                 # then we set the frame, also set as key point
                 new_animation.set_key_frame(
                     key_frame["frame"],
-                    KeyFrame(transform, curve),
+                    KeyFrame(transform, curve, easing_table=table),
                     True
                 )
+                key_points.append((int(key_frame["frame"]), transform.x,
+                                   transform.y, table or curve.name))
+                shape_points.append((int(key_frame["frame"]), transform.angle,
+                                     transform.width, transform.height,
+                                     table or curve.name))
+            new_animation.trajectory = Trajectory.from_key_points(
+                anim_set["duration"], anim_set["frames"], key_points)
+            if any(point[1:4] != (0, 0, 0) for point in shape_points):
+                new_animation.shape_path = Trajectory.from_key_points(
+                    anim_set["duration"], anim_set["frames"], shape_points,
+                    channels=3)
             # here we add the animation to the collection
-            self.make_smooth(new_animation)  # smooth process
-            self.animations.append(new_animation)
+            cls.make_smooth(new_animation)  # smooth process
+            animations.append(new_animation)
+        return animations
 
     @staticmethod
     def make_smooth(animation: Animation):
         """
-        Triggered after define an animation, this takes each smoth key point and
-        preprocess the middle frames to generate the smooth effect.
+        Triggered after define an animation, this takes each smooth or eased
+        key point and spreads its change over the middle frames, smooth
+        points evenly and eased points following their curve table.
         :return:
         """
         anim_frames = animation.get_key_frame_list()
@@ -315,40 +430,34 @@ class Animator(ABC):
                 # just in case we have middle frames
                 if middle_frames_size > 0:
                     smooth_point = anim_frames[smooth_point_key]
-                    # formula: middle_frame = smooth_key / middle_frames_count
-                    new_transform = AnimationTransform()
-                    for obj_key in smooth_point.frame.__dict__.keys():
-                        point_val = smooth_point.frame.__dict__[obj_key]
-                        if obj_key == '_AnimationTransform__pivot':
-                            continue
-                        # avoid dive by zero error
-                        division = point_val / middle_frames_size
-                        # minimum value is 1
-                        division = math.copysign(1, division) \
-                            if -1 < division < 1 else round(division)
-                        new_transform.__dict__[obj_key] = division if (
-                                point_val != 0) else 0
-                    # set the mew value over all middle frames
-                    for frame_key in middle_frames:
-                        # update middle frame
-                        curr_frame = animation.get_key_frame(frame_key)
-                        curr_frame.frame = new_transform
-                        animation.set_key_frame(frame_key, curr_frame)
+                    table = smooth_point.easing_table
+                    # middle frames were collected from the end
+                    for step, frame_key in enumerate(middle_frames[::-1]):
+                        # share of the change on this frame, without
+                        # rounding so the frames add up to the key point
+                        if table:
+                            share = (table((step + 1) / middle_frames_size)
+                                     - table(step / middle_frames_size))
+                        else:
+                            share = 1 / middle_frames_size
+                        animation.set_key_frame(frame_key, KeyFrame(
+                            AnimationTransform(
+                                *(getattr(smooth_point.frame, field) * share
+                                  for field in TRANSFORM_FIELDS))))
                     # reset middle points to work with the new key point
                     middle_frames = []
                     # set smooth frame to zero, because middle frames has
                     # the new movement
                     anim_frames[
                         smooth_point_key].frame = AnimationTransform()
-                # take current key point that is smooth
+                # take current key point that is smooth or eased
                 smooth_point_key = key if (
-                        anim_frames[key].curve == Curve.smooth) else None
+                        anim_frames[key].curve != Curve.linear) else None
             # in case we found a smooth point we can now map the middle frames
             elif smooth_point_key and not anim_frames[key].key_point:
                 middle_frames.append(key)
 
-    @staticmethod
-    def __do_transform(target: Rect, key_frame: KeyFrame):
+    def __do_transform(self, target: Rect, key_frame: KeyFrame):
         """
         Change/move rect properties to the expected position
         just adding or subtracting the values from the transform object.
@@ -356,9 +465,34 @@ class Animator(ABC):
         :param transform: objects to pass the properties
         :return: None
         """
-        target.move_ip(key_frame.frame.x, key_frame.frame.y)
-        # TODO: rotation is complicated with just rects, we need to change
-        #  that and also add the width and height transform
+        self.move_subject(target, key_frame.frame.x, key_frame.frame.y)
+        self.angle += key_frame.frame.angle
+        self.width_change += key_frame.frame.width
+        self.height_change += key_frame.frame.height
+
+    def __reset_transform(self):
+        self.__path_x = 0.0
+        self.__path_y = 0.0
+        self.angle = 0.0
+        self.width_change = 0.0
+        self.height_change = 0.0
+
+    def get_scale(self, width: int, height: int) -> tuple:
+        """ scale of an image of the given size with the animation size
+        changes """
+        return ((width + self.width_change) / width,
+                (height + self.height_change) / height)
+
+    def move_subject(self, animated_subject: Rect, dx: float,
+                     dy: float) -> None:
+        """
+        Moves the subject along the animation trajectory, override it to
+        keep sub pixel positions (rects just have integers)
+        :param animated_subject: object given to {render_animation}
+        :param dx: horizontal movement of this frame
+        :param dy: vertical movement of this frame
+        """
+        animated_subject.move_ip(dx, dy)
 
     def run_animation(self, anim_id: str, loop: bool = False,
                       restart: bool = False):
@@ -375,8 +509,9 @@ class Animator(ABC):
                 and not restart):
             return
         self.current_anim = self.animations.get_animation(anim_id)
-        self.timer = 0
+        self.set_playhead(0, not self.__on_pause)
         self.loop = loop
+        self.__reset_transform()
 
     def on_animation_ends(self, anim_id: str):
         """ Overload this method in order to do something after an animation
@@ -385,16 +520,35 @@ class Animator(ABC):
 
     def stop_animation(self):
         # then we stop the animation
-        self.timer = 0
+        self.set_playhead(0, False)
+        self.__reset_transform()
         self.last_anim = self.current_anim.id if self.current_anim else None
         self.current_anim = None
         self.on_animation_ends(self.last_anim)
 
     def pause_animation(self):
         self.__on_pause = True
+        self.set_playhead(None, False)
 
     def continue_animation(self):
         self.__on_pause = False
+        self.set_playhead(None, self.current_anim is not None)
+
+    def playhead(self) -> tuple:
+        """ :return: timer and delay of the animation (milliseconds) """
+        return self.timer, self.animation_delay
+
+    def set_playhead(self, timer: float | None, playing: bool) -> None:
+        """
+        :param timer: animation time, None keeps the current one
+        :param playing: the timer runs on the next frames
+        """
+        if timer is not None:
+            self.timer = timer
+
+    def set_animation_delay(self, delay: float) -> None:
+        """ time to wait before the animation plays again """
+        self.animation_delay = delay
 
     def render_animation(self, animated_subject: Rect):
         """
@@ -408,28 +562,46 @@ class Animator(ABC):
             raise Exception("Define animations required, "
                             "use 'define_animations(str_name)' "
                             "method on child class.")
+        timer, delay = self.playhead()
         # create a delay
-        if self.animation_delay > 0:
-            self.animation_delay -= GLOBALS.ms_fps
+        if delay > 0:
+            if not self.bulk_playhead:
+                self.animation_delay = delay - self.session.ms_fps
             return
         if self.__on_pause:
             return
         # first detect if time is out of the duration
-        if self.current_anim and self.timer >= self.current_anim.get_duration():
+        if self.current_anim and timer >= self.current_anim.get_duration():
             self.stop_animation()
             if self.loop:
                 self.run_animation(self.last_anim, True)
+            timer = 0
 
         # in case we don't have an animation then we just avoid run something
         if not self.current_anim:
             return
+        trajectory = self.current_anim.trajectory
+        if trajectory:
+            # position at the end of this frame, evaluated from the time
+            timer += self.session.ms_fps
+            if not self.bulk_playhead:
+                self.timer = timer
+            path_x, path_y = trajectory.position(timer)
+            self.move_subject(animated_subject, path_x - self.__path_x,
+                              path_y - self.__path_y)
+            self.__path_x = path_x
+            self.__path_y = path_y
+            if self.current_anim.shape_path:
+                self.angle, self.width_change, self.height_change = (
+                    self.current_anim.shape_path.values(timer))
+            return
         # set all properties to the original component
-        frame, time_key = self.current_anim.get_frame_by_time(
-            self.timer)
+        frame, time_key = self.current_anim.get_frame_by_time(timer)
 
         if self.last_time_frame != time_key:
             self.__do_transform(target=animated_subject, key_frame=frame)
         self.last_time_frame = time_key
         # frame rate is 60, then 60 frames = 1000 ms(1s),
         # result 1 frame = 16.666666667
-        self.timer += GLOBALS.ms_fps  # update timer
+        if not self.bulk_playhead:
+            self.timer = timer + self.session.ms_fps  # update timer
@@ -8,6 +8,14 @@ from src.kinematics.kinematics import (
     Curve,
     KeyFrame,
 )
+from src.kinematics import easing
+from src.kinematics.trajectory import Trajectory
+
+
+def is_monotonic(table: easing.EasingTable) -> bool:
+    """ curves that never go back (bounce and some beziers do) """
+    return all(b >= a - 1e-9 for a, b in zip(table.values,
+                                             table.values[1:]))
 
 
 class AnimationTest(unittest.TestCase):
@@ -52,6 +60,24 @@ class AnimationTest(unittest.TestCase):
         self.assertEqual(frame.frame.y, key_frame.frame.y)
         self.assertEqual(frame.frame.x, key_frame.frame.x)
 
+    def test_compact_frames(self):
+        animation = Animation("test_animation", duration=1000, frames=20)
+        # empty frames are shared and the types don't carry a __dict__
+        self.assertIs(animation.get_key_frame("1"),
+                      animation.get_key_frame("2"))
+        self.assertFalse(hasattr(AnimationTransform(), "__dict__"))
+        self.assertFalse(hasattr(animation, "__dict__"))
+        # the shared frame is read only, setting it takes a copy
+        empty = animation.get_key_frame("3")
+        with self.assertRaises(AttributeError):
+            empty.frame.x = 5
+        with self.assertRaises(AttributeError):
+            empty.key_point = True
+        animation.set_key_frame("3", empty, True)
+        self.assertTrue(animation.get_key_frame("3").key_point)
+        self.assertFalse(animation.get_key_frame("4").key_point)
+        self.assertEqual(animation.get_key_frame("4").frame.x, 0)
+
 
 class AnimationCollectionTest(unittest.TestCase):
 
@@ -91,5 +117,99 @@ class AnimationCollectionTest(unittest.TestCase):
                 self.assertEqual(anim.get_frame_size(), 50)
 
 
+class TrajectoryTest(unittest.TestCase):
+    def setUp(self):
+        # zigzag: 100px to the right and back while going down
+        self.zigzag = Trajectory.from_key_points(
+            1000, 60, [(30, 100, 100, "smooth"), (60, -100, 100, "smooth")])
+
+    def test_key_points(self):
+        self.assertEqual(self.zigzag.duration, 1000)
+        self.assertEqual(self.zigzag.position(0), (0, 0))
+        self.assertEqual(self.zigzag.position(500), (100, 100))
+        self.assertEqual(self.zigzag.position(1000), (0, 200))
+        # clamped to the path
+        self.assertEqual(self.zigzag.position(5000), (0, 200))
+
+    def test_linear(self):
+        path = Trajectory.from_key_points(2500, 60, [(60, -500, 500,
+                                                      "linear")])
+        x, y = path.position(1250)
+        self.assertAlmostEqual(x, -250)
+        self.assertAlmostEqual(y, 250)
+
+    def test_sample(self):
+        times = [0, 100, 333.3, 500, 720, 1000]
+        samples = self.zigzag.sample(times)
+        for time, (x, y) in zip(times, samples):
+            expected_x, expected_y = self.zigzag.position(time)
+            self.assertAlmostEqual(x, expected_x)
+            self.assertAlmostEqual(y, expected_y)
+
+    def test_animation_shape(self):
+        animations = {animation.id: animation
+                      for animation in Animator.build_animations("basic")}
+        self.assertIsNone(animations["zigzag"].shape_path)
+        kamikaze = animations["kamikaze-left"]
+        angle, width, height = kamikaze.shape_path.values(
+            kamikaze.get_duration())
+        self.assertEqual((angle, width, height), (-30, 0, 0))
+        x, y = kamikaze.trajectory.position(kamikaze.get_duration())
+        self.assertAlmostEqual(x, -500)
+        self.assertAlmostEqual(y, 500)
+
+    def test_between(self):
+        path = Trajectory.between((10, 10), (110, -90), 400)
+        self.assertEqual(path.position(400), (100, -100))
+        # eased: slower at the start than linear
+        x, _ = path.position(40)
+        self.assertLess(x, 10)
+
+
+class EasingTest(unittest.TestCase):
+    def test_tables(self):
+        for name in easing.EASINGS:
+            table = easing.get_table(name)
+            self.assertAlmostEqual(table(0), 0)
+            self.assertAlmostEqual(table(1), 1)
+            # lookups stay close to the curve between samples
+            self.assertAlmostEqual(table(0.3), easing.EASINGS[name](0.3),
+                                   places=3)
+        self.assertIs(easing.get_table("ease-in"),
+                      easing.get_table("ease_in"))
+        self.assertFalse(is_monotonic(easing.get_table("bounce")))
+        with self.assertRaises(KeyError):
+            easing.get_table("wobble")
+
+    def test_bezier(self):
+        table = easing.get_table("bezier", (0.25, 0.1, 0.25, 1))
+        self.assertAlmostEqual(table(1), 1, places=6)
+        self.assertGreater(table(0.5), 0.5)
+        with self.assertRaises(ValueError):
+            easing.get_table("bezier", (1.5, 0, 0, 1))
+
+    def test_eased_trajectory(self):
+        path = Trajectory.from_key_points(1000, 60, [(60, 100, 0,
+                                                      "ease-in")])
+        self.assertAlmostEqual(path.position(500)[0], 25, places=2)
+        self.assertAlmostEqual(path.position(1000)[0], 100)
+        samples = path.sample([250, 500, 750])
+        for time, (x, _) in zip([250, 500, 750], samples):
+            self.assertAlmostEqual(x, path.position(time)[0])
+
+    def test_make_smooth(self):
+        animation = Animation("eased", duration=1000, frames=10)
+        animation.set_key_frame(
+            "10", KeyFrame(AnimationTransform(10, 7), Curve.cubic_in,
+                           easing_table=easing.get_table("cubic_in")), True)
+        Animator.make_smooth(animation)
+        steps = [animation.get_key_frame(str(idx)).frame.x
+                 for idx in range(1, 10)]
+        # the frames add up to the key point without rounding
+        self.assertAlmostEqual(sum(steps), 10)
+        self.assertLess(steps[0], steps[-1])
+        self.assertEqual(animation.get_key_frame("10").frame.x, 0)
+
+
 if __name__ == "__main__":
     unittest.main()
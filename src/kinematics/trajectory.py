@@ -0,0 +1,199 @@
+"""
+Trajectories: paths precomputed as piecewise cubic splines (Hermite), the
+offset from the path start is evaluated in closed form from the time, so
+an animation doesn't accumulate rounding errors frame after frame and the
+same path can be sampled for many times at once with numpy.
+"""
+import bisect
+import math
+from typing import List
+
+import numpy as np
+
+from src.kinematics.easing import EasingTable, get_table
+
+LINEAR = "linear"
+SMOOTH = "smooth"
+# segment that starts and ends with zero speed
+EASE = "ease"
+
+
+class Trajectory:
+    """
+    Path of offsets from its start point, it passes through the given
+    knots: (time ms, value, ..., curve), the values are usually x, y but
+    any number of channels can be used (angle, width...). Curve of a knot is
+    the shape of the segment that ends on it: "linear", "smooth"
+    (Catmull-Rom tangents), "ease" (stops on both knots) or an easing curve
+    (name or {EasingTable}) that maps the segment time through its table.
+    """
+
+    def __init__(self, knots: List[tuple]):
+        if len(knots) < 2:
+            raise ValueError("Trajectory: at least two knots are required")
+        times = [knot[0] for knot in knots]
+        if any(end <= start for start, end in zip(times, times[1:])):
+            raise ValueError("Trajectory: knot times need to increase")
+        self.duration = times[-1]
+        self.channels = len(knots[0]) - 2
+        self.__times = times
+        # per segment and channel: polynomial coefficients over u in [0, 1]
+        self.__segments: List[tuple] = []
+        slopes = [self.__slope(knots[idx], knots[idx + 1])
+                  for idx in range(len(knots) - 1)]
+        for idx in range(len(knots) - 1):
+            table = self.__easing(knots[idx + 1][-1])
+            span = times[idx + 1] - times[idx]
+            if table:
+                # straight segment, the table gives the progress on it
+                coefficients = tuple(
+                    (knots[idx][channel + 1],
+                     knots[idx + 1][channel + 1] - knots[idx][channel + 1],
+                     0.0, 0.0) for channel in range(self.channels))
+                self.__segments.append((times[idx], span, coefficients,
+                                        table))
+                continue
+            start_tangent = self.__tangent(knots, slopes, idx, idx)
+            end_tangent = self.__tangent(knots, slopes, idx + 1, idx)
+            coefficients = []
+            for channel in range(self.channels):
+                p0 = knots[idx][channel + 1]
+                p1 = knots[idx + 1][channel + 1]
+                m0 = start_tangent[channel] * span
+                m1 = end_tangent[channel] * span
+                coefficients.append((p0, m0, 3 * (p1 - p0) - 2 * m0 - m1,
+                                     2 * (p0 - p1) + m0 + m1))
+            self.__segments.append((times[idx], span, tuple(coefficients),
+                                    None))
+        self.__arrays = None
+
+    @staticmethod
+    def __easing(curve) -> EasingTable | None:
+        """ table of an easing curve, None for the spline curves """
+        if isinstance(curve, EasingTable):
+            return curve
+        if curve in (LINEAR, SMOOTH, EASE):
+            return None
+        return get_table(curve)
+
+    @staticmethod
+    def __slope(start: tuple, end: tuple) -> tuple:
+        """ slope (per ms) of each channel between two knots """
+        span = end[0] - start[0]
+        return tuple((value_end - value_start) / span
+                     for value_start, value_end
+                     in zip(start[1:-1], end[1:-1]))
+
+    @classmethod
+    def __tangent(cls, knots: List[tuple], slopes: List[tuple], knot: int,
+                  segment: int) -> tuple:
+        """
+        tangent on a knot for one of its segments: zero for ease segments,
+        Catmull-Rom on a joint of two smooth segments and the chord for the
+        rest (linear segments and path ends)
+        """
+        curve = knots[segment + 1][-1]
+        if curve == EASE:
+            return (0.0,) * (len(knots[0]) - 2)
+        if (curve != SMOOTH or knot == 0 or knot == len(knots) - 1
+                or knots[knot][-1] != SMOOTH
+                or knots[knot + 1][-1] != SMOOTH):
+            return slopes[segment]
+        return cls.__slope(knots[knot - 1], knots[knot + 1])
+
+    @classmethod
+    def between(cls, start: tuple, end: tuple,
+                duration: float) -> "Trajectory":
+        """ eased path (slow start and end) from start to end, the offsets
+        are relative to start """
+        return cls([(0, 0, 0, EASE),
+                    (duration, end[0] - start[0], end[1] - start[1], EASE)])
+
+    def __locate(self, time: float) -> tuple:
+        """ segment of a path time and the local time on it (0-1) """
+        if time <= 0:
+            segment = self.__segments[0]
+            return segment, segment[3](0.0) if segment[3] else 0.0
+        if time >= self.duration:
+            segment = self.__segments[-1]
+            return segment, segment[3](1.0) if segment[3] else 1.0
+        segment = self.__segments[bisect.bisect_right(self.__times, time) - 1]
+        u = (time - segment[0]) / segment[1]
+        if segment[3]:
+            return segment, segment[3](u)
+        return segment, u
+
+    def position(self, time: float) -> tuple:
+        """ offset (x, y) of a two channel path at the given time (ms), the
+        time is clamped to the path duration """
+        segment, u = self.__locate(time)
+        (x0, x1, x2, x3), (y0, y1, y2, y3) = segment[2]
+        return (x0 + u * (x1 + u * (x2 + u * x3)),
+                y0 + u * (y1 + u * (y2 + u * y3)))
+
+    def values(self, time: float) -> tuple:
+        """ value of every channel at the given time (ms) """
+        segment, u = self.__locate(time)
+        return tuple(c0 + u * (c1 + u * (c2 + u * c3))
+                     for c0, c1, c2, c3 in segment[2])
+
+    def sample(self, times) -> np.ndarray:
+        """
+        values of many times at once
+        :param times: array like of times (ms)
+        :return: array (len(times), channels)
+        """
+        if self.__arrays is None:
+            self.__arrays = (
+                np.array(self.__times[:-1], dtype=np.float64),
+                np.array([segment[1] for segment in self.__segments],
+                         dtype=np.float64),
+                # (segments, channels, 4)
+                np.array([segment[2] for segment in self.__segments],
+                         dtype=np.float64))
+        starts, spans, coefficients = self.__arrays
+        times = np.clip(np.asarray(times, dtype=np.float64), 0,
+                        self.duration)
+        index = np.clip(np.searchsorted(starts, times, side="right") - 1,
+                        0, len(starts) - 1)
+        u = (times - starts[index]) / spans[index]
+        for segment_idx, segment in enumerate(self.__segments):
+            if segment[3]:
+                eased = index == segment_idx
+                u[eased] = segment[3].sample(u[eased])
+        u = u[:, None]
+        coef = coefficients[index]
+        return coef[..., 0] + u * (
+            coef[..., 1] + u * (coef[..., 2] + u * coef[..., 3]))
+
+    @classmethod
+    def from_key_points(cls, duration: int, frames: int,
+                        key_points: List[tuple],
+                        channels: int = 2) -> "Trajectory":
+        """
+        Path of an animation: each key point (frame, value, ..., curve)
+        changes the channels (x, y...) between the last key point and its
+        frame, the knots are the accumulated changes
+        """
+        knots = [(0,) + (0,) * channels + (SMOOTH,)]
+        values = (0,) * channels
+        for key_point in sorted(key_points, key=lambda item: item[0]):
+            time = duration * key_point[0] / frames
+            values = tuple(value + change
+                           for value, change in zip(values, key_point[1:-1]))
+            if time <= knots[-1][0]:
+                # same time as the last knot (frame 0), it jumps there
+                knots[-1] = (knots[-1][0],) + values + (knots[-1][-1],)
+                continue
+            knots.append((time,) + values + (key_point[-1],))
+        if len(knots) == 1:
+            # animation without changes
+            knots.append((max(duration, 1),) + values + (LINEAR,))
+        return cls(knots)
+
+
+def return_duration(start: tuple, end: tuple, speed: float = 0.4,
+                    minimum: float = 300) -> float:
+    """ duration (ms) of a return path at the given speed (px per ms) """
+    return max(minimum, math.hypot(end[0] - start[0],
+                                   end[1] - start[1]) / speed)
@@ -1,22 +1,33 @@
 import math
-from typing import List
+from typing import Dict, List
 
-from src.globals import GameVariables
+from src.globals import GameAssets, GameSession
 from src.characters import enemy
 from src.characters.player import Player, PlayerController, Bullet
 import pygame
-import json
-import random
+
+from src.collision import projectile_collides, sprites_collide
+from src.ecs import systems
+from src.event_log import EVENT_LEVEL_COMPLETED, EVENT_RESTART
 
 from src.hit_particles import HitExplosionController
+from src.input_system import ACTION_FIRE
+from src.render_queue import LAYER_BACKGROUND, LAYER_ENEMIES, LAYER_UI
+from src.surface_registry import OWNER_BACKGROUND, OWNER_UI
 
-GLOBALS = GameVariables()
+ASSETS = GameAssets()
+# the background is blended with the black screen
+BACKGROUND_ALPHA = 180
+# time between the blinks of the restart label (ms)
+BLINK_MS = 500
 
 
 class EnemyArmy:
     """Factory class to generate a Enemies group placed over the level"""
 
-    def __init__(self, level=1, pattern=[[]], life_config={}):
+    def __init__(self, session: GameSession, level=1, pattern=[[]],
+                 life_config={}):
+        self.session = session
         self.level = level
         self.pattern = pattern
         self.life_config = life_config
@@ -44,14 +55,15 @@ class EnemyArmy:
             for e_type in row:
                 if e_type:
                     # add enemy position with the gap to the left
-                    new_enemy: enemy.Enemy = self.build_enemy(e_type,
+                    new_enemy: enemy.Enemy = self.build_enemy(self.session,
+                                                              e_type,
                                                               x_delta + gap,
                                                               y_delta + gap)
                     if e_type in self.life_config:
-                        new_enemy.life = self.life_config[e_type]
+                        new_enemy.set_life(self.life_config[e_type])
                     #  as we progress through levels the enemy life increases
-                    new_enemy.life += round(
-                        GLOBALS.level * 0.1) * new_enemy.life
+                    new_enemy.set_life(new_enemy.life + round(
+                        self.session.level * 0.1) * new_enemy.life)
                     self.enemiesGroup.add(new_enemy)
                 # add the gap to the right
                 x_delta += enemy_size + gap
@@ -59,10 +71,12 @@ class EnemyArmy:
             x_delta = w_margin
 
     @staticmethod
-    def build_enemy(enemy_type: str, x: int, y: int) -> enemy.Enemy:
+    def build_enemy(session: GameSession, enemy_type: str, x: int,
+                    y: int) -> enemy.Enemy:
         """
         Creates an enemy based on the type, it takes the object where
         the Enemies classes are referred
+        :param session: game session of the enemy
         :param y: start vertical position
         :param x: start horizontal position
         :param enemy_type: enemy type identifier, this is unique
@@ -74,21 +88,24 @@ class EnemyArmy:
             "sniper": enemy.EnemySniper
         }
         if enemy_type not in enemies_map:
-            return enemy.EnemyBasic(x, y)
+            return enemy.EnemyBasic(session, x, y)
         enemy_class = enemies_map[enemy_type.lower()]
-        return enemy_class(x, y)
+        return enemy_class(session, x, y)
 
 
 class HiveMind:
     """ Use to control all action over an Enemy Army"""
 
-    def __init__(self, army: EnemyArmy, level=1):
+    def __init__(self, session: GameSession, army: EnemyArmy, level=1):
+        self.session = session
         self.army = army
         self.level = level
         # validations
         if not army:
             raise Exception("HiveMind: class require EnemyArmy parameter")
         self.enemy_list: List[enemy.Enemy] = []
+        # entity -> enemy of the army (bullets included)
+        self.__by_entity: Dict[int, enemy.Enemy] = {}
         self.get_enemy_list()
         if len(self.enemy_list) == 0:
             raise Exception("HiveMind: EnemyArmy list is empty")
@@ -128,6 +145,7 @@ class HiveMind:
         """ update enemy list, this variable is used over multiple processes"""
         base_list = self.army.enemiesGroup.sprites()
         self.enemy_list = []
+        self.__by_entity = {item.entity_id: item for item in base_list}
         for item in base_list:
             # ignore bullets
             if item.tag == "enemy_bullet":
@@ -139,21 +157,28 @@ class HiveMind:
         used to sync all the enemies timers on idle mode
         :return:
         """
-        self.__global_idle_timer += GLOBALS.ms_fps
+        self.__global_idle_timer += self.session.ms_fps
         if self.__global_idle_timer > self.__idle_duration:
             self.__global_idle_timer = 0
-        for enemy_ref in self.enemy_list:
-            if enemy_ref.idle:
-                enemy_ref.timer = self.__global_idle_timer
+        systems.sync_idle_timers(self.session.world, self.__global_idle_timer)
+
+    def check_deaths(self):
+        """ the enemies without life left die (health system) """
+        for entity in systems.dead_entities(self.session.world).tolist():
+            enemy_ref = self.__by_entity.get(entity)
+            if (enemy_ref is not None and enemy_ref.entity_id == entity
+                    and not enemy_ref.is_dead):
+                enemy_ref.die()
 
     def on_shoot(self, enemy_ref: enemy.Enemy):
         bullet: enemy.Enemy | None = None
         match enemy_ref.type:
             case 2:
-                bullet = enemy.Bullet(enemy_ref.rect.centerx,
+                bullet = enemy.Bullet(self.session, enemy_ref.rect.centerx,
                                       enemy_ref.rect.y + enemy_ref.rect.height + 10)
             case 3:
-                bullet = enemy.SniperBullet(enemy_ref.rect.centerx,
+                bullet = enemy.SniperBullet(self.session,
+                                            enemy_ref.rect.centerx,
                                             enemy_ref.rect.y + enemy_ref.rect.height + 10)
         self.army.enemiesGroup.add(bullet)
 
@@ -167,7 +192,8 @@ class HiveMind:
         # to sync animation with the rest we need to do a
         # remaining time calculation to wait and start the idle at
         # the same time
-        enemy_ref.animation_delay = self.__idle_duration - self.__global_idle_timer
+        enemy_ref.set_animation_delay(
+            self.__idle_duration - self.__global_idle_timer)
 
     def on_enemy_dies(self, enemy_ref: enemy.Enemy):
         # we need to update the list again
@@ -182,16 +208,14 @@ class HiveMind:
     def update(self):
         self.idle_timer()
         # check attacking enemies
-        self.on_attack_count = 0
-        for an_enemy in self.army.enemiesGroup.sprites():
-            if an_enemy.on_attack:
-                self.on_attack_count += 1
+        self.on_attack_count = systems.count_attacking(self.session.world)
         # check if we can attack or not
         if self.frequency_timer > self.frequency:
             # check if last one is dead or not to avoid complete this task
             if len(self.enemy_list) == 1 and self.enemy_list[0].is_dead:
                 return
-            chosen_one = random.randint(0, len(self.enemy_list) - 1)
+            chosen_one = self.session.rng.randint(0,
+                                                  len(self.enemy_list) - 1)
             if self.enemy_list[chosen_one].on_attack:
                 return
             if (not self.enemy_list[chosen_one].on_attack
@@ -201,67 +225,103 @@ class HiveMind:
             # restore frequency if we reach the limit
             if self.on_attack_count >= self.limit_on_attack:
                 self.frequency_timer = 0
-        self.frequency_timer += GLOBALS.ms_fps
+        self.frequency_timer += self.session.ms_fps
 
 
 class UIController:
-    def __init__(self):
+    def __init__(self, session: GameSession):
+        self.session = session
         self.txt_score: str = "Score: "
         self.txt_player_life: str = "Life: "
         self.txt_level: str = "Level: "
         self.txt_game_over: str = "GAME OVER"
         self.txt_restart: str = "press SPACE to restart"
         self.__blink_restart = False
-        self.__blink_timer = 500
+        # the blink follows the clock (not the frames), the loop can slow
+        # down on the game over screen
+        self.__blink_at: int | None = None
+        # label -> (text, color, surface, rect) of the last render
+        self.__texts: Dict[str, tuple] = {}
+
+    def __text(self, label: str, font, text: str, color,
+               background=None) -> tuple:
+        """
+        Rendered text of a label, it is rendered (and counted on the ui
+        memory) again only when its text or color changes
+        :return: surface and a rect of its size to place it
+        """
+        cached = self.__texts.get(label)
+        if cached is None or cached[0] != text or cached[1] != color:
+            surface, rect = font.render(text, color, background)
+            ASSETS.surfaces.register(surface, OWNER_UI)
+            cached = self.__texts[label] = (text, color, surface, rect)
+        return cached[2], cached[3].copy()
 
     def in_game(self, player):
+        screen = self.session.screen
+        queue = self.session.render_queue
+        fonts = self.session.game_fonts
         # Level text
-        GLOBALS.game_fonts.base.render_to(GLOBALS.screen, (10, 10),
-                                          self.txt_level + str(GLOBALS.level),
-                                          (255, 255, 255))
+        level, _ = self.__text(
+            "level", fonts.base, self.txt_level + str(self.session.level),
+            (255, 255, 255))
+        queue.add(LAYER_UI, level, (10, 10))
         # score text
-        score, score_rect = GLOBALS.game_fonts.base.render(
-            self.txt_score + str(GLOBALS.score), (255, 255, 255), (0, 0, 0, 0))
-        score_rect.centerx = GLOBALS.screen.get_rect().centerx
-        GLOBALS.screen.blit(score, score_rect)
+        score, score_rect = self.__text(
+            "score", fonts.base, self.txt_score + str(self.session.score),
+            (255, 255, 255), (0, 0, 0, 0))
+        score_rect.centerx = screen.get_rect().centerx
+        queue.add(LAYER_UI, score, score_rect)
         # life text
-        GLOBALS.game_fonts.base.render_to(GLOBALS.screen, (520, 10),
-                                          self.txt_player_life + str(
-                                              GLOBALS.life),
-                                          (255, 255, 255))
+        life, _ = self.__text(
+            "life", fonts.base,
+            self.txt_player_life + str(self.session.life), (255, 255, 255))
+        queue.add(LAYER_UI, life, (520, 10))
 
     def game_over(self):
-        screen_center = GLOBALS.screen.get_rect().center
+        screen = self.session.screen
+        queue = self.session.render_queue
+        fonts = self.session.game_fonts
+        screen_center = screen.get_rect().center
         # GAME OVER text
-        game_over, game_over_rect = GLOBALS.game_fonts.title.render(
-            self.txt_game_over, (255, 100, 100), (0, 0, 0, 0))
+        game_over, game_over_rect = self.__text(
+            "game_over", fonts.title, self.txt_game_over, (255, 100, 100),
+            (0, 0, 0, 0))
         game_over_rect.center = screen_center
         game_over_rect.centery -= 10
-        GLOBALS.screen.blit(game_over, game_over_rect)
+        queue.add(LAYER_UI, game_over, game_over_rect)
         # score text, in this case we add the life as score
-        score, score_rect = GLOBALS.game_fonts.base.render(
-            self.txt_score + str(GLOBALS.score + GLOBALS.life),
+        score, score_rect = self.__text(
+            "final_score", fonts.base,
+            self.txt_score + str(self.session.score + self.session.life),
             (200, 200, 190), (0, 0, 0, 0))
         score_rect.center = screen_center
         score_rect.centery += 10
-        GLOBALS.screen.blit(score, score_rect)
+        queue.add(LAYER_UI, score, score_rect)
         # restart label
-        restart, restart_rect = GLOBALS.game_fonts.base.render(
-            self.txt_restart,
+        restart, restart_rect = self.__text(
+            "restart", fonts.base, self.txt_restart,
             (255, 255, 255, 255 if self.__blink_restart else 200),
             (0, 0, 0, 0))
         restart_rect.center = screen_center
         restart_rect.centery += 100
-        GLOBALS.screen.blit(restart, restart_rect)
-        self.__blink_timer -= GLOBALS.ms_fps
-        if self.__blink_timer <= 0:
+        queue.add(LAYER_UI, restart, restart_rect)
+        now = pygame.time.get_ticks()
+        if self.__blink_at is None:
+            self.__blink_at = now + BLINK_MS
+        elif now >= self.__blink_at:
             self.__blink_restart = not self.__blink_restart
-            self.__blink_timer = 500
+            self.__blink_at = now + BLINK_MS
 
         # Enter Key press detector
-        keys = pygame.key.get_pressed()
-        if keys[pygame.K_SPACE]:
-            GLOBALS.restart = True
+        if self.session.input.pressed(ACTION_FIRE):
+            self.session.restart = True
+
+    def next_blink_ms(self) -> int:
+        """ time until the restart label blinks again """
+        if self.__blink_at is None:
+            return 0
+        return max(0, self.__blink_at - pygame.time.get_ticks())
 
     def render(self, player_controller: PlayerController):
         # if level is complete then we can create the new level
@@ -274,18 +334,46 @@ class UIController:
 class SpaceBackground:
     """ this creates a background animated with stars and planets """
 
-    def __init__(self, speed=1):
+    def __init__(self, session: GameSession, speed=1):
+        self.session = session
         self.img_height = 1200
-        self.bg = pygame.image.load(GLOBALS.sprite_dir + "bg.png").convert()
-        self.bg.set_alpha(180)
+        # background surfaces are shared by the sessions (the blended one
+        # and the opaque one of the reduced quality)
+        self.bg = self.__background(opaque=False)
         self.tiles = math.ceil(self.img_height / self.bg.get_height()) + 1
         self.scroll = 0
         self.speed = speed
 
+    @staticmethod
+    def __background(opaque: bool) -> pygame.Surface:
+        """
+        :param opaque: the blended background drawn over black, it looks
+        the same and skips the alpha blend on each frame
+        """
+        def build():
+            if opaque:
+                blended = SpaceBackground.__background(opaque=False)
+                surface = ASSETS.surface(blended.get_size(),
+                                         OWNER_BACKGROUND)
+                surface.fill("black")
+                surface.blit(blended, (0, 0))
+                return surface
+            # loaded out of the image cache, the blend is set on the only
+            # copy of the pixels
+            surface = pygame.image.load(ASSETS.sprite_dir + "bg.png")
+            surface = surface.convert()
+            surface.set_alpha(BACKGROUND_ALPHA)
+            return ASSETS.surfaces.register(surface, OWNER_BACKGROUND)
+        return ASSETS.shared(("background", opaque), build)
+
     def render(self):
-        for i in range(0, self.tiles):
-            GLOBALS.screen.blit(self.bg, (0, self.bg.get_height() * i
-                                          + self.scroll))
+        if self.session.show_background:
+            bg = (self.bg if self.session.quality.background_alpha
+                  else self.__background(opaque=True))
+            for i in range(0, self.tiles):
+                self.session.render_queue.add(
+                    LAYER_BACKGROUND, bg,
+                    (0, bg.get_height() * i + self.scroll))
         self.scroll -= self.speed
         if abs(self.scroll) > self.img_height:
             self.scroll = 0
@@ -294,46 +382,60 @@ class SpaceBackground:
 class GameLevel:
     """ Creates the level structure according to the level """
 
-    def __init__(self):
+    def __init__(self, session: GameSession):
+        self.session = session
         self.level = None
         self.enemy_army: EnemyArmy = None
         self.player_controller: PlayerController = None
         self.enemy_controller: HiveMind = None
-        self.background = SpaceBackground()
-        self.hit_controller = HitExplosionController()
+        self.background = SpaceBackground(session)
+        self.hit_controller = HitExplosionController(session)
 
     def build_level(self, level, enemies, life_config):
         """Creates the level structure"""
         self.level = level
-        self.enemy_army = EnemyArmy(level=level, pattern=enemies,
-                                    life_config=life_config)
-        self.player_controller = PlayerController()
-        self.enemy_controller = HiveMind(self.enemy_army, level)
+        gc_policy = self.session.gc_policy
+        if gc_policy:
+            gc_policy.level_transition()
+        # new world, the entities of the last level are dropped with it
+        self.session.world = systems.create_world()
+        self.enemy_army = EnemyArmy(self.session, level=level,
+                                    pattern=enemies, life_config=life_config)
+        self.player_controller = PlayerController(self.session)
+        self.enemy_controller = HiveMind(self.session, self.enemy_army, level)
+        if gc_policy:
+            gc_policy.level_built()
 
     def is_level_completed(self) -> bool:
         """Check if level is complete
         :returns: boolean"""
         if len(self.enemy_army.enemiesGroup) == 0:
-            GLOBALS.sound_controller.stop()
+            self.session.sound_controller.stop()
             return True
         return False
 
     def is_game_over(self) -> bool:
         """Check if player is dead
                :returns: boolean"""
-        if GLOBALS.life <= 0:
-            GLOBALS.sound_controller.stop()
+        if self.session.life <= 0:
+            self.session.sound_controller.stop()
             return True
         return False
 
     def check_collisions(self):
+        pixel_perfect = self.session.pixel_collisions
         for enemy_ref in self.enemy_army.enemiesGroup.spritedict:
             enemy_item: enemy.Enemy = enemy_ref
             for player_ref in self.player_controller.playerGroup.spritedict:
                 player_or_bullet: Player | Bullet = player_ref
-                # check player got hit
+                # check player got hit, bullets (type 0) are tested along
+                # the path they moved on this frame
                 if player_or_bullet.tag == "player":
-                    if player_or_bullet.rect.colliderect(enemy_item.rect):
+                    if (projectile_collides(enemy_item, player_or_bullet,
+                                            pixel_perfect)
+                            if enemy_item.type == 0 else
+                            sprites_collide(player_or_bullet, enemy_item,
+                                            pixel_perfect)):
                         # check invulnerability
                         if not player_or_bullet.invulnerable:
                             player_or_bullet.take_damage(enemy_item.damage)
@@ -347,7 +449,8 @@ class GameLevel:
                                 enemy_item.is_dead = True
                 # enemy bullets are type 0, that's why type > 0
                 if player_or_bullet.tag == "bullet" and enemy_item.type > 0:
-                    if player_or_bullet.rect.colliderect(enemy_item.rect):
+                    if projectile_collides(player_or_bullet, enemy_item,
+                                           pixel_perfect):
                         # render hit
                         self.hit_controller.add_hit_explosion(
                             enemy_item.rect.center)
@@ -355,12 +458,17 @@ class GameLevel:
                         player_or_bullet.hit()
 
     def render_level_frame(self):
+        self.session.world.update()
         self.background.render()
         self.player_controller.render()
         self.check_collisions()
+        self.enemy_controller.check_deaths()
         self.enemy_army.enemiesGroup.update(self.player_controller.player)
+        # the animators drew this frame, move their playheads
+        systems.animation_system(self.session.world, self.session.ms_fps)
         self.enemy_controller.update()
-        self.enemy_army.enemiesGroup.draw(GLOBALS.screen)
+        self.session.render_queue.add_group(LAYER_ENEMIES,
+                                            self.enemy_army.enemiesGroup)
         self.hit_controller.render()
 
     def __str__(self):
@@ -369,20 +477,41 @@ class GameLevel:
 
 
 class LevelController:
-    def __init__(self):
-        self.__game_level = GameLevel()
-        self.__curr_level = 1
+    def __init__(self, session: GameSession, start_level: int = 1):
+        self.session = session
+        self.__game_level = GameLevel(session)
+        self.__start_level = start_level
+        self.__curr_level = start_level
         self.__level_list = self.__load_levels_file()
         self.__life_config = self.__load_life_config_file()
         self.__create_level(self.__curr_level)
-        self.__ui = UIController()
+        self.__ui = UIController(session)
+
+    @property
+    def game_level(self) -> GameLevel:
+        return self.__game_level
+
+    @property
+    def is_completed(self) -> bool:
+        """ True after the player clears the last level of the file """
+        return self.__curr_level > len(self.__level_list)
+
+    @property
+    def idle_ms(self) -> int:
+        """
+        Time the frame stays the same without input: the game over screen
+        only changes when the restart label blinks. 0 while playing
+        """
+        if not self.__game_level.player_controller.player.is_dead:
+            return 0
+        return self.__ui.next_blink_ms()
 
     def __restart(self):
-        GLOBALS.restart = False
-        GLOBALS.level = 1
-        GLOBALS.life = 100
-        GLOBALS.score = 0
-        self.__init__()
+        self.session.restart = False
+        self.session.level = self.__start_level
+        self.session.life = 100
+        self.session.score = 0
+        self.__init__(self.session, self.__start_level)
 
     def __create_level(self, level):
         self.__curr_level = level
@@ -395,13 +524,30 @@ class LevelController:
                                       life_config=self.__life_config)
 
     def execute(self) -> None:
-        if GLOBALS.restart:
+        """ runs one frame and draws it on the session screen """
+        self.simulate()
+        self.session.render_queue.flush(self.session.screen)
+
+    def simulate(self) -> None:
+        """ game logic of one frame, what it draws is left in the session
+        render queue (see {FramePipeline}) """
+        self.session.frame += 1
+        event_log = self.session.event_log
+        if self.session.restart:
+            if event_log:
+                event_log.emit(EVENT_RESTART, self.session.frame,
+                               self.session.level, score=self.session.score)
             self.__restart()
             return
         if not self.__game_level.is_game_over():
             if self.__game_level.is_level_completed():
+                if event_log:
+                    event_log.emit(EVENT_LEVEL_COMPLETED, self.session.frame,
+                                   self.__curr_level,
+                                   score=self.session.score,
+                                   life=self.session.life)
                 self.__curr_level += 1
-                GLOBALS.level = self.__curr_level
+                self.session.level = self.__curr_level
                 self.__create_level(self.__curr_level)
                 return
             # render level frame
@@ -412,14 +558,8 @@ class LevelController:
     # TODO: add test validation for file loading
     @staticmethod
     def __load_levels_file():
-        data_levels = []
-        with open('src/assets/levels.json') as f:
-            data_levels = json.load(f)
-        return data_levels
+        return ASSETS.load_json('src/assets/levels.json')
 
     @staticmethod
     def __load_life_config_file():
-        life_config = []
-        with open('src/assets/life_config.json') as f:
-            life_config = json.load(f)
-        return life_config
+        return ASSETS.load_json('src/assets/life_config.json')
@@ -0,0 +1,168 @@
+"""
+Thin client of the game server, it sends the keyboard input and draws the
+received entities with the game sprites. Usage:
+    python -m src.network.client --port 5555
+"""
+import argparse
+import socket
+from typing import Dict
+
+import pygame
+
+from src.globals import GameAssets
+from src.input_system import InputSnapshot, KeyboardInput
+from src.network.protocol import (
+    INPUT_MESSAGE,
+    KIND_BASIC,
+    KIND_ENEMY_BULLET,
+    KIND_EXPLOSION,
+    KIND_PLAYER,
+    KIND_PLAYER_BULLET,
+    KIND_SHOOTER,
+    KIND_SNIPER,
+    KIND_SNIPER_BULLET,
+    LENGTH,
+    decode_tick,
+)
+
+ASSETS = GameAssets()
+
+
+class GameClient:
+    """ Connects to a {GameServer}, sends the input and keeps a copy of the
+    entities of the last received tick """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 5555):
+        self.sock = socket.create_connection((host, port))
+        self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.sock.setblocking(False)
+        self.entities: Dict[int, list] = {}
+        self.hud = (1, 0, 100)
+        self.tick = -1
+        self.bytes_received = 0
+        self.__incoming = bytearray()
+        self.__last_actions = None
+
+    def send_input(self, snapshot: InputSnapshot) -> None:
+        """ only changes are sent """
+        if snapshot.actions == self.__last_actions:
+            return
+        self.__last_actions = snapshot.actions
+        self.sock.sendall(INPUT_MESSAGE.pack(b"I", snapshot.actions))
+
+    def receive(self) -> int:
+        """ apply all the ticks received, never blocks
+        :return: number of ticks applied """
+        while True:
+            try:
+                data = self.sock.recv(65536)
+            except BlockingIOError:
+                break
+            if not data:
+                raise ConnectionError("GameClient: server closed")
+            self.__incoming += data
+            self.bytes_received += len(data)
+        applied = 0
+        while len(self.__incoming) >= LENGTH.size:
+            size, = LENGTH.unpack_from(self.__incoming)
+            if len(self.__incoming) < LENGTH.size + size:
+                break
+            payload = bytes(self.__incoming[LENGTH.size:LENGTH.size + size])
+            del self.__incoming[:LENGTH.size + size]
+            self.tick, self.hud = decode_tick(payload, self.entities)
+            applied += 1
+        return applied
+
+    def close(self) -> None:
+        self.sock.close()
+
+
+class ClientRenderer:
+    """ draws the client entities with the game sprites """
+
+    def __init__(self, screen: pygame.Surface):
+        self.screen = screen
+        player_bullet = pygame.Surface((6, 10))
+        player_bullet.fill((255, 255, 0))
+        enemy_bullet = pygame.Surface((5, 8))
+        enemy_bullet.fill("green")
+        sniper_bullet = pygame.Surface((8, 8))
+        sniper_bullet.fill("green")
+        # copy, the alpha changes with the blink
+        self.player = ASSETS.image("Player.png", (48, 48)).copy()
+        self.sprites = {
+            KIND_PLAYER: self.player,
+            KIND_PLAYER_BULLET: player_bullet,
+            KIND_BASIC: ASSETS.image("EnemyBasic.png", (48, 48)),
+            KIND_SHOOTER: ASSETS.image("Shooter.png", (48, 48)),
+            KIND_SNIPER: ASSETS.image("Sniper.png", (48, 48)),
+            KIND_ENEMY_BULLET: enemy_bullet,
+            KIND_SNIPER_BULLET: sniper_bullet,
+        }
+        self.explosion = ASSETS.frames("hit-particle.png", (48, 240),
+                                       (48, 48))
+        self.bg = ASSETS.image("bg.png", alpha=False)
+        self.scroll = 0
+
+    def render(self, client: GameClient) -> None:
+        self.screen.fill("black")
+        height = self.bg.get_height()
+        for i in range(0, 1200 // height + 2):
+            self.screen.blit(self.bg, (0, height * i + self.scroll))
+        self.scroll = (self.scroll - 1) % -1200
+        for kind, x, y, extra in client.entities.values():
+            if kind == KIND_EXPLOSION:
+                image = self.explosion[min(extra, len(self.explosion) - 1)]
+            else:
+                image = self.sprites[kind]
+                if kind == KIND_PLAYER:
+                    image.set_alpha(extra)
+            self.screen.blit(image, (x, y))
+        level, score, life = client.hud
+        fonts = ASSETS.game_fonts
+        fonts.base.render_to(self.screen, (10, 10), f"Level: {level}",
+                             (255, 255, 255))
+        fonts.base.render_to(self.screen, (260, 10), f"Score: {score}",
+                             (255, 255, 255))
+        fonts.base.render_to(self.screen, (520, 10), f"Life: {life}",
+                             (255, 255, 255))
+        if life <= 0:
+            fonts.title.render_to(self.screen, (230, 280), "GAME OVER",
+                                  (255, 100, 100))
+
+
+def run_client(host: str, port: int) -> None:
+    """ window that plays on a remote server """
+    pygame.init()
+    pygame.display.set_caption("Da2 Space invaders (client)")
+    screen = pygame.display.set_mode((600, 600))
+    ASSETS.load_fonts()
+    client = GameClient(host, port)
+    renderer = ClientRenderer(screen)
+    keyboard = KeyboardInput()
+    keyboard.setup()
+    clock = pygame.time.Clock()
+    running = True
+    while running:
+        for event in keyboard.begin_frame():
+            if event.type == pygame.QUIT:
+                running = False
+        client.send_input(keyboard.snapshot)
+        client.receive()
+        renderer.render(client)
+        pygame.display.flip()
+        clock.tick(60)
+    client.close()
+    pygame.quit()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Game client")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=5555)
+    args = parser.parse_args()
+    run_client(args.host, args.port)
+
+
+if __name__ == "__main__":
+    main()
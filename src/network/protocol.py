@@ -0,0 +1,112 @@
+import struct
+from typing import Dict
+
+# entity kinds on the wire
+KIND_PLAYER = 0
+KIND_PLAYER_BULLET = 1
+KIND_BASIC = 2
+KIND_SHOOTER = 3
+KIND_SNIPER = 4
+KIND_ENEMY_BULLET = 5
+KIND_SNIPER_BULLET = 6
+KIND_EXPLOSION = 7
+
+# entity record flags
+FLAG_NEW = 1  # kind, x, y and extra follow
+FLAG_MOVE_SMALL = 2  # dx, dy as int8
+FLAG_MOVE = 4  # x, y as int16
+FLAG_EXTRA = 8  # extra as int16 (life, alpha or frame)
+
+# messages: length (uint32) + payload
+LENGTH = struct.Struct("<I")
+# tick, level, score, life, updated entities, removed entities
+TICK_HEADER = struct.Struct("<IHiiHH")
+ENTITY_HEADER = struct.Struct("<HB")
+ENTITY_NEW = struct.Struct("<Bhhh")
+MOVE_SMALL = struct.Struct("<bb")
+MOVE = struct.Struct("<hh")
+EXTRA = struct.Struct("<h")
+REMOVED = struct.Struct("<H")
+# client -> server input message
+INPUT_MESSAGE = struct.Struct("<cB")
+
+
+def encode_tick(tick: int, hud: tuple, previous: Dict[int, tuple],
+                current: Dict[int, tuple]) -> bytes:
+    """
+    Delta compress the entity state of a tick
+    :param tick: tick number
+    :param hud: (level, score, life)
+    :param previous: entity id -> (kind, x, y, extra) the client already has,
+    empty to send the full state
+    :param current: entity id -> (kind, x, y, extra) of this tick
+    :return: message payload
+    """
+    records = []
+    updated = 0
+    for entity_id, state in current.items():
+        old = previous.get(entity_id)
+        if old == state:
+            continue
+        updated += 1
+        if old is None:
+            records.append(ENTITY_HEADER.pack(entity_id, FLAG_NEW))
+            records.append(ENTITY_NEW.pack(*state))
+            continue
+        flags = 0
+        dx = state[1] - old[1]
+        dy = state[2] - old[2]
+        if dx or dy:
+            small = -128 <= dx < 128 and -128 <= dy < 128
+            flags |= FLAG_MOVE_SMALL if small else FLAG_MOVE
+        if state[3] != old[3]:
+            flags |= FLAG_EXTRA
+        records.append(ENTITY_HEADER.pack(entity_id, flags))
+        if flags & FLAG_MOVE_SMALL:
+            records.append(MOVE_SMALL.pack(dx, dy))
+        elif flags & FLAG_MOVE:
+            records.append(MOVE.pack(state[1], state[2]))
+        if flags & FLAG_EXTRA:
+            records.append(EXTRA.pack(state[3]))
+    removed = [REMOVED.pack(entity_id) for entity_id in previous
+               if entity_id not in current]
+    header = TICK_HEADER.pack(tick, hud[0], hud[1], hud[2], updated,
+                              len(removed))
+    return b"".join([header] + records + removed)
+
+
+def decode_tick(payload: bytes, entities: Dict[int, list]) -> tuple:
+    """
+    Apply a tick message over the entities the client has
+    :param payload: message created by {encode_tick}
+    :param entities: entity id -> [kind, x, y, extra], updated in place
+    :return: tick, (level, score, life)
+    """
+    tick, level, score, life, updated, removed = TICK_HEADER.unpack_from(
+        payload)
+    offset = TICK_HEADER.size
+    for _ in range(updated):
+        entity_id, flags = ENTITY_HEADER.unpack_from(payload, offset)
+        offset += ENTITY_HEADER.size
+        if flags & FLAG_NEW:
+            entities[entity_id] = list(ENTITY_NEW.unpack_from(payload,
+                                                              offset))
+            offset += ENTITY_NEW.size
+            continue
+        entity = entities[entity_id]
+        if flags & FLAG_MOVE_SMALL:
+            dx, dy = MOVE_SMALL.unpack_from(payload, offset)
+            entity[1] += dx
+            entity[2] += dy
+            offset += MOVE_SMALL.size
+        elif flags & FLAG_MOVE:
+            entity[1], entity[2] = MOVE.unpack_from(payload, offset)
+            offset += MOVE.size
+        if flags & FLAG_EXTRA:
+            entity[3], = EXTRA.unpack_from(payload, offset)
+            offset += EXTRA.size
+    for _ in range(removed):
+        entity_id, = REMOVED.unpack_from(payload, offset)
+        offset += REMOVED.size
+        entities.pop(entity_id, None)
+    return tick, (level, score, life)
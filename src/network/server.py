@@ -0,0 +1,233 @@
+"""
+Authoritative game server: runs the game headless at a fixed tick rate,
+reads the input of the clients and streams the entity state to them (only
+what changed since the last tick). Usage:
+    python -m src.network.server --port 5555
+"""
+import argparse
+import selectors
+import socket
+import time
+from typing import Dict, List
+
+from src.characters import enemy
+from src.headless import HeadlessGame
+from src.input_system import InputSnapshot
+from src.instrumentation import RollingStat
+from src.network.protocol import (
+    INPUT_MESSAGE,
+    KIND_BASIC,
+    KIND_ENEMY_BULLET,
+    KIND_EXPLOSION,
+    KIND_PLAYER,
+    KIND_PLAYER_BULLET,
+    KIND_SHOOTER,
+    KIND_SNIPER,
+    KIND_SNIPER_BULLET,
+    LENGTH,
+    encode_tick,
+)
+
+
+class _Peer:
+    """ socket of a client with its pending bytes to send """
+
+    def __init__(self, sock: socket.socket):
+        self.sock = sock
+        self.outgoing = bytearray()
+        self.incoming = bytearray()
+        # new clients get the full state first
+        self.needs_full = True
+
+
+class GameServer:
+    """
+    Runs a headless game at a fixed tick rate. The first connected client
+    controls the player, all the clients receive the state of each tick.
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 5555,
+                 tick_rate: int = 60, seed: int | None = None):
+        self.game = HeadlessGame(seed=seed, render=False)
+        self.tick_rate = tick_rate
+        self.delta_ms = round(1000 / tick_rate)
+        self.tick = 0
+        self.input = InputSnapshot()
+        # stats
+        self.tick_time = RollingStat()
+        self.bytes_per_tick = RollingStat()
+        self.__selector = selectors.DefaultSelector()
+        self.__listener = socket.create_server((host, port))
+        self.__listener.setblocking(False)
+        self.__selector.register(self.__listener, selectors.EVENT_READ)
+        self.address = self.__listener.getsockname()
+        self.peers: List[_Peer] = []
+        # sprite -> small int id, ids are not reused while the game runs
+        self.__ids: Dict[object, int] = {}
+        self.__next_id = 0
+        self.state: Dict[int, tuple] = {}
+
+    def __entity_id(self, sprite) -> int:
+        entity_id = self.__ids.get(sprite)
+        if entity_id is None:
+            entity_id = self.__next_id
+            self.__next_id = (self.__next_id + 1) % 0xFFFF
+            self.__ids[sprite] = entity_id
+        return entity_id
+
+    @staticmethod
+    def entity_kind(sprite) -> int:
+        if sprite.tag == "player":
+            return KIND_PLAYER
+        if sprite.tag == "bullet":
+            return KIND_PLAYER_BULLET
+        if isinstance(sprite, enemy.SniperBullet):
+            return KIND_SNIPER_BULLET
+        if sprite.tag == "enemy_bullet":
+            return KIND_ENEMY_BULLET
+        return {2: KIND_SHOOTER, 3: KIND_SNIPER}.get(sprite.type, KIND_BASIC)
+
+    def collect_state(self) -> Dict[int, tuple]:
+        """ entity id -> (kind, x, y, extra) of the current game """
+        game_level = self.game.level_controller.game_level
+        state = {}
+        alive = {}
+        for sprite in game_level.player_controller.playerGroup.spritedict:
+            extra = (sprite.image.get_alpha() or 255
+                     if sprite.tag == "player" else 0)
+            alive[sprite] = self.__entity_id(sprite)
+            state[alive[sprite]] = (self.entity_kind(sprite), sprite.rect.x,
+                                    sprite.rect.y, extra)
+        for sprite in game_level.enemy_army.enemiesGroup.spritedict:
+            alive[sprite] = self.__entity_id(sprite)
+            state[alive[sprite]] = (self.entity_kind(sprite), sprite.rect.x,
+                                    sprite.rect.y, int(sprite.life))
+        for sprite in game_level.hit_controller.explosion_group.spritedict:
+            alive[sprite] = self.__entity_id(sprite)
+            state[alive[sprite]] = (KIND_EXPLOSION, sprite.rect.x,
+                                    sprite.rect.y, sprite.frame_idx)
+        # forget the sprites that are gone (also after a restart)
+        self.__ids = alive
+        return state
+
+    def poll_network(self) -> None:
+        """ accept new clients and read their input, never blocks """
+        for key, _ in self.__selector.select(timeout=0):
+            if key.fileobj is self.__listener:
+                sock, _ = self.__listener.accept()
+                sock.setblocking(False)
+                sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+                peer = _Peer(sock)
+                self.peers.append(peer)
+                self.__selector.register(sock, selectors.EVENT_READ, peer)
+                continue
+            peer: _Peer = key.data
+            try:
+                data = peer.sock.recv(4096)
+            except (BlockingIOError, ConnectionError):
+                data = None
+            if not data:
+                if data is not None or peer.sock.fileno() < 0:
+                    self.__drop(peer)
+                continue
+            peer.incoming += data
+            size = INPUT_MESSAGE.size
+            while len(peer.incoming) >= size:
+                kind, actions = INPUT_MESSAGE.unpack_from(peer.incoming)
+                del peer.incoming[:size]
+                # only the first client plays
+                if kind == b"I" and peer is self.peers[0]:
+                    self.input = InputSnapshot(actions)
+
+    def __drop(self, peer: _Peer) -> None:
+        self.__selector.unregister(peer.sock)
+        peer.sock.close()
+        self.peers.remove(peer)
+
+    def __send(self, peer: _Peer, payload: bytes) -> int:
+        peer.outgoing += LENGTH.pack(len(payload)) + payload
+        try:
+            sent = peer.sock.send(peer.outgoing)
+            del peer.outgoing[:sent]
+        except BlockingIOError:
+            pass
+        except ConnectionError:
+            self.__drop(peer)
+        return LENGTH.size + len(payload)
+
+    def step(self) -> None:
+        """ one server tick: input, simulation and broadcast """
+        start = time.perf_counter()
+        self.poll_network()
+        self.game.step(self.input, self.delta_ms)
+        session = self.game.session
+        hud = (session.level, session.score, session.life)
+        current = self.collect_state()
+        delta = None
+        full = None
+        sent = 0
+        for peer in list(self.peers):
+            if peer.needs_full:
+                full = full or encode_tick(self.tick, hud, {}, current)
+                sent += self.__send(peer, full)
+                peer.needs_full = False
+            else:
+                delta = delta or encode_tick(self.tick, hud, self.state,
+                                             current)
+                sent += self.__send(peer, delta)
+        self.state = current
+        self.tick += 1
+        self.tick_time.add((time.perf_counter() - start) * 1000)
+        if self.peers:
+            self.bytes_per_tick.add(sent / len(self.peers))
+
+    def serve(self, ticks: int | None = None, report_every: int = 300):
+        """ run the fixed rate loop, forever or the number of ticks """
+        tick_length = 1 / self.tick_rate
+        next_tick = time.perf_counter()
+        while ticks is None or self.tick < ticks:
+            self.step()
+            if report_every and self.tick % report_every == 0:
+                print(self.report())
+            next_tick += tick_length
+            wait = next_tick - time.perf_counter()
+            if wait > 0:
+                time.sleep(wait)
+            else:
+                # we are late, don't try to catch up all the lost ticks
+                next_tick = time.perf_counter()
+
+    def report(self) -> str:
+        return (f"tick {self.tick} | clients: {len(self.peers)} | "
+                f"tick time {self.tick_time} | bytes per tick: "
+                f"avg {self.bytes_per_tick.average():.0f} "
+                f"max {self.bytes_per_tick.maximum():.0f}")
+
+    def close(self) -> None:
+        for peer in list(self.peers):
+            self.__drop(peer)
+        self.__selector.close()
+        self.__listener.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless game server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=5555)
+    parser.add_argument("--tick-rate", type=int, default=60,
+                        help="simulation ticks per second")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+    server = GameServer(args.host, args.port, args.tick_rate, args.seed)
+    print(f"server listening on {server.address}")
+    try:
+        server.serve()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        print(server.report())
+        server.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+import time
+import unittest
+
+from src.input_system import ACTION_FIRE, ACTION_LEFT, InputSnapshot
+from src.network.client import GameClient
+from src.network.protocol import decode_tick, encode_tick
+from src.network.server import GameServer
+
+
+class TestNetwork(unittest.TestCase):
+    def test_delta_encoding(self):
+        previous = {1: (2, 10, 10, 20), 2: (0, 300, 500, 255),
+                    3: (5, 40, 40, 0)}
+        current = {1: (2, 12, 9, 20), 2: (0, 300, 500, 180),
+                   4: (1, -40, 900, 0)}
+        entities = {key: list(value) for key, value in previous.items()}
+        payload = encode_tick(7, (2, 50, 80), previous, current)
+        tick, hud = decode_tick(payload, entities)
+        self.assertEqual(tick, 7)
+        self.assertEqual(hud, (2, 50, 80))
+        self.assertEqual(entities,
+                         {key: list(value) for key, value in current.items()})
+        # nothing changed: just the tick header
+        self.assertEqual(len(encode_tick(8, hud, current, current)),
+                         len(encode_tick(8, hud, {}, {})))
+
+    def test_server_client(self):
+        server = GameServer(port=0, seed=3)
+        client = GameClient(port=server.address[1])
+        try:
+            for tick in range(240):
+                client.send_input(InputSnapshot(
+                    ACTION_FIRE | (ACTION_LEFT if tick < 60 else 0)))
+                server.step()
+                # localhost: wait until the tick arrives
+                deadline = time.perf_counter() + 1
+                while (client.tick < server.tick - 1
+                       and time.perf_counter() < deadline):
+                    client.receive()
+            self.assertEqual(client.tick, server.tick - 1)
+            self.assertEqual(client.entities, {
+                key: list(value) for key, value in server.state.items()})
+            session = server.game.session
+            self.assertEqual(client.hud,
+                             (session.level, session.score, session.life))
+            # the player moved with the client input
+            self.assertLess(server.game.level_controller.game_level
+                            .player_controller.player.rect.centerx, 300)
+            self.assertGreater(server.bytes_per_tick.total_count, 0)
+        finally:
+            client.close()
+            server.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
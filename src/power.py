@@ -0,0 +1,85 @@
+"""
+Low power modes of the frame loop. The game pauses while its window is
+without focus or minimised (the simulation is frozen and the last frame
+stays on the screen) and idles on screens that don't change on their own
+(game over), the loop sleeps until an input event or the next change
+instead of drawing the same frame at 60 fps.
+"""
+import time
+
+import pygame
+
+from src.instrumentation import RollingStat
+
+# events that pause and resume the game
+PAUSE_EVENTS = (pygame.WINDOWFOCUSLOST, pygame.WINDOWMINIMIZED)
+RESUME_EVENTS = (pygame.WINDOWFOCUSGAINED, pygame.WINDOWRESTORED,
+                 pygame.KEYDOWN)
+# the window needs the last frame again
+REDRAW_EVENTS = (pygame.WINDOWEXPOSED, pygame.WINDOWRESTORED)
+
+
+class PowerManager:
+    """
+    The frame loop calls {sleep} before taking the input and gives the
+    frame events to {handle_event}, paused frames don't run the game
+    """
+
+    def __init__(self, level_controller, pause_fps: int = 4,
+                 idle: bool = True):
+        """
+        :param level_controller: tells how long its frame stays the same
+        ({LevelController.idle_ms})
+        :param pause_fps: wake up rate while paused
+        :param idle: sleep on the idle screens (needs a loop that draws the
+        frame it simulates, not the threaded one)
+        """
+        self.level_controller = level_controller
+        self.pause_fps = pause_fps
+        self.idle = idle
+        self.paused = False
+        # the last sleep ended this frame wait, its time is not game time
+        self.slept = False
+        # the window lost its pixels, the last frame needs a new flip
+        self.redraw = False
+        self.sleep_time = RollingStat()
+
+    def handle_event(self, event) -> None:
+        if event.type in PAUSE_EVENTS:
+            self.paused = True
+        elif event.type in RESUME_EVENTS:
+            self.paused = False
+        # resumed frames are drawn anyway
+        self.redraw = self.paused and (self.redraw
+                                       or event.type in REDRAW_EVENTS)
+
+    def wait_ms(self) -> int:
+        """ time the next frame can wait, 0 runs it now """
+        if self.paused:
+            return 1000 // self.pause_fps
+        if not self.idle:
+            return 0
+        # the idle screen is drawn again when it changes
+        return self.level_controller.idle_ms
+
+    def sleep(self) -> float:
+        """
+        Waits for an input event or the next change of the frame, the
+        event is left on the queue for the frame
+        :return: time asleep (ms)
+        """
+        wait = self.wait_ms()
+        self.slept = wait > 0
+        if not self.slept:
+            return 0
+        start = time.perf_counter()
+        event = pygame.event.wait(wait)
+        if event.type != pygame.NOEVENT:
+            pygame.event.post(event)
+        slept = (time.perf_counter() - start) * 1000
+        self.sleep_time.add(slept)
+        return slept
+
+    def __str__(self):
+        return (f"low power: {self.sleep_time.total_count} sleeps | "
+                f"{self.sleep_time}")
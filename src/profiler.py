@@ -0,0 +1,147 @@
+"""
+On demand profiler of the frame loop: {FrameProfiler.start} runs cProfile
+around the next N calls to a controller method (LevelController.execute)
+and writes the result named after the level and the frames:
+    level2_frames300-359.prof       pstats file (snakeviz, gprof2dot...)
+    level2_frames300-359.collapsed  collapsed stacks (flamegraph.pl,
+                                    speedscope, inferno)
+The method is only wrapped while capturing, the frame loop runs the plain
+method the rest of the time.
+"""
+import cProfile
+import os
+import pstats
+from typing import Dict, Tuple
+
+# deepest call path written to the collapsed stacks
+MAX_STACK_DEPTH = 64
+
+
+def frame_name(function: Tuple[str, int, str]) -> str:
+    """ flame graph name of a pstats function (file, line, name) """
+    file, line, name = function
+    if file == "~":
+        # built-in functions
+        return name
+    return f"{name} ({os.path.basename(file)}:{line})"
+
+
+def collapsed_stacks(stats: pstats.Stats) -> Dict[str, int]:
+    """
+    Self time (microseconds) of each call path. cProfile only keeps the
+    caller -> callee pairs, the time of a function is split between its
+    callers in proportion to the time of each caller
+    :return: "root;caller;function" -> microseconds
+    """
+    entries = stats.stats
+    callees: Dict[tuple, list] = {}
+    for function, (_, _, _, _, callers) in entries.items():
+        for caller in callers:
+            callees.setdefault(caller, []).append(function)
+    stacks: Dict[str, float] = {}
+
+    def walk(function, path: list, share: float):
+        _, _, self_time, total_time, _ = entries[function]
+        path.append(frame_name(function))
+        key = ";".join(path)
+        stacks[key] = stacks.get(key, 0) + self_time * share * 1e6
+        if len(path) < MAX_STACK_DEPTH:
+            for callee in callees.get(function, ()):
+                callee_total = entries[callee][3]
+                if not callee_total or frame_name(callee) in path:
+                    # no time or recursion
+                    continue
+                call_time = entries[callee][4][function][3]
+                walk(callee, path, share * call_time / callee_total)
+        path.pop()
+
+    for function, (_, _, _, _, callers) in entries.items():
+        if not callers:
+            walk(function, [], 1.0)
+    return {key: round(value) for key, value in stacks.items()
+            if round(value) > 0}
+
+
+class FrameProfiler:
+    """
+    Captures the next {frames} calls of {controller.method}, the frame
+    loop calls {start} (hotkey or command line) and {end_frame}
+    """
+
+    def __init__(self, controller, frames: int = 60,
+                 directory: str = "profiles", method: str = "execute"):
+        self.controller = controller
+        self.frames = frames
+        self.directory = directory
+        self.method = method
+        # files written by the last capture
+        self.last_files: Tuple[str, ...] = ()
+        self.__profile: cProfile.Profile | None = None
+        self.__calls = 0
+        self.__first_frame = 0
+        self.__first_level = 0
+
+    @property
+    def capturing(self) -> bool:
+        return self.__profile is not None
+
+    def start(self, frame: int) -> bool:
+        """
+        Profiles the next calls of the method
+        :param frame: number of the next frame (for the file names)
+        :return: False when a capture is already running
+        """
+        if self.capturing:
+            return False
+        self.__profile = cProfile.Profile()
+        self.__calls = 0
+        self.__first_frame = frame
+        self.__first_level = self.controller.session.level
+        method = getattr(self.controller, self.method)
+        profile = self.__profile
+
+        def profiled(*args, **kwargs):
+            profile.enable()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                profile.disable()
+                self.__calls += 1
+
+        # the instance attribute hides the class method while capturing
+        setattr(self.controller, self.method, profiled)
+        return True
+
+    def end_frame(self) -> Tuple[str, ...]:
+        """
+        Run it after the frame, the files are written after the last
+        profiled call
+        :return: the written files (empty while capturing)
+        """
+        if not self.capturing or self.__calls < self.frames:
+            return ()
+        return self.stop()
+
+    def stop(self) -> Tuple[str, ...]:
+        """ ends the capture and writes the files of the calls taken """
+        if not self.capturing:
+            return ()
+        delattr(self.controller, self.method)
+        profile, self.__profile = self.__profile, None
+        if not self.__calls:
+            return ()
+        level = self.controller.session.level
+        levels = (str(level) if level == self.__first_level
+                  else f"{self.__first_level}-{level}")
+        last_frame = self.__first_frame + self.__calls - 1
+        name = os.path.join(
+            self.directory,
+            f"level{levels}_frames{self.__first_frame}-{last_frame}")
+        os.makedirs(self.directory, exist_ok=True)
+        profile.dump_stats(f"{name}.prof")
+        stacks = collapsed_stacks(pstats.Stats(profile))
+        with open(f"{name}.collapsed", "w") as f:
+            for stack, time_us in sorted(stacks.items()):
+                f.write(f"{stack} {time_us}\n")
+        self.last_files = (f"{name}.prof", f"{name}.collapsed")
+        return self.last_files
@@ -0,0 +1,113 @@
+"""
+Adaptive quality of the frame loop: the optional work of a frame
+(background alpha blend, explosions, health bars, sounds) is lowered one
+step at a time while the frames go over their budget and restored when the
+frames have time left.
+"""
+from src.instrumentation import RollingStat
+
+
+class QualitySettings:
+    """ optional work of the frames, the game reads it from the session """
+
+    def __init__(self, background_alpha: bool = True,
+                 max_explosions: int | None = None,
+                 idle_health_bars: bool = True, sound_merge_ms: int = 0):
+        """
+        :param background_alpha: blend the background, False draws an
+        opaque copy (same look over the black screen, no blend)
+        :param max_explosions: explosions on screen at the same time (None
+        without limit), the hits over it don't show one
+        :param idle_health_bars: False shows just the bars of the enemies
+        out of their place (attacking or returning)
+        :param sound_merge_ms: a sound played again in less than this time
+        is skipped (0 plays all of them)
+        """
+        self.background_alpha = background_alpha
+        self.max_explosions = max_explosions
+        self.idle_health_bars = idle_health_bars
+        self.sound_merge_ms = sound_merge_ms
+
+    def __str__(self):
+        return (f"(background alpha: {self.background_alpha}, "
+                f"max explosions: {self.max_explosions}, "
+                f"idle health bars: {self.idle_health_bars}, "
+                f"sound merge: {self.sound_merge_ms}ms)")
+
+
+# from the full quality to the cheapest frame, each level drops one more
+# optional work
+QUALITY_LEVELS = (
+    QualitySettings(),
+    QualitySettings(background_alpha=False),
+    QualitySettings(background_alpha=False, max_explosions=4),
+    QualitySettings(background_alpha=False, max_explosions=4,
+                    idle_health_bars=False),
+    QualitySettings(background_alpha=False, max_explosions=4,
+                    idle_health_bars=False, sound_merge_ms=80),
+)
+FULL_QUALITY = QUALITY_LEVELS[0]
+
+
+class QualityController:
+    """
+    Watches the frame times of the main loop and sets the quality of the
+    session, one level down when the average frame time of the window is
+    near the budget and one up when it is well under it
+    """
+
+    def __init__(self, session, budget_ms: float = 1000 / 60,
+                 window: int = 60, high: float = 0.9, low: float = 0.5,
+                 cooldown: int = 120):
+        """
+        :param budget_ms: time of a frame at the target fps
+        :param window: frames of the average
+        :param high: part of the budget that lowers the quality
+        :param low: part of the budget that raises it again
+        :param cooldown: minimum frames between two changes
+        """
+        self.session = session
+        self.budget_ms = budget_ms
+        self.high = high
+        self.low = low
+        self.cooldown = cooldown
+        self.frame_time = RollingStat(window)
+        self.level = 0
+        # lowest quality used and number of changes
+        self.worst_level = 0
+        self.changes = 0
+        self.__frames_since_change = 0
+        self.session.quality = QUALITY_LEVELS[0]
+
+    def set_level(self, level: int) -> None:
+        self.level = max(0, min(level, len(QUALITY_LEVELS) - 1))
+        self.worst_level = max(self.worst_level, self.level)
+        self.session.quality = QUALITY_LEVELS[self.level]
+        self.frame_time.clear()
+        self.__frames_since_change = 0
+
+    def end_frame(self, frame_ms: float) -> bool:
+        """
+        :param frame_ms: time used by the frame (without the wait)
+        :return: True when the quality changed
+        """
+        self.frame_time.add(frame_ms)
+        self.__frames_since_change += 1
+        if (self.__frames_since_change < self.cooldown
+                or len(self.frame_time.samples)
+                < self.frame_time.samples.maxlen):
+            return False
+        average = self.frame_time.average()
+        if (average > self.budget_ms * self.high
+                and self.level < len(QUALITY_LEVELS) - 1):
+            self.set_level(self.level + 1)
+        elif average < self.budget_ms * self.low and self.level > 0:
+            self.set_level(self.level - 1)
+        else:
+            return False
+        self.changes += 1
+        return True
+
+    def __str__(self):
+        return (f"quality level: {self.level} (worst {self.worst_level}, "
+                f"{self.changes} changes) {self.session.quality}")
@@ -0,0 +1,109 @@
+"""
+Draw list of a frame: the game adds what it wants to draw while it updates
+and the queue draws everything at the end of the frame, one
+{Surface.blits} call per layer instead of one blit per sprite.
+"""
+from typing import Dict, List
+
+import pygame
+
+# layers are drawn from the lowest to the highest
+LAYER_BACKGROUND = 0
+LAYER_PLAYER = 1
+LAYER_HEALTH_BARS = 2
+LAYER_ENEMIES = 3
+LAYER_EFFECTS = 4
+LAYER_UI = 5
+
+
+class RenderQueue:
+    """
+    Surfaces (and color fills) to draw on this frame grouped by layer. The
+    destination rects are read when the queue is flushed, so sprites can be
+    added before they finish moving on the frame.
+    """
+
+    def __init__(self):
+        self.__blits: Dict[int, List[tuple]] = {}
+        self.__fills: Dict[int, List[tuple]] = {}
+        # optional renderer of the layers (see {BandRenderer}), None draws
+        # them here
+        self.renderer = None
+        # draw calls and items of the last flush
+        self.draw_calls = 0
+        self.items = 0
+
+    def __len__(self):
+        return (sum(len(items) for items in self.__blits.values())
+                + sum(len(items) for items in self.__fills.values()))
+
+    def add(self, layer: int, surface: pygame.Surface, dest) -> None:
+        """
+        :param layer: draw order, see the LAYER_ constants
+        :param surface: image to draw
+        :param dest: position or rect of the image top left
+        """
+        items = self.__blits.get(layer)
+        if items is None:
+            items = self.__blits[layer] = []
+        items.append((surface, dest))
+
+    def add_group(self, layer: int, group: pygame.sprite.Group) -> None:
+        """ all the sprites of a group with their image and rect """
+        items = self.__blits.get(layer)
+        if items is None:
+            items = self.__blits[layer] = []
+        items.extend((sprite.image, sprite.rect) for sprite in group)
+
+    def fill(self, layer: int, color, rect) -> None:
+        """ solid rect (health bars), drawn after the surfaces of its
+        layer """
+        items = self.__fills.get(layer)
+        if items is None:
+            items = self.__fills[layer] = []
+        items.append((color, rect))
+
+    def freeze(self) -> None:
+        """ takes the current position of the queued rects, the queue can
+        be drawn later (on another thread) while the sprites move """
+        for items in self.__blits.values():
+            items[:] = [(surface, (dest[0], dest[1]))
+                        for surface, dest in items]
+
+    def flush(self, target: pygame.Surface) -> None:
+        """ draws the queue on the target and empties it """
+        if self.renderer:
+            layers = [(self.__blits.get(layer, ()),
+                       self.__fills.get(layer, ()))
+                      for layer in sorted(self.__blits.keys()
+                                          | self.__fills.keys())]
+            self.renderer.draw(layers, target)
+            self.draw_calls = len(layers)
+            self.items = len(self)
+            self.clear()
+            return
+        draw_calls = 0
+        items_count = 0
+        for layer in sorted(self.__blits.keys() | self.__fills.keys()):
+            blits = self.__blits.get(layer)
+            if blits:
+                target.blits(blits, doreturn=False)
+                draw_calls += 1
+                items_count += len(blits)
+                blits.clear()
+            fills = self.__fills.get(layer)
+            if fills:
+                for color, rect in fills:
+                    target.fill(color, rect)
+                draw_calls += len(fills)
+                items_count += len(fills)
+                fills.clear()
+        self.draw_calls = draw_calls
+        self.items = items_count
+
+    def clear(self) -> None:
+        """ drops the queued items without drawing them """
+        for items in self.__blits.values():
+            items.clear()
+        for items in self.__fills.values():
+            items.clear()
@@ -0,0 +1,180 @@
+"""
+Soak test: plays many levels and restarts headless and checks that the
+memory doesn't grow between them. A tracemalloc snapshot is taken at every
+level transition, the report shows the growth by allocation site and the
+run fails when the memory or the leaked sprites keep rising.
+    python -m src.soak --cycles 20 --levels 3
+"""
+import argparse
+import gc
+import sys
+import tracemalloc
+from typing import List
+
+import pygame
+
+from src.difficulty import BotPolicy
+from src.environment import GameEnv
+
+
+def count_leaked_sprites(env: GameEnv) -> int:
+    """ sprites alive that are not part of the current level """
+    game_level = env.level_controller.game_level
+    current = set(game_level.enemy_army.enemiesGroup.sprites())
+    current.update(game_level.player_controller.playerGroup.sprites())
+    current.update(game_level.hit_controller.explosion_group.sprites())
+    current.update(game_level.enemy_controller.enemy_list)
+    gc.collect()
+    return sum(1 for item in gc.get_objects()
+               if isinstance(item, pygame.sprite.Sprite)
+               and item not in current)
+
+
+def clear_level(env: GameEnv) -> None:
+    """ kills the enemies left, the transition runs on the next frame (in a
+    function: a loop variable would keep the last enemy alive) """
+    for sprite in (env.level_controller.game_level
+                   .enemy_army.enemiesGroup.sprites()):
+        sprite.kill()
+
+
+def is_growing(values: List[float], tolerance: float = 0) -> bool:
+    """ True when every value of the second half is over all the values of
+    the first half (plus the tolerance), a steady growth """
+    if len(values) < 4:
+        return False
+    half = len(values) // 2
+    return min(values[half:]) > max(values[:half]) + tolerance
+
+
+class SoakReport:
+    """ samples of each transition and the growth between them """
+
+    def __init__(self):
+        # one per transition: kind ("level" or "restart"), level, frame,
+        # traced bytes and leaked sprites
+        self.samples: List[dict] = []
+        # biggest growths by allocation site (first to last restart)
+        self.growth: List[str] = []
+        self.failures: List[str] = []
+
+    @property
+    def passed(self) -> bool:
+        return not self.failures
+
+    def __str__(self):
+        lines = ["kind    | level | frame   | traced KB | leaked sprites"]
+        for sample in self.samples:
+            lines.append(f"{sample['kind']:<7} | {sample['level']:>5} | "
+                         f"{sample['frame']:>7} | "
+                         f"{sample['traced'] / 1024:>9.1f} | "
+                         f"{sample['leaked_sprites']:>5}")
+        if self.growth:
+            lines.append("growth by allocation site:")
+            lines.extend(f"  {line}" for line in self.growth)
+        lines.append("PASSED" if self.passed
+                     else "FAILED: " + "; ".join(self.failures))
+        return "\n".join(lines)
+
+
+def soak(cycles: int = 10, levels: int = 3, level_frames: int = 600,
+         seed: int = 0, warmup: int = 2, memory_tolerance: int = 64 * 1024,
+         top: int = 10) -> SoakReport:
+    """
+    Plays {cycles} games of {levels} levels with the bot, each level is
+    cleared after {level_frames} frames (the enemies left are killed) and
+    the game is restarted after the last level of the cycle
+    :param warmup: first restarts left out of the growth check (caches)
+    :param memory_tolerance: bytes the memory can change between restarts
+    :param top: allocation sites on the growth report
+    """
+    report = SoakReport()
+    env = GameEnv(max_frames=sys.maxsize)
+    obs = env.reset(seed=seed)
+    bot = BotPolicy(seed)
+    tracemalloc.start()
+    restarts: List[tracemalloc.Snapshot] = []
+    restart_samples: List[dict] = []
+    level_start = 0
+    last_level = env.session.level
+    restart_pending = False
+    cycle_levels = 0
+    try:
+        while len(restart_samples) < cycles:
+            obs, _, _, _ = env.step(bot.act(obs))
+            session = env.session
+            frame = env.game.frame
+            kind = None
+            if restart_pending and not session.restart:
+                # the controller took the restart on this frame
+                kind = "restart"
+                cycle_levels = 0
+            elif session.level != last_level:
+                kind = "level"
+                cycle_levels += 1
+            elif frame - level_start >= level_frames:
+                clear_level(env)
+            if (cycle_levels >= levels
+                    or env.level_controller.is_completed):
+                session.restart = True
+            # game over restarts come from the bot fire button
+            restart_pending = session.restart
+            last_level = session.level
+            if not kind:
+                continue
+            level_start = frame
+            # the soak samples and tracemalloc itself are left out
+            snapshot = tracemalloc.take_snapshot().filter_traces((
+                tracemalloc.Filter(False, tracemalloc.__file__),
+                tracemalloc.Filter(False, __file__)))
+            sample = {
+                "kind": kind,
+                "level": session.level,
+                "frame": frame,
+                "traced": sum(stat.size for stat
+                              in snapshot.statistics("filename")),
+                "leaked_sprites": count_leaked_sprites(env),
+            }
+            report.samples.append(sample)
+            if kind == "restart":
+                restarts.append(snapshot)
+                restart_samples.append(sample)
+    finally:
+        tracemalloc.stop()
+    checked = restart_samples[warmup:]
+    if len(restarts) > warmup + 1:
+        stats = restarts[-1].compare_to(restarts[warmup], "lineno")
+        report.growth = [str(stat) for stat in stats[:top]
+                         if stat.size_diff > 0]
+    if is_growing([sample["traced"] for sample in checked],
+                  memory_tolerance):
+        report.failures.append("memory keeps growing between restarts")
+    if is_growing([sample["leaked_sprites"] for sample in checked]):
+        report.failures.append("leaked sprites keep growing")
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Play many levels and restarts looking for leaks")
+    parser.add_argument("--cycles", type=int, default=10,
+                        help="games (restarts) to play")
+    parser.add_argument("--levels", type=int, default=3,
+                        help="levels per game")
+    parser.add_argument("--level-frames", type=int, default=600,
+                        help="frames before a level is cleared")
+    parser.add_argument("--seed", type=int, default=0,
+                        help="game and bot seed")
+    parser.add_argument("--warmup", type=int, default=2,
+                        help="first restarts left out of the check")
+    parser.add_argument("--tolerance-kb", type=int, default=64,
+                        help="memory change allowed between restarts")
+    args = parser.parse_args()
+    report = soak(args.cycles, args.levels, args.level_frames, args.seed,
+                  args.warmup, args.tolerance_kb * 1024)
+    print(report)
+    sys.exit(0 if report.passed else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,4 @@
-from typing import List
+from typing import Dict, List
 
 import pygame
 
@@ -14,7 +14,7 @@ class SoundItem:
 
 
 class SoundController:
-    """ we need to save this into GLOBALS """
+    """ shared by all the sessions, it lives on GameAssets """
 
     def __init__(self):
         self.sounds_dir = "src/assets/sounds/"
@@ -36,3 +36,36 @@ class SoundController:
 
     def stop(self):
         pygame.mixer.stop()
+
+
+class MergedSoundController:
+    """
+    Plays through a controller but skips a sound played again before
+    {merge_ms}, a burst of the same sound is heard once (reduced quality)
+    """
+
+    def __init__(self, controller: SoundController, merge_ms: int):
+        self.controller = controller
+        self.merge_ms = merge_ms
+        self.__last_play: Dict[str, int] = {}
+
+    def play(self, name):
+        now = pygame.time.get_ticks()
+        last = self.__last_play.get(name)
+        if last is not None and now - last < self.merge_ms:
+            return
+        self.__last_play[name] = now
+        self.controller.play(name)
+
+    def stop(self):
+        self.controller.stop()
+
+
+class MutedSoundController(SoundController):
+    """ used by the sessions without audio (headless games, servers) """
+
+    def play(self, name):
+        pass
+
+    def stop(self):
+        pass
@@ -0,0 +1,101 @@
+"""
+Pixel memory accounting: the surfaces made by the asset layer are tagged
+with the subsystem that owns them, the registry keeps the current and peak
+bytes of each owner while the surfaces are alive.
+"""
+import threading
+import weakref
+from typing import Dict
+
+import pygame
+
+# owners of the game surfaces
+OWNER_BACKGROUND = "background"
+OWNER_PLAYER = "player"
+OWNER_BULLETS = "bullets"
+OWNER_PARTICLES = "particles"
+OWNER_CAMEO = "cameo"
+OWNER_UI = "ui"
+OWNER_VARIANTS = "variants"
+OWNER_CAPTURE = "capture"
+
+
+def enemy_owner(enemy_type: str) -> str:
+    """ owner of the surfaces of an enemy type (basic, shooter...) """
+    return f"enemy.{enemy_type}"
+
+
+def format_snapshot(snapshot: Dict[str, dict]) -> str:
+    """ table of a {SurfaceRegistry.snapshot} """
+    lines = ["surfaces       | count | current KB | peak KB"]
+    for owner, item in snapshot.items():
+        lines.append(f"{owner:<14} | {item['surfaces']:>5} | "
+                     f"{item['current'] / 1024:>10.1f} | "
+                     f"{item['peak'] / 1024:>7.1f}")
+    total = sum(item["current"] for item in snapshot.values())
+    lines.append(f"total {total / 1024:.1f} KB")
+    return "\n".join(lines)
+
+
+class SurfaceRegistry:
+    """
+    Bytes of pixels by owner. A registered surface counts until it is
+    garbage collected, subsurfaces use the pixels of their parent and count
+    as zero bytes.
+    """
+
+    def __init__(self):
+        self.current: Dict[str, int] = {}
+        self.peak: Dict[str, int] = {}
+        self.count: Dict[str, int] = {}
+        self.__owners: "weakref.WeakKeyDictionary[pygame.Surface, str]" = (
+            weakref.WeakKeyDictionary())
+        # surfaces are released by the collector, maybe on another thread
+        self.__lock = threading.Lock()
+
+    @staticmethod
+    def surface_bytes(surface: pygame.Surface) -> int:
+        if surface.get_parent() is not None:
+            return 0
+        return surface.get_pitch() * surface.get_height()
+
+    def register(self, surface: pygame.Surface,
+                 owner: str) -> pygame.Surface:
+        """
+        Counts the surface on the owner until it is released
+        :return: the same surface
+        """
+        if surface in self.__owners:
+            return surface
+        size = self.surface_bytes(surface)
+        with self.__lock:
+            self.__owners[surface] = owner
+            current = self.current.get(owner, 0) + size
+            self.current[owner] = current
+            self.count[owner] = self.count.get(owner, 0) + 1
+            if current > self.peak.get(owner, 0):
+                self.peak[owner] = current
+        weakref.finalize(surface, self.__release, owner, size)
+        return surface
+
+    def __release(self, owner: str, size: int) -> None:
+        with self.__lock:
+            self.current[owner] -= size
+            self.count[owner] -= 1
+
+    def owner_of(self, surface: pygame.Surface) -> str | None:
+        return self.__owners.get(surface)
+
+    def total(self) -> int:
+        return sum(self.current.values())
+
+    def snapshot(self) -> Dict[str, dict]:
+        """ owner -> current bytes, peak bytes and surfaces """
+        with self.__lock:
+            return {owner: {"current": self.current[owner],
+                            "peak": self.peak.get(owner, 0),
+                            "surfaces": self.count[owner]}
+                    for owner in sorted(self.current)}
+
+    def report(self) -> str:
+        return format_snapshot(self.snapshot())
@@ -0,0 +1,40 @@
+import random
+import unittest
+
+import pygame
+
+from src.band_renderer import BandRenderer
+from src.render_queue import LAYER_BACKGROUND, LAYER_UI, RenderQueue
+
+
+class BandRendererTest(unittest.TestCase):
+    def fill_queue(self, queue: RenderQueue, seed: int) -> None:
+        rng = random.Random(seed)
+        for _ in range(60):
+            image = pygame.Surface((rng.randint(1, 40), rng.randint(1, 40)))
+            image.fill((rng.randint(0, 255), rng.randint(0, 255), 0))
+            queue.add(rng.choice((LAYER_BACKGROUND, LAYER_UI)), image,
+                      (rng.randint(-20, 110), rng.randint(-20, 110)))
+        for _ in range(10):
+            queue.fill(LAYER_UI, (0, 0, 255),
+                       (rng.randint(0, 90), rng.randint(0, 90),
+                        rng.random() * 20, 4))
+
+    def test_same_frame(self):
+        single = pygame.Surface((100, 100))
+        banded = pygame.Surface((100, 100))
+        queue = RenderQueue()
+        self.fill_queue(queue, 7)
+        queue.flush(single)
+        renderer = BandRenderer(bands=3)
+        queue.renderer = renderer
+        self.fill_queue(queue, 7)
+        queue.flush(banded)
+        renderer.close()
+        self.assertEqual(pygame.image.tobytes(single, "RGB"),
+                         pygame.image.tobytes(banded, "RGB"))
+        self.assertEqual(len(queue), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,49 @@
+import os
+import tempfile
+import unittest
+
+from src import benchmark
+
+
+class BenchmarkTest(unittest.TestCase):
+    def test_compare(self):
+        baseline = {"a": 10.0, "b": 10.0, "c": 10.0}
+        results = {"a": 11.9, "b": 12.1, "c": 5.0, "new": 100.0}
+        self.assertEqual(benchmark.compare(results, baseline, 0.2), ["b"])
+        self.assertEqual(benchmark.compare(results, {}), [])
+
+    def test_measure_excludes_setup(self):
+        calls = []
+        bench = benchmark.Benchmark("setup", lambda: calls.append(1) or [],
+                                    lambda items: items.append(1),
+                                    number=10, per_call=True)
+        self.assertGreater(bench.measure(repeat=2), 0)
+        # one setup per call
+        self.assertEqual(len(calls), 20)
+
+    def test_repeats_start_from_the_setup(self):
+        states = []
+        bench = benchmark.Benchmark("state",
+                                    lambda: states.append([]) or states[-1],
+                                    lambda items: items.append(1),
+                                    number=10)
+        bench.measure(repeat=3)
+        # each repeat runs on a new state
+        self.assertEqual([len(items) for items in states], [10, 10, 10])
+
+    def test_baseline_file(self):
+        file = os.path.join(tempfile.mkdtemp(), "bench.json")
+        self.assertEqual(benchmark.load_baseline(file), {})
+        report = benchmark.run(["animation.get_frame_by_time"], repeat=1)
+        benchmark.save_baseline(report, file)
+        baseline = benchmark.load_baseline(file)
+        self.assertEqual(list(baseline), ["animation.get_frame_by_time"])
+        self.assertIn("surfaces", report)
+        text = benchmark.format_report(report["results"], {}, [],
+                                       report["surfaces"])
+        self.assertIn("peak KB", text)
+        os.remove(file)
+
+
+if __name__ == '__main__':
+    unittest.main()
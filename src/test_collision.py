@@ -0,0 +1,85 @@
+import unittest
+
+import pygame
+
+from src.collision import (
+    get_mask,
+    projectile_collides,
+    sprites_collide,
+    sweep_segment_rect,
+)
+
+
+def make_sprite(image: pygame.Surface, x: int, y: int):
+    sprite = pygame.sprite.Sprite()
+    sprite.image = image
+    sprite.rect = image.get_rect(topleft=(x, y))
+    return sprite
+
+
+class Projectile(pygame.sprite.Sprite):
+    """ sprite that moved from start to end on the last frame """
+
+    def __init__(self, image: pygame.Surface, start: tuple, end: tuple):
+        super().__init__()
+        self.image = image
+        self.rect = image.get_rect(center=end)
+        self.start = start
+        self.end = end
+
+    def path(self) -> tuple:
+        return self.start + self.end
+
+
+class TestCollision(unittest.TestCase):
+    def setUp(self):
+        # 20x20 transparent image with a 4x4 solid square in the middle
+        self.ship = pygame.Surface((20, 20), pygame.SRCALPHA)
+        self.ship.fill((255, 255, 255), (8, 8, 4, 4))
+        self.bullet = pygame.Surface((4, 4))
+
+    def test_transparent_pixels_dont_hit(self):
+        ship = make_sprite(self.ship, 0, 0)
+        corner = make_sprite(self.bullet, 0, 0)
+        center = make_sprite(self.bullet, 9, 9)
+        away = make_sprite(self.bullet, 30, 30)
+        self.assertFalse(sprites_collide(corner, ship))
+        self.assertTrue(sprites_collide(corner, ship, pixel_perfect=False))
+        self.assertTrue(sprites_collide(center, ship))
+        self.assertTrue(sprites_collide(ship, center))
+        self.assertFalse(sprites_collide(away, ship, pixel_perfect=False))
+
+    def test_sweep(self):
+        rect = pygame.Rect(10, 10, 4, 4)
+        # crosses the rect in the middle of the movement
+        self.assertAlmostEqual(
+            sweep_segment_rect((12, 0), (12, 40), (1, 1), rect), 0.225)
+        # already touching
+        self.assertEqual(
+            sweep_segment_rect((12, 12), (12, 12), (1, 1), rect), 0)
+        # passes next to it
+        self.assertIsNone(
+            sweep_segment_rect((20, 0), (20, 40), (1, 1), rect))
+        # stops before it
+        self.assertIsNone(
+            sweep_segment_rect((12, 0), (12, 5), (1, 1), rect))
+
+    def test_fast_projectile_dont_tunnel(self):
+        ship = make_sprite(self.ship, 0, 0)
+        # jumps over the ship in one frame, rects never overlap
+        bullet = Projectile(self.bullet, (10, 40), (10, -20))
+        self.assertFalse(sprites_collide(bullet, ship))
+        self.assertTrue(projectile_collides(bullet, ship))
+        # the path crosses only transparent pixels
+        bullet = Projectile(self.bullet, (2, 40), (2, -20))
+        self.assertTrue(projectile_collides(bullet, ship,
+                                            pixel_perfect=False))
+        self.assertFalse(projectile_collides(bullet, ship))
+
+    def test_mask_cache(self):
+        self.assertIs(get_mask(self.ship), get_mask(self.ship))
+        self.assertEqual(get_mask(self.ship).count(), 16)
+
+
+if __name__ == '__main__':
+    unittest.main()
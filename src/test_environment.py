@@ -0,0 +1,74 @@
+import unittest
+
+import numpy as np
+
+from src.difficulty import (
+    format_report,
+    parse_levels,
+    play_games,
+    summarize,
+)
+from src.environment import GameEnv, VectorEnv
+from src.input_system import ACTION_FIRE, ACTION_LEFT
+
+
+class TestEnvironment(unittest.TestCase):
+    def test_env_step(self):
+        env = GameEnv(max_frames=120)
+        obs = env.reset(seed=7)
+        # level 1 has a row of 8 basic enemies
+        self.assertEqual(obs["enemy_count"][0], 8)
+        self.assertEqual(obs["player"][2], 100)
+        done = False
+        frames = 0
+        while not done:
+            obs, reward, done, info = env.step(ACTION_FIRE | ACTION_LEFT)
+            frames += 1
+        self.assertEqual(frames, 120)
+        self.assertEqual(info["frame"], 120)
+        self.assertTrue(obs["bullet_count"][0] > 0 or info["score"] > 0)
+
+    def test_env_same_seed(self):
+        env = GameEnv()
+        results = []
+        for _ in range(2):
+            env.reset(seed=11, level=3)
+            for _ in range(200):
+                obs, _, _, _ = env.step(ACTION_FIRE)
+            results.append(obs["enemies"].copy())
+        np.testing.assert_array_equal(results[0], results[1])
+
+    def test_vector_env(self):
+        with VectorEnv(2, max_frames=50) as venv:
+            obs = venv.reset(seeds=[1, 2])
+            self.assertEqual(obs["enemies"].shape,
+                             (2, GameEnv.MAX_ENEMIES, 5))
+            for _ in range(50):
+                obs, rewards, dones, infos = venv.step([ACTION_FIRE, 0])
+            # both games reach the frame limit on the last step
+            self.assertTrue(dones.all())
+            self.assertEqual(list(obs["enemy_count"][:, 0]), [8, 8])
+
+    def test_difficulty_games(self):
+        self.assertEqual(parse_levels("1-3,5"), [1, 2, 3, 5])
+        results = play_games(level=2, seeds=[1, 2], max_frames=300)
+        # same seed, same bot and same game
+        self.assertEqual(play_games(level=2, seeds=[1], max_frames=300)[0],
+                         results[0])
+        report = summarize(results)
+        self.assertEqual(report["games"], 2)
+        self.assertLessEqual(report["survival_s_mean"], 300 * 16 / 1000)
+        # the survival doesn't count the cleared games
+        cleared = dict(results[0], completed=True, time_ms=1000)
+        report = summarize([cleared, results[1]])
+        self.assertEqual(report["clear_s_mean"], 1)
+        self.assertEqual(report["survival_s_mean"],
+                         results[1]["time_ms"] / 1000)
+        self.assertIsNone(summarize([cleared])["survival_s_p10"])
+        self.assertEqual(summarize([]), {"games": 0})
+        self.assertIn("no games", format_report({1: summarize([])}))
+        self.assertIn(" - ", format_report({1: summarize([cleared])}))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,78 @@
+import json
+import os
+import tempfile
+import time
+import unittest
+
+from src.event_log import (
+    EVENT_LEVEL_COMPLETED,
+    EVENT_RESTART,
+    EVENT_SHOT,
+    EventLog,
+)
+from src.headless import HeadlessGame
+from src.input_system import ACTION_FIRE, InputSnapshot
+
+
+def read_events(file: str) -> list:
+    with open(file) as f:
+        return [json.loads(line) for line in f]
+
+
+class EventLogTest(unittest.TestCase):
+    def setUp(self):
+        self.file = os.path.join(tempfile.mkdtemp(), "events.jsonl")
+
+    def test_game_events(self):
+        game = HeadlessGame(seed=6)
+        event_log = game.session.event_log = EventLog(self.file,
+                                                      flush_interval=0.01)
+        for _ in range(60):
+            game.step(InputSnapshot(ACTION_FIRE))
+        for sprite in (game.level_controller.game_level
+                       .enemy_army.enemiesGroup.sprites()):
+            sprite.kill()
+        game.step(InputSnapshot())
+        game.session.restart = True
+        game.step(InputSnapshot())
+        event_log.close()
+        events = read_events(self.file)
+        self.assertEqual(len(events), event_log.emitted)
+        names = [event["event"] for event in events]
+        self.assertIn(EVENT_SHOT, names)
+        self.assertEqual(names[-2:], [EVENT_LEVEL_COMPLETED, EVENT_RESTART])
+        self.assertEqual(events[-2]["level"], 1)
+        # the simulation tags the events with its own frame
+        self.assertEqual(events[-1]["frame"], game.frame)
+        self.assertEqual(events[-2]["frame"], game.frame - 1)
+        shots = [event["frame"] for event in events
+                 if event["event"] == EVENT_SHOT]
+        self.assertGreater(shots[0], 0)
+        self.assertEqual(shots, sorted(set(shots)))
+        self.assertLessEqual(events[0]["t"], events[-1]["t"])
+
+    def test_rotation(self):
+        event_log = EventLog(self.file, max_bytes=200, backups=2,
+                             flush_interval=0.001)
+        for index in range(40):
+            event_log.emit(EVENT_SHOT, index, 1, x=index)
+            if index % 5 == 4:
+                # let the writer take a batch
+                timeout = time.monotonic() + 5
+                while event_log.written < index + 1:
+                    self.assertLess(time.monotonic(), timeout,
+                                    "the writer stopped")
+                    time.sleep(0.001)
+        event_log.close()
+        self.assertGreater(event_log.rotations, 2)
+        files = sorted(os.listdir(os.path.dirname(self.file)))
+        self.assertEqual(files, ["events.jsonl", "events.jsonl.1",
+                                 "events.jsonl.2"])
+        self.assertLessEqual(os.path.getsize(self.file + ".1"), 400)
+        # the newest events are in the live file, the oldest were dropped
+        last = read_events(self.file) or read_events(self.file + ".1")
+        self.assertEqual(last[-1]["x"], 39)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,116 @@
+import io
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+import unittest
+
+import numpy as np
+import pygame
+
+from src.frame_capture import FrameCapture, raw_pixel_format
+
+
+class BlockedStream(io.BytesIO):
+    """ raw output that waits for the test to release each write """
+
+    def __init__(self):
+        super().__init__()
+        self.release = threading.Event()
+
+    def write(self, data) -> int:
+        self.release.wait()
+        return super().write(data)
+
+
+class FrameCaptureTest(unittest.TestCase):
+    def setUp(self):
+        self.screen = pygame.Surface((40, 30))
+
+    def test_png_sequence(self):
+        directory = tempfile.mkdtemp()
+        capture = FrameCapture((40, 30), directory, buffers=4)
+        for color in ("red", "green", "blue"):
+            self.screen.fill(color)
+            capture.capture(self.screen)
+        capture.close()
+        self.assertEqual(capture.captured, capture.written)
+        files = sorted(os.listdir(directory))
+        self.assertEqual(len(files), 3 - capture.dropped)
+        first = pygame.image.load(os.path.join(directory, files[0]))
+        self.assertEqual(first.get_at((5, 5)), (255, 0, 0))
+        last = pygame.image.load(os.path.join(directory, files[-1]))
+        self.assertEqual(last.get_at((5, 5)), (0, 0, 255))
+
+    def test_png_capture_doesnt_stall(self):
+        # noise is slow to compress, the writer must not hold the GIL for
+        # the whole frame
+        size = (1500, 1500)
+        screen = pygame.Surface(size, 0, 32)
+        pixels = pygame.surfarray.pixels2d(screen)
+        pixels[:] = np.random.default_rng(1).integers(
+            0, 1 << 24, pixels.shape, dtype=np.uint32)
+        del pixels
+        directory = tempfile.mkdtemp()
+        capture = FrameCapture(size, directory, buffers=4)
+        for _ in range(4):
+            capture.capture(screen)
+        # the main thread keeps running while the frames are written
+        longest = 0
+        last = time.perf_counter()
+        timeout = last + 10
+        while capture.written < capture.captured:
+            now = time.perf_counter()
+            longest = max(longest, now - last)
+            last = now
+            self.assertLess(now, timeout, "the writer stopped")
+        self.assertLess(longest, 0.1)
+        capture.close()
+        files = sorted(os.listdir(directory))
+        self.assertEqual(len(files), 4)
+        frame = pygame.image.load(os.path.join(directory, files[0]))
+        self.assertEqual(pygame.image.tobytes(frame, "RGB"),
+                         pygame.image.tobytes(screen, "RGB"))
+
+    def test_raw_video(self):
+        directory = tempfile.mkdtemp()
+        capture = FrameCapture((40, 30), directory, "raw", buffers=2)
+        for _ in range(5):
+            capture.capture(self.screen)
+        capture.close()
+        self.assertEqual(capture.written + capture.dropped, 5)
+        with open(os.path.join(directory, "capture.json")) as f:
+            info = json.load(f)
+        self.assertEqual(info["frames"], capture.written)
+        self.assertEqual(
+            os.path.getsize(os.path.join(directory, "capture.raw")),
+            capture.written * info["pitch"] * 30)
+        self.assertEqual(len(info["pixel_format"]), 4)
+
+    def test_drops_without_waiting(self):
+        # one buffer held by a blocked writer, the next frame is dropped
+        stream = BlockedStream()
+        capture = FrameCapture((40, 30), tempfile.mkdtemp(), "raw",
+                               buffers=1, stream=stream)
+        self.assertTrue(capture.capture(self.screen))
+        self.assertFalse(capture.capture(self.screen))
+        stream.release.set()
+        capture.close()
+        self.assertEqual((capture.written, capture.dropped), (1, 1))
+        self.assertIn("1 dropped", str(capture))
+
+    def test_pixel_format(self):
+        surface = pygame.Surface((1, 1), 0, 32,
+                                 (0xff0000, 0xff00, 0xff, 0))
+        self.assertEqual(raw_pixel_format(surface),
+                         "bgr0" if sys.byteorder == "little" else "0rgb")
+        with self.assertRaises(ValueError):
+            FrameCapture((1, 1), tempfile.mkdtemp(), "gif")
+        with self.assertRaises(ValueError):
+            FrameCapture((1, 1), tempfile.mkdtemp(), stream=io.BytesIO())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,86 @@
+import unittest
+
+import pygame
+
+from src.frame_pipeline import FramePipeline
+from src.globals import GameSession
+from src.headless import HeadlessGame
+from src.input_system import InputSnapshot
+from src.render_queue import LAYER_PLAYER
+
+
+class FramePipelineTest(unittest.TestCase):
+    def test_frames_in_order(self):
+        session = GameSession(pygame.Surface((50, 10)))
+        image = pygame.Surface((10, 10))
+        image.fill((255, 255, 255))
+        rect = image.get_rect()
+
+        def simulate():
+            rect.x += 10
+            session.render_queue.add(LAYER_PLAYER, image, rect)
+
+        pipeline = FramePipeline(session, simulate)
+        target = pygame.Surface((50, 10))
+        pipeline.submit(InputSnapshot(), 0.016)
+        self.assertFalse(pipeline.present(target))
+        for frame in range(3):
+            pipeline.submit(InputSnapshot(), 0.016)
+            self.assertTrue(pipeline.present(target))
+            # the frame keeps its position while the next one moves it
+            lit = [x for x in range(0, 50, 10)
+                   if target.get_at((x, 5)) == (255, 255, 255)]
+            self.assertEqual(lit, [frame * 10 + 10])
+        pipeline.close()
+
+    def test_presented_tags(self):
+        session = GameSession(pygame.Surface((4, 4)))
+        pipeline = FramePipeline(session, lambda: None)
+        target = pygame.Surface((4, 4))
+        pipeline.submit(InputSnapshot(), 0.016, "poll 0")
+        self.assertFalse(pipeline.present(target))
+        for frame in range(1, 4):
+            pipeline.submit(InputSnapshot(), 0.016, f"poll {frame}")
+            pipeline.present(target)
+            # the frame drawn is the one submitted on the last loop
+            self.assertEqual(pipeline.presented_tag, f"poll {frame - 1}")
+        pipeline.close()
+
+    def test_blink_swaps_images(self):
+        game = HeadlessGame(seed=3)
+        player = game.level_controller.game_level.player_controller.player
+        player.active_invulnerability()
+        images = set()
+        for _ in range(60):
+            game.step(InputSnapshot())
+            images.add(player.image)
+        # queued images are not changed by the next frames
+        self.assertEqual(images, set(player.blink_images.values()))
+        for alpha, image in player.blink_images.items():
+            self.assertEqual(image.get_alpha(), alpha)
+
+    def test_game(self):
+        game = HeadlessGame(seed=3)
+        pipeline = FramePipeline(game.session,
+                                 game.level_controller.simulate)
+        for _ in range(120):
+            pipeline.submit(InputSnapshot(), 0.016)
+            pipeline.present(game.session.screen)
+        pipeline.close()
+        self.assertEqual(game.session.level, 1)
+
+    def test_simulation_error(self):
+        def simulate():
+            raise RuntimeError("broken frame")
+
+        pipeline = FramePipeline(GameSession(pygame.Surface((4, 4))),
+                                 simulate)
+        pipeline.submit(InputSnapshot(), 0.016)
+        pipeline.submit(InputSnapshot(), 0.016)
+        with self.assertRaises(RuntimeError):
+            pipeline.present(pygame.Surface((4, 4)))
+        pipeline.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,45 @@
+import gc
+import unittest
+
+from src.gc_policy import NO_FULL_COLLECTIONS, GcPolicy
+from src.headless import HeadlessGame
+
+
+class GcPolicyTest(unittest.TestCase):
+    def setUp(self):
+        self.thresholds = gc.get_threshold()
+        self.policy = GcPolicy(full_interval=2)
+        self.policy.install()
+
+    def tearDown(self):
+        self.policy.uninstall()
+        self.assertEqual(gc.get_threshold(), self.thresholds)
+        self.assertEqual(gc.get_freeze_count(), 0)
+
+    def test_level_freeze(self):
+        self.assertEqual(gc.get_threshold()[2], NO_FULL_COLLECTIONS)
+        game = HeadlessGame(seed=3)
+        game.session.gc_policy = self.policy
+        game.level_controller.game_level.build_level(1, [["basic"]], {})
+        self.assertGreater(gc.get_freeze_count(), 0)
+        self.policy.level_transition()
+        self.assertEqual(gc.get_freeze_count(), 0)
+        # the policy collections are measured
+        self.assertGreaterEqual(self.policy.collections[2], 2)
+
+    def test_frame_pauses(self):
+        gc.collect(0)
+        # a collection inside the frame explains its extra time
+        self.assertGreater(self.policy.end_frame(16.001, 16), 0)
+        self.assertEqual(self.policy.gc_spikes, 1)
+        self.assertEqual(self.policy.end_frame(16.001, 16), 0)
+        self.assertEqual(self.policy.over_budget, 2)
+        self.assertEqual(self.policy.gc_spikes, 1)
+        # idle frame: the due full collection runs on it
+        full = self.policy.collections[2]
+        self.policy.end_frame(2, 16)
+        self.assertEqual(self.policy.collections[2], full + 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
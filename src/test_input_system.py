@@ -0,0 +1,120 @@
+import os
+import tempfile
+import time
+import unittest
+
+import pygame
+
+from src.headless import HeadlessGame, play_replay
+from src.input_system import (
+    ACTION_DOWN,
+    ACTION_FIRE,
+    ACTION_LEFT,
+    ACTION_RIGHT,
+    ACTION_UP,
+    InputSnapshot,
+    KeyboardInput,
+    ReplayReader,
+    ReplayWriter,
+)
+
+
+class TestInputSystem(unittest.TestCase):
+    def setUp(self):
+        handle, self.replay_file = tempfile.mkstemp(suffix=".rpl")
+        os.close(handle)
+
+    def tearDown(self):
+        os.remove(self.replay_file)
+
+    def test_snapshot_keys(self):
+        snapshot = InputSnapshot(ACTION_LEFT | ACTION_FIRE)
+        self.assertTrue(snapshot[pygame.K_a])
+        self.assertTrue(snapshot[pygame.K_LEFT])
+        self.assertTrue(snapshot[pygame.K_SPACE])
+        self.assertFalse(snapshot[pygame.K_RIGHT])
+        self.assertFalse(snapshot[pygame.K_q])
+
+    def test_snapshot_axes(self):
+        self.assertEqual(InputSnapshot(ACTION_LEFT).axis_x, -1)
+        self.assertEqual(InputSnapshot(ACTION_RIGHT).axis_x, 1)
+        self.assertEqual(InputSnapshot(ACTION_LEFT | ACTION_RIGHT).axis_x, 0)
+        self.assertEqual(InputSnapshot(ACTION_UP).axis_y, -1)
+        self.assertEqual(InputSnapshot(ACTION_DOWN).axis_y, 1)
+        self.assertTrue(InputSnapshot(ACTION_FIRE).pressed(ACTION_FIRE))
+        self.assertFalse(InputSnapshot(ACTION_UP).pressed(ACTION_FIRE))
+
+    def test_event_filter(self):
+        keyboard = KeyboardInput()
+        keyboard.setup()
+        self.assertTrue(pygame.event.get_blocked(pygame.MOUSEMOTION))
+        self.assertFalse(pygame.event.get_blocked(pygame.QUIT))
+        pygame.event.post(pygame.event.Event(pygame.QUIT))
+        events = keyboard.begin_frame()
+        keyboard.mark_presented()
+        pygame.event.set_allowed(None)
+        self.assertEqual([event.type for event in events], [pygame.QUIT])
+
+    def test_latency_of_presented_frame(self):
+        keyboard = KeyboardInput()
+        actions = [ACTION_FIRE, ACTION_FIRE]
+        keyboard.poll = lambda: InputSnapshot(actions.pop(0))
+        keyboard.begin_frame()
+        stamp = keyboard.frame_stamp
+        time.sleep(0.02)
+        # the next frame is polled before the first one is presented
+        keyboard.begin_frame()
+        keyboard.mark_presented(stamp)
+        self.assertEqual(keyboard.latency.total_count, 1)
+        self.assertGreaterEqual(keyboard.latency.maximum(), 20)
+
+    def test_replay_file(self):
+        frames = [(ACTION_LEFT, 16)] * 100 + [(ACTION_FIRE, 17), (0, 16)]
+        writer = ReplayWriter(self.replay_file, seed=1234)
+        for actions, delta_ms in frames:
+            writer.write(InputSnapshot(actions), delta_ms)
+        writer.close()
+        # repeated frames are saved as a single record
+        self.assertEqual(os.path.getsize(self.replay_file),
+                         ReplayWriter.HEADER.size + ReplayWriter.FRAME.size * 3)
+        reader = ReplayReader(self.replay_file)
+        self.assertEqual(reader.seed, 1234)
+        for actions, delta_ms in frames:
+            self.assertEqual(reader.poll().actions, actions)
+            self.assertEqual(reader.delta_ms, delta_ms)
+        reader.poll()
+        self.assertTrue(reader.finished)
+        reader.close()
+
+    def test_replay_long_frame(self):
+        writer = ReplayWriter(self.replay_file, seed=1)
+        writer.write(InputSnapshot(ACTION_FIRE), 100_000)
+        writer.close()
+        reader = ReplayReader(self.replay_file)
+        reader.poll()
+        self.assertEqual(reader.delta_ms, ReplayWriter.MAX_DELTA_MS)
+        reader.close()
+
+    def test_replay_session(self):
+        # scripted input: move and shoot to both sides
+        script = [ACTION_LEFT | ACTION_FIRE] * 60 + [
+            ACTION_RIGHT | ACTION_FIRE] * 120 + [ACTION_FIRE] * 120
+        writer = ReplayWriter(self.replay_file, seed=99)
+        game = HeadlessGame(seed=99, recorder=writer)
+        states = []
+        for idx, actions in enumerate(script):
+            game.step(InputSnapshot(actions), 16 + idx % 2)
+            states.append(game.state())
+        writer.close()
+
+        replay = HeadlessGame(seed=99)
+        reader = ReplayReader(self.replay_file)
+        for state in states:
+            replay.step(reader.poll(), reader.delta_ms)
+            self.assertEqual(replay.state(), state)
+        reader.close()
+        self.assertEqual(play_replay(self.replay_file).state(), states[-1])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -2,15 +2,30 @@ import unittest
 
 import pygame
 
+from src.globals import GameSession
+from src.headless import HeadlessGame
+from src.input_system import ACTION_FIRE, ACTION_LEFT, InputSnapshot
 from src.levelTools import EnemyArmy
 
 
+class LayerRecorder:
+    """ renderer that keeps the surfaces of the ui layer """
+
+    def __init__(self):
+        self.ui = []
+
+    def draw(self, layers, target: pygame.Surface) -> None:
+        # the ui is the last layer
+        self.ui = [surface for surface, _ in layers[-1][0]]
+
+
 class TestLevelTools(unittest.TestCase):
 
     def test_enemies_army(self):
         try:
             assert_res = True
-            army_class = EnemyArmy(level=1, pattern=[
+            session = GameSession(pygame.Surface((600, 600)))
+            army_class = EnemyArmy(session, level=1, pattern=[
                 ["basic", "basic", "basic"]
             ])
             if army_class.level != 1:
@@ -22,6 +37,42 @@ class TestLevelTools(unittest.TestCase):
             self.assertTrue(False, err)
         self.assertTrue(True)
 
+    def test_sessions_share_process(self):
+        # two games stepped together give the same result as alone
+        script = [ACTION_FIRE | ACTION_LEFT] * 100 + [ACTION_FIRE] * 200
+        alone = HeadlessGame(seed=5, level=3)
+        for actions in script:
+            alone.step(InputSnapshot(actions))
+        game_a = HeadlessGame(seed=5, level=3)
+        game_b = HeadlessGame(seed=6, level=3)
+        for actions in script:
+            game_a.step(InputSnapshot(actions))
+            game_b.step(InputSnapshot(0))
+        self.assertEqual(game_a.state(), alone.state())
+        self.assertIsNot(game_a.session.screen, game_b.session.screen)
+        # sprites are loaded once and shared by both games
+        enemy_a = game_a.level_controller.game_level.enemy_army
+        enemy_b = game_b.level_controller.game_level.enemy_army
+        basic_a = next(item for item in enemy_a.enemiesGroup if item.type == 1)
+        basic_b = next(item for item in enemy_b.enemiesGroup if item.type == 1)
+        self.assertIs(basic_a.image, basic_b.image)
+
+    def test_ui_text_is_cached(self):
+        game = HeadlessGame(seed=5)
+        recorder = LayerRecorder()
+        game.session.render_queue.renderer = recorder
+        game.step(InputSnapshot(0))
+        first = recorder.ui
+        game.step(InputSnapshot(0))
+        self.assertEqual(len(first), 3)
+        # same text, same surfaces
+        for cached, surface in zip(first, recorder.ui):
+            self.assertIs(cached, surface)
+        game.session.score += 10
+        game.step(InputSnapshot(0))
+        self.assertIs(recorder.ui[0], first[0])
+        self.assertIsNot(recorder.ui[1], first[1])
+
 
 if __name__ == '__main__':
     unittest.main()
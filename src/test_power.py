@@ -0,0 +1,52 @@
+import unittest
+
+import pygame
+
+from src.headless import HeadlessGame
+from src.input_system import InputSnapshot
+from src.power import PowerManager
+
+
+class PowerManagerTest(unittest.TestCase):
+    def setUp(self):
+        self.game = HeadlessGame(seed=4)
+        self.power = PowerManager(self.game.level_controller, pause_fps=20)
+
+    def test_pause(self):
+        power = self.power
+        self.assertEqual(power.wait_ms(), 0)
+        power.handle_event(pygame.event.Event(pygame.WINDOWFOCUSLOST))
+        self.assertTrue(power.paused)
+        self.assertEqual(power.wait_ms(), 50)
+        power.handle_event(pygame.event.Event(pygame.WINDOWEXPOSED))
+        self.assertTrue(power.redraw)
+        # any key resumes the game
+        power.handle_event(pygame.event.Event(pygame.KEYDOWN,
+                                              key=pygame.K_a))
+        self.assertFalse(power.paused)
+        self.assertFalse(power.redraw)
+
+    def test_game_over_idle(self):
+        controller = self.game.level_controller
+        self.assertEqual(controller.idle_ms, 0)
+        self.game.session.life = 0
+        controller.game_level.player_controller.player.is_dead = True
+        self.game.step(InputSnapshot())
+        # sleeps until the restart label blinks
+        self.assertTrue(0 < self.power.wait_ms() <= 500)
+        self.assertFalse(PowerManager(controller, idle=False).wait_ms())
+
+    def test_sleep_wakes_on_input(self):
+        self.power.handle_event(pygame.event.Event(pygame.WINDOWMINIMIZED))
+        pygame.event.clear()
+        pygame.event.post(pygame.event.Event(pygame.KEYDOWN,
+                                             key=pygame.K_SPACE))
+        self.assertLess(self.power.sleep(), 50)
+        self.assertTrue(self.power.slept)
+        # the event is left for the frame
+        events = pygame.event.get(pygame.KEYDOWN)
+        self.assertEqual([event.key for event in events], [pygame.K_SPACE])
+
+
+if __name__ == '__main__':
+    unittest.main()
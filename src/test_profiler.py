@@ -0,0 +1,50 @@
+import os
+import tempfile
+import unittest
+
+from src.headless import HeadlessGame
+from src.input_system import InputSnapshot
+from src.levelTools import LevelController
+from src.profiler import FrameProfiler
+
+
+class FrameProfilerTest(unittest.TestCase):
+    def test_capture(self):
+        game = HeadlessGame(seed=5)
+        controller = game.level_controller
+        directory = tempfile.mkdtemp()
+        profiler = FrameProfiler(controller, frames=3, directory=directory)
+        # not capturing: the loop calls the class method
+        self.assertNotIn("execute", vars(controller))
+        self.assertTrue(profiler.start(10))
+        self.assertFalse(profiler.start(11))
+        files = ()
+        for _ in range(5):
+            game.step(InputSnapshot())
+            files = files or profiler.end_frame()
+        self.assertFalse(profiler.capturing)
+        self.assertNotIn("execute", vars(controller))
+        self.assertEqual([os.path.basename(file) for file in files],
+                         ["level1_frames10-12.prof",
+                          "level1_frames10-12.collapsed"])
+        with open(files[1]) as f:
+            lines = f.read().splitlines()
+        self.assertTrue(lines)
+        stack, time_us = lines[0].rsplit(" ", 1)
+        self.assertGreater(int(time_us), 0)
+        self.assertTrue(any(line.startswith(
+            f"execute (levelTools.py:"
+            f"{LevelController.execute.__code__.co_firstlineno})")
+            for line in lines))
+
+    def test_stop_without_calls(self):
+        game = HeadlessGame(seed=5)
+        profiler = FrameProfiler(game.level_controller,
+                                 directory=tempfile.mkdtemp())
+        profiler.start(0)
+        self.assertEqual(profiler.stop(), ())
+        self.assertNotIn("execute", vars(game.level_controller))
+
+
+if __name__ == '__main__':
+    unittest.main()
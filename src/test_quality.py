@@ -0,0 +1,104 @@
+import unittest
+
+import pygame
+
+from src.globals import GameAssets, GameSession
+from src.headless import HeadlessGame
+from src.levelTools import SpaceBackground
+from src.quality import FULL_QUALITY, QUALITY_LEVELS, QualityController
+from src.render_queue import RenderQueue
+from src.sound_system import MergedSoundController
+
+
+class FakeSounds:
+    def __init__(self):
+        self.played = []
+
+    def play(self, name):
+        self.played.append(name)
+
+    def stop(self):
+        pass
+
+
+class QualityTest(unittest.TestCase):
+    def test_controller_steps(self):
+        session = GameSession(pygame.Surface((10, 10)))
+        controller = QualityController(session, budget_ms=16, window=4,
+                                       cooldown=4)
+        for _ in range(3):
+            self.assertFalse(controller.end_frame(20))
+        self.assertTrue(controller.end_frame(20))
+        self.assertEqual(controller.level, 1)
+        self.assertIs(session.quality, QUALITY_LEVELS[1])
+        # cheap frames between the limits keep the level
+        for _ in range(8):
+            self.assertFalse(controller.end_frame(12))
+        for _ in range(len(QUALITY_LEVELS) * 4):
+            controller.end_frame(30)
+        self.assertEqual(controller.level, len(QUALITY_LEVELS) - 1)
+        for _ in range(len(QUALITY_LEVELS) * 4):
+            controller.end_frame(2)
+        self.assertIs(session.quality, FULL_QUALITY)
+        self.assertEqual(controller.worst_level, len(QUALITY_LEVELS) - 1)
+
+    def test_opaque_background(self):
+        game = HeadlessGame(seed=2)
+        session = game.session
+        background = SpaceBackground(session)
+        # the shared image keeps its pixels without blend
+        self.assertIsNone(GameAssets().image("bg.png",
+                                             alpha=False).get_alpha())
+        frames = []
+        for quality in (FULL_QUALITY, QUALITY_LEVELS[1]):
+            session.quality = quality
+            session.render_queue = RenderQueue()
+            background.render()
+            background.scroll += background.speed
+            screen = pygame.Surface((600, 600))
+            session.render_queue.flush(screen)
+            frames.append(pygame.image.tobytes(screen, "RGB"))
+        self.assertEqual(frames[0], frames[1])
+
+    def test_explosion_cap(self):
+        game = HeadlessGame(seed=2)
+        game.session.quality = QUALITY_LEVELS[2]
+        hits = game.level_controller.game_level.hit_controller
+        for _ in range(10):
+            hits.add_hit_explosion((50, 50), sound_effect=False)
+        self.assertEqual(len(hits.explosion_group),
+                         QUALITY_LEVELS[2].max_explosions)
+
+    def test_idle_health_bars(self):
+        game = HeadlessGame(seed=2)
+        session = game.session
+        enemy = (game.level_controller.game_level
+                 .enemy_army.enemiesGroup.sprites()[0])
+        enemy.take_damage(1)
+        self.assertTrue(enemy.idle)
+        queue = session.render_queue = RenderQueue()
+        enemy.draw_health_bar()
+        self.assertEqual(len(queue), 2)
+        queue.clear()
+        session.quality = QUALITY_LEVELS[3]
+        timer = enemy.life_bar_timer
+        enemy.draw_health_bar()
+        self.assertEqual(len(queue), 0)
+        self.assertLess(enemy.life_bar_timer, timer)
+
+    def test_merged_sounds(self):
+        sounds = FakeSounds()
+        merged = MergedSoundController(sounds, merge_ms=10_000)
+        for name in ("exp", "exp", "s1", "exp"):
+            merged.play(name)
+        self.assertEqual(sounds.played, ["exp", "s1"])
+        session = GameSession(pygame.Surface((10, 10)))
+        self.assertIs(session.sound_controller,
+                      session.assets.sound_controller)
+        session.quality = QUALITY_LEVELS[-1]
+        self.assertIsInstance(session.sound_controller,
+                              MergedSoundController)
+
+
+if __name__ == '__main__':
+    unittest.main()
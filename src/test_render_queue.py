@@ -0,0 +1,47 @@
+import unittest
+
+import pygame
+
+from src.render_queue import LAYER_BACKGROUND, LAYER_UI, RenderQueue
+
+
+class RenderQueueTest(unittest.TestCase):
+    def setUp(self):
+        self.target = pygame.Surface((20, 20))
+        self.red = pygame.Surface((10, 10))
+        self.red.fill((255, 0, 0))
+        self.blue = pygame.Surface((10, 10))
+        self.blue.fill((0, 0, 255))
+
+    def test_layer_order(self):
+        queue = RenderQueue()
+        # added on the opposite order, the layers decide
+        queue.add(LAYER_UI, self.blue, (0, 0))
+        queue.add(LAYER_BACKGROUND, self.red, (0, 0))
+        queue.add(LAYER_BACKGROUND, self.red, (10, 10))
+        queue.fill(LAYER_UI, (0, 255, 0), (10, 10, 5, 5))
+        self.assertEqual(len(queue), 4)
+        queue.flush(self.target)
+        self.assertEqual(self.target.get_at((5, 5)), (0, 0, 255))
+        self.assertEqual(self.target.get_at((11, 11)), (0, 255, 0))
+        self.assertEqual(self.target.get_at((18, 18)), (255, 0, 0))
+        # one blits per layer plus the fill
+        self.assertEqual(queue.draw_calls, 3)
+        self.assertEqual(len(queue), 0)
+
+    def test_group(self):
+        queue = RenderQueue()
+        group = pygame.sprite.Group()
+        sprite = pygame.sprite.Sprite(group)
+        sprite.image = self.red
+        sprite.rect = self.red.get_rect()
+        queue.add_group(LAYER_BACKGROUND, group)
+        # the rect is read when the queue is drawn
+        sprite.rect.topleft = (10, 0)
+        queue.flush(self.target)
+        self.assertEqual(self.target.get_at((15, 5)), (255, 0, 0))
+        self.assertEqual(self.target.get_at((5, 5)), (0, 0, 0))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,27 @@
+import unittest
+
+from src.soak import is_growing, soak
+
+
+class SoakTest(unittest.TestCase):
+    def test_is_growing(self):
+        self.assertTrue(is_growing([10, 11, 12, 13, 14, 15]))
+        # noise around the same footprint
+        self.assertFalse(is_growing([10, 14, 11, 13, 12, 10]))
+        self.assertFalse(is_growing([10, 11, 12, 13], tolerance=5))
+        self.assertFalse(is_growing([1, 2]))
+
+    def test_levels_and_restarts(self):
+        report = soak(cycles=3, levels=2, level_frames=60, warmup=0)
+        kinds = [sample["kind"] for sample in report.samples]
+        self.assertEqual(kinds.count("restart"), 3)
+        self.assertEqual(kinds.count("level"), 6)
+        # sprites of other games in the process are counted too, but the
+        # levels left behind don't add any
+        self.assertEqual(len({sample["leaked_sprites"]
+                              for sample in report.samples}), 1)
+        self.assertTrue(report.passed, str(report))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,45 @@
+import gc
+import unittest
+
+import pygame
+
+from src.headless import HeadlessGame
+from src.input_system import ACTION_FIRE, InputSnapshot
+from src.surface_registry import (
+    OWNER_BULLETS,
+    OWNER_PARTICLES,
+    SurfaceRegistry,
+    enemy_owner,
+)
+from src.globals import GameAssets
+
+
+class SurfaceRegistryTest(unittest.TestCase):
+    def test_current_and_peak(self):
+        registry = SurfaceRegistry()
+        surface = registry.register(pygame.Surface((10, 10), 0, 32), "ui")
+        size = surface.get_pitch() * 10
+        registry.register(surface, "ui")
+        # subsurfaces share the parent pixels
+        part = registry.register(surface.subsurface((0, 0, 5, 5)), "ui")
+        self.assertEqual(registry.current["ui"], size)
+        self.assertEqual(registry.count["ui"], 2)
+        self.assertEqual(registry.owner_of(surface), "ui")
+        del surface, part
+        gc.collect()
+        self.assertEqual(registry.current["ui"], 0)
+        self.assertEqual(registry.peak["ui"], size)
+        self.assertEqual(registry.snapshot()["ui"]["surfaces"], 0)
+
+    def test_game_owners(self):
+        game = HeadlessGame(seed=3)
+        for frame in range(120):
+            game.step(InputSnapshot(ACTION_FIRE if frame % 10 == 0 else 0))
+        snapshot = GameAssets().surfaces.snapshot()
+        self.assertIn(enemy_owner("basic"), snapshot)
+        self.assertIn(OWNER_PARTICLES, snapshot)
+        self.assertGreater(snapshot[OWNER_BULLETS]["peak"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
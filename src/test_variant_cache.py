@@ -0,0 +1,47 @@
+import unittest
+
+import pygame
+
+from src.variant_cache import VariantCache
+
+
+class TestVariantCache(unittest.TestCase):
+    def setUp(self):
+        self.image = pygame.Surface((10, 10), pygame.SRCALPHA)
+        self.image.fill((10, 20, 30, 255), (0, 0, 5, 10))
+
+    def test_same_variant(self):
+        cache = VariantCache()
+        self.assertIs(cache.get(self.image), self.image)
+        rotated = cache.get(self.image, 30)
+        # angles on the same step share the surface
+        self.assertIs(cache.get(self.image, 31), rotated)
+        self.assertEqual(cache.hits, 1)
+        self.assertEqual(cache.misses, 1)
+        scaled = cache.get(self.image, scale=(2, 1.5))
+        self.assertEqual(scaled.get_size(), (20, 15))
+
+    def test_tint(self):
+        cache = VariantCache()
+        tinted = cache.get(self.image, tint=(100, 100, 100))
+        self.assertEqual(tinted.get_at((0, 0)), (110, 120, 130, 255))
+        # transparent pixels stay transparent
+        self.assertEqual(tinted.get_at((9, 9)).a, 0)
+        self.assertEqual(self.image.get_at((0, 0)), (10, 20, 30, 255))
+
+    def test_memory_limit(self):
+        variant_bytes = 10 * 10 * 4
+        cache = VariantCache(max_bytes=variant_bytes * 2)
+        first = cache.get(self.image, scale=(1, 1), tint=(1, 1, 1))
+        cache.get(self.image, tint=(2, 2, 2))
+        # first one is the most recently used
+        self.assertIs(cache.get(self.image, tint=(1, 1, 1)), first)
+        cache.get(self.image, tint=(3, 3, 3))
+        self.assertEqual(len(cache), 2)
+        self.assertEqual(cache.evictions, 1)
+        self.assertEqual(cache.bytes, variant_bytes * 2)
+        self.assertIs(cache.get(self.image, tint=(1, 1, 1)), first)
+
+
+if __name__ == '__main__':
+    unittest.main()
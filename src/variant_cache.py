@@ -0,0 +1,106 @@
+from collections import OrderedDict
+
+import pygame
+
+from src.surface_registry import OWNER_VARIANTS, SurfaceRegistry
+
+# rotations are rounded to this step (degrees) and scales to SCALE_STEP, so
+# an animation reuses a small set of surfaces
+ANGLE_STEP = 3
+SCALE_STEP = 0.05
+# color added to a sprite when it gets a hit
+HIT_FLASH_TINT = (160, 160, 160)
+
+
+class VariantCache:
+    """
+    Rotated, scaled and tinted copies of the sprite surfaces, a transform
+    is done once per (surface, quantised angle, scale, tint) and then it is
+    a dict lookup. The least recently used variants are dropped when the
+    cache goes over its memory limit.
+    """
+
+    def __init__(self, max_bytes: int = 32 * 1024 * 1024,
+                 registry: SurfaceRegistry | None = None):
+        """
+        :param max_bytes: memory limit of the variants
+        :param registry: counts the variants on the owner of their
+        original surface
+        """
+        self.max_bytes = max_bytes
+        self.registry = registry
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.__variants: "OrderedDict[tuple, pygame.Surface]" = OrderedDict()
+
+    def __len__(self):
+        return len(self.__variants)
+
+    @staticmethod
+    def quantize(angle: float, scale: tuple) -> tuple:
+        """ :return: angle, scale_x, scale_y on the cache steps """
+        return (round(angle / ANGLE_STEP) * ANGLE_STEP % 360,
+                round(scale[0] / SCALE_STEP) * SCALE_STEP,
+                round(scale[1] / SCALE_STEP) * SCALE_STEP)
+
+    def get(self, surface: pygame.Surface, angle: float = 0,
+            scale: tuple = (1, 1),
+            tint: tuple | None = None) -> pygame.Surface:
+        """
+        Surface transformed, the result is shared, don't change it
+        :param surface: original image
+        :param angle: rotation in degrees (counterclockwise)
+        :param scale: width and height factor
+        :param tint: color added to the image (hit flash)
+        """
+        angle, scale_x, scale_y = self.quantize(angle, scale)
+        if angle == 0 and scale_x == 1 and scale_y == 1 and tint is None:
+            return surface
+        key = (surface, angle, scale_x, scale_y, tint)
+        variant = self.__variants.get(key)
+        if variant is not None:
+            self.hits += 1
+            self.__variants.move_to_end(key)
+            return variant
+        self.misses += 1
+        variant = self.__build(surface, angle, scale_x, scale_y, tint)
+        if self.registry:
+            self.registry.register(variant, self.registry.owner_of(surface)
+                                   or OWNER_VARIANTS)
+        size = self.surface_bytes(variant)
+        while self.__variants and self.bytes + size > self.max_bytes:
+            _, evicted = self.__variants.popitem(last=False)
+            self.bytes -= self.surface_bytes(evicted)
+            self.evictions += 1
+        self.__variants[key] = variant
+        self.bytes += size
+        return variant
+
+    @staticmethod
+    def __build(surface: pygame.Surface, angle: float, scale_x: float,
+                scale_y: float, tint: tuple | None) -> pygame.Surface:
+        variant = surface
+        if scale_x != 1 or scale_y != 1:
+            width, height = surface.get_size()
+            variant = pygame.transform.scale(
+                variant, (max(1, round(width * scale_x)),
+                          max(1, round(height * scale_y))))
+        if angle:
+            variant = pygame.transform.rotate(variant, angle)
+        if tint:
+            if variant is surface:
+                variant = surface.copy()
+            # add the color keeping the transparency
+            variant.fill(tint, special_flags=pygame.BLEND_RGB_ADD)
+        return variant
+
+    @staticmethod
+    def surface_bytes(surface: pygame.Surface) -> int:
+        return surface.get_width() * surface.get_height() * (
+            surface.get_bytesize())
+
+    def clear(self) -> None:
+        self.__variants.clear()
+        self.bytes = 0